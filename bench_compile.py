@@ -0,0 +1,84 @@
+"""Benchmark the Friday section compiler on synthetic pages.
+
+Usage:
+    python bench_compile.py                      # 1k, 10k, 100k and 1M lines
+    python bench_compile.py --sizes 5000 50000   # custom sizes
+    python bench_compile.py --memory             # also report peak allocation
+    python bench_compile.py --exact              # exact-line dedupe only (no near-duplicates)
+"""
+import argparse
+import random
+import time
+import tracemalloc
+from section_compiler import SECTION_ORDER, compile_sections
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+
+def synthetic_page(total_lines: int, duplicate_ratio: float = 0.6, seed: int = 0) -> str:
+    """Build a page of repeated daily appends where about duplicate_ratio of bullets repeat earlier ones."""
+    rng = random.Random(seed)
+    lines = []
+    bullets = []
+    while len(lines) < total_lines:
+        for name in SECTION_ORDER:
+            lines.append(f"## {name}")
+            lines.append("")
+            for _ in range(rng.randint(3, 12)):
+                if bullets and rng.random() < duplicate_ratio:
+                    bullet = rng.choice(bullets)
+                    # Repeats differ only in case and spacing, as daily appends do
+                    if rng.random() < 0.5:
+                        bullet = bullet.upper().replace(" ", "  ")
+                elif rng.random() < 0.5:
+                    bullet = f"* PROJ-{len(bullets)}: update {rng.getrandbits(32):08x} (In Progress)"
+                    bullets.append(bullet)
+                else:
+                    # Prose long enough to be SimHash fingerprinted
+                    words = (f"word{rng.randrange(3000)}" for _ in range(rng.randint(12, 20)))
+                    bullet = "* " + " ".join(words)
+                    bullets.append(bullet)
+                lines.append(bullet)
+            lines.append("")
+    return "\n".join(lines[:total_lines])
+
+
+def run(total_lines: int, repeat: int, measure_memory: bool, near_duplicates: bool = True) -> None:
+    """Time compile_sections on one synthetic page and print throughput."""
+    page = synthetic_page(total_lines)
+    size_mb = len(page.encode("utf-8")) / 1_000_000
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        compiled = compile_sections(page, near_duplicates)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    line = (
+        f"{total_lines:>9,} lines  {size_mb:7.2f} MB  {best * 1000:9.1f} ms  "
+        f"{total_lines / best:>12,.0f} lines/s  {size_mb / best:7.1f} MB/s  "
+        f"-> {compiled.count(chr(10)) + 1:,} lines out"
+    )
+    if measure_memory:
+        tracemalloc.start()
+        compile_sections(page, near_duplicates)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        line += f"  peak {peak / 1_000_000:.1f} MB"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark compile_sections on synthetic pages")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Page sizes in lines")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per size (best time is reported)")
+    parser.add_argument("--memory", action="store_true", help="Report peak allocation during one compile")
+    parser.add_argument("--exact", action="store_true", help="Disable near-duplicate detection")
+    args = parser.parse_args()
+
+    for total_lines in args.sizes:
+        run(total_lines, args.repeat, args.memory, not args.exact)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Per-week compiled page state, kept up to date by every daily run."""
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+import config
+from content_ledger import week_key
+from local_state import JsonStateFile, state_path
+from section_compiler import SectionCompiler
+
+
+class CompiledWeekStore:
+    """The Friday compile of each week's page, maintained incrementally.
+
+    Each week's SectionCompiler state (deduped bullets per section and their
+    digest index) is stored in its own JSON state file next to the
+    fingerprint of the page body it describes. A run that finds the page
+    unchanged since the state was saved only feeds it the lines it adds; a
+    missing state or a page edited outside the agent is rebuilt from the
+    page. Weeks older than Config.COMPILED_STATE_WEEKS are deleted whenever
+    a state is saved.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        """Bind to the directory holding one state file per week."""
+        self.directory = directory or state_path("compiled")
+        self._states: Dict[str, JsonStateFile] = {}
+
+    def _state(self, key: str) -> JsonStateFile:
+        state = self._states.get(key)
+        if state is None:
+            state = JsonStateFile(os.path.join(self.directory, f"{key}.json"))
+            self._states[key] = state
+        return state
+
+    def load(self, week: datetime, page_fingerprint: str) -> Optional[SectionCompiler]:
+        """Return the week's compiler if it was saved for exactly this page body, else None."""
+        data = self._state(week_key(week)).load()
+        if not page_fingerprint or data.get("page") != page_fingerprint:
+            return None
+        try:
+            return SectionCompiler.from_state(data["compiler"])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def save(self, week: datetime, compiler: SectionCompiler, page_fingerprint: str) -> None:
+        """Persist the week's compiler for the page body with the given fingerprint."""
+        key = week_key(week)
+        self._state(key).save({"page": page_fingerprint, "compiler": compiler.to_state()})
+        self._prune(week)
+
+    def _prune(self, week: datetime) -> None:
+        cutoff = week_key(week - timedelta(weeks=config.Config.COMPILED_STATE_WEEKS))
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            key, ext = os.path.splitext(name)
+            if ext == ".json" and not key.startswith(".") and key <= cutoff:
+                # The empty lock sidecar stays: another process may hold or be
+                # about to take its lock, and a new file would not exclude it
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+                self._states.pop(key, None)
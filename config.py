@@ -12,6 +12,7 @@ class Config:
     
     # Jira settings
     JIRA_CLOUD_ID = "03eb62f4-22ac-4a6d-8e53-73bca97fbbad"
+    JIRA_PAGE_SIZE = 100  # Issues per search page; all pages are followed
     
     # Glean settings
     GLEAN_INSTANCE = "singleops-be.glean.com"
@@ -28,9 +29,60 @@ class Config:
     DATE_FORMAT = "%b %dth %Y"  # e.g., "Feb 13th 2026"
     PAGE_TITLE_PREFIX = "Nick - "
     
+    # Local state (caches, incremental sync stores)
+    CACHE_DIR = os.getenv(
+        "WEEKLY_UPDATE_CACHE_DIR",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+    )
+    # SQLite store for incremental Jira syncs; set to "" to always refetch the whole week
+    JIRA_STORE_PATH = os.getenv("JIRA_STORE_PATH", os.path.join(CACHE_DIR, "jira_issues.db"))
+    JIRA_SYNC_OVERLAP_MINUTES = 5  # Re-query this far behind the watermark to absorb clock skew
+    # Persistent MCP response cache shared by the scheduler and Slack app; "" disables it
+    RESPONSE_CACHE_PATH = os.getenv("RESPONSE_CACHE_PATH", os.path.join(CACHE_DIR, "mcp_responses.db"))
+    RESPONSE_CACHE_MAX_ENTRIES = 2000
+    # Title -> page id index of the weekly updates tree: a title that was not found is not
+    # looked up again for this long, and entries older than the max age are re-verified (an
+    # entry whose page turns out to be gone on write is dropped at once)
+    PAGE_INDEX_MISS_SECONDS = 300
+    PAGE_INDEX_MAX_AGE_SECONDS = 7 * 24 * 3600
+    # Weekly pages whose body and version are mirrored locally (most recently used first)
+    PAGE_MIRROR_MAX_PAGES = 8
+    # Set to "1" only if the MCP updateConfluencePage tool enforces a version={"number": n} argument
+    # (rejecting stale writes with 409). Otherwise the live page is read before each write to check
+    # its version; the MCP page read returns the body too, so the mirror then saves no reads.
+    CONFLUENCE_SEND_PAGE_VERSION = os.getenv("CONFLUENCE_SEND_PAGE_VERSION", "") == "1"
+    # Weeks of written-content digests kept for cross-run dedupe (current week included)
+    CONTENT_LEDGER_WEEKS = 2
+    # Weeks of incrementally compiled page state kept for the Friday compile (current week included)
+    COMPILED_STATE_WEEKS = 2
+    # Seconds each read tool's responses stay fresh; tools not listed (and 0) are never cached.
+    # Confluence page bodies are left uncached: daily appends read-modify-write them, and a
+    # stale body would overwrite edits made in Confluence. Jira searches are left uncached too:
+    # the incremental store already limits them to the delta, and a cached liveness or first-sync
+    # result would keep reassigned or closed issues (and could mix pages of one paginated result).
+    RESPONSE_CACHE_TTLS = {
+        "confluence.descendants": 3600,
+        "confluence.cql": 3600,
+        "glean.search": 3600,
+        "glean.meeting_lookup": 3600,
+        "pendo.list_applications": 24 * 3600,
+        "pendo.activity_query": 3600,
+        "granola.list_meetings": 3600,
+        "granola.get_meetings": 3600,
+        "granola.transcript": 7 * 24 * 3600,
+    }
+    
     # Content settings
     MAX_HIGHLIGHTS = 5
+    # Declarative SVP relevance rules (fields, predicates and weights per source)
+    SVP_RULES_PATH = os.getenv(
+        "SVP_RULES_PATH",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "svp_rules.json")
+    )
+    # Weeks of finalized pages kept in the learned style profile
     PAST_DOCUMENTS_TO_ANALYZE = 5
+    # Distinct 2-4 word phrases tracked when learning tone; counts are exact below this
+    TONE_PHRASE_CAPACITY = 20000
 
     # Slack (for slash command: /weekly-update)
     # SLACK_SIGNING_SECRET: from Slack app → Basic Information → Signing Secret (required for verification)
@@ -4,6 +4,40 @@ from datetime import datetime
 import config
 from mcp_integration import MCPIntegration
 
+
+def page_version(page: Dict[str, Any]) -> Optional[int]:
+    """Return the version number of a Confluence page response, or None if it has none."""
+    version = page.get("version")
+    if isinstance(version, dict):
+        version = version.get("number")
+    return version if isinstance(version, int) else None
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    """Return the HTTP status code attached to a failed MCP call, if any."""
+    status = getattr(error, "status_code", None) or getattr(error, "status", None)
+    response = getattr(error, "response", None)
+    if status is None and response is not None:
+        status = getattr(response, "status_code", None)
+    return status
+
+
+def _is_version_conflict(error: Exception) -> bool:
+    """Return True only if a failed update was an HTTP 409 / stale-version rejection."""
+    status = _status_code(error)
+    if status is not None:
+        return status == 409
+    # Confluence's stale-version error when no status code is attached
+    return "version must be incremented" in str(error).lower()
+
+
+def _is_not_found(error: Exception) -> bool:
+    """Return True only if a failed call was an HTTP 404 (the page was deleted or is no longer visible)."""
+    status = _status_code(error)
+    if status is not None:
+        return status == 404
+    return "not found" in str(error).lower()
+
 class ConfluenceClient:
     """Client for interacting with Confluence via MCP."""
     
@@ -14,42 +48,45 @@ class ConfluenceClient:
         self.parent_page_id = config.Config.CONFLUENCE_PARENT_PAGE_ID
         self.mcp = MCPIntegration()
     
-    def find_quarter_folder(self, date: datetime) -> Optional[str]:
-        """Find or create the quarterly folder for a given date."""
-        quarter_name = config.Config.get_quarter_folder_name(date)
+    def find_page_by_title(self, title: str, ancestor_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Find one page or folder by exact title under an ancestor (the weekly updates parent by default).
         
-        # Get descendants of parent page to find quarterly folders
-        descendants = self.mcp.get_confluence_page_descendants(
-            cloud_id=self.cloud_id,
-            page_id=self.parent_page_id,
-            limit=100
-        )
+        Asks Confluence for the title directly with CQL. If CQL search is not
+        available, walks the ancestor's descendants page by page and stops as
+        soon as the title is found.
+        """
+        ancestor_id = ancestor_id or self.parent_page_id
+        escaped_title = title.replace("\\", "\\\\").replace('"', '\\"')
+        cql = f'title = "{escaped_title}" AND ancestor = {ancestor_id}'
         
-        # Search for folder with matching title
-        for descendant in descendants:
-            if descendant.get("title") == quarter_name:
-                return descendant.get("id")
-        
-        return None
-    
-    def find_weekly_page(self, title: str, parent_folder_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
-        """Find an existing weekly page by title."""
-        search_id = parent_folder_id or self.parent_page_id
+        results = self.mcp.search_confluence_using_cql(cloud_id=self.cloud_id, cql=cql, limit=5)
+        if results is not None:
+            for result in results:
+                # CQL search results wrap the page in "content"
+                page = result.get("content", result)
+                if page.get("title") == title:
+                    return page
+            return None
         
-        # Get descendants to search for page
-        descendants = self.mcp.get_confluence_page_descendants(
+        for descendant in self.mcp.iter_confluence_page_descendants(
             cloud_id=self.cloud_id,
-            page_id=search_id,
-            limit=100
-        )
-        
-        # Search for page with matching title
-        for descendant in descendants:
+            page_id=ancestor_id
+        ):
             if descendant.get("title") == title:
                 return descendant
         
         return None
     
+    def find_quarter_folder(self, date: datetime) -> Optional[str]:
+        """Find or create the quarterly folder for a given date."""
+        quarter_name = config.Config.get_quarter_folder_name(date)
+        folder = self.find_page_by_title(quarter_name)
+        return folder.get("id") if folder else None
+    
+    def find_weekly_page(self, title: str, parent_folder_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Find an existing weekly page by title."""
+        return self.find_page_by_title(title, parent_folder_id or self.parent_page_id)
+    
     def create_page(self, title: str, content: str, parent_id: Optional[str] = None) -> Dict[str, Any]:
         """Create a new Confluence page."""
         space_id = self.space_id
@@ -66,24 +103,61 @@ class ConfluenceClient:
         
         return result
     
-    def update_page(self, page_id: str, content: str, title: Optional[str] = None) -> Dict[str, Any]:
-        """Update an existing Confluence page."""
-        result = self.mcp.update_confluence_page(
-            cloud_id=self.cloud_id,
-            page_id=page_id,
-            body=content,
-            title=title,
-            format="markdown"
-        )
+    def update_page(self, page_id: str, content: str, title: Optional[str] = None,
+                    version: Optional[int] = None) -> Dict[str, Any]:
+        """Update an existing Confluence page.
         
+        With version (the new version number), the write only happens if the
+        page is still at version - 1; otherwise nothing is written and
+        {"id": page_id, "conflict": True} is returned. The MCP update tool
+        picks the next version itself, so unless CONFLUENCE_SEND_PAGE_VERSION
+        says it enforces a version we pass, the live version is read and
+        compared right before the write. If the page no longer exists,
+        {"id": page_id, "not_found": True} is returned. Any other failure is
+        raised.
+        """
+        sent_version = version if config.Config.CONFLUENCE_SEND_PAGE_VERSION else None
+        try:
+            if version is not None and sent_version is None:
+                current = page_version(self.mcp.get_confluence_page(
+                    cloud_id=self.cloud_id,
+                    page_id=page_id,
+                    format="markdown"
+                ))
+                if current is not None and current != version - 1:
+                    return {"id": page_id, "conflict": True}
+            
+            result = self.mcp.update_confluence_page(
+                cloud_id=self.cloud_id,
+                page_id=page_id,
+                body=content,
+                title=title,
+                format="markdown",
+                version=sent_version
+            )
+        except Exception as e:
+            if _is_not_found(e):
+                return {"id": page_id, "not_found": True}
+            if sent_version is not None and _is_version_conflict(e):
+                return {"id": page_id, "conflict": True}
+            raise
+        
+        if result.get("statusCode") == 404:
+            return {"id": page_id, "not_found": True}
+        if sent_version is not None and result.get("statusCode") == 409:
+            return {"id": page_id, "conflict": True}
         return result
     
-    def get_page_content(self, page_id: str) -> str:
-        """Get the current content of a Confluence page."""
+    def get_page(self, page_id: str) -> Dict[str, Any]:
+        """Get a page's current body and version number as {"id", "body", "version"}."""
         result = self.mcp.get_confluence_page(
             cloud_id=self.cloud_id,
             page_id=page_id,
             format="markdown"
         )
         
-        return result.get("body", "")
+        return {"id": page_id, "body": result.get("body", ""), "version": page_version(result)}
+    
+    def get_page_content(self, page_id: str) -> str:
+        """Get the current content of a Confluence page."""
+        return self.get_page(page_id)["body"]
@@ -1,50 +1,129 @@
 """Content generation for weekly updates."""
-import re
-from typing import List, Dict, Any, Set
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Dict, Any, Set, Callable, Optional, Tuple, Union
 from datetime import datetime
 from jira_aggregator import JiraAggregator
+from jira_store import JiraIssueStore
 from glean_aggregator import GleanAggregator
 from pendo_aggregator import PendoAggregator
 from granola_aggregator import GranolaAggregator
 from tone_analyzer import ToneAnalyzer
+from style_profile import StyleProfile
 from svp_filter import SVPFilter
+from content_ledger import ContentLedger
+from weekly_doc import NO_CUSTOMER_CALLS, Change, Section, WeeklyDoc
 import config
 
+# Result of a fallback source that was not needed because its primary source succeeded
+_NOT_FETCHED = object()
+
 class ContentGenerator:
     """Generates content for weekly update documents."""
     
     def __init__(self):
         """Initialize the content generator."""
-        self.jira = JiraAggregator()
+        self.svp_filter = SVPFilter()
+        self.jira = JiraAggregator(svp_filter=self.svp_filter, store=JiraIssueStore.from_config())
         self.glean = GleanAggregator()
         self.pendo = PendoAggregator()
         self.granola = GranolaAggregator()
         self.tone_analyzer = ToneAnalyzer()
-        self.svp_filter = SVPFilter()
-        self.added_content_hashes: Set[str] = set()
+        # Style learned from past finalized pages, loaded without reading them
+        self.style_profile = StyleProfile(analyzer=self.tone_analyzer)
+        self.tone_analyzer.load_style(self.style_profile.summary())
+        self.ledger = ContentLedger()
+        # Source name -> (result, error) from the last fetch_sources() call
+        self._prefetched: Dict[str, Tuple[Any, Optional[BaseException]]] = {}
+    
+    def begin_run(self) -> None:
+        """Reset run-scoped caches so a new job sees fresh source data."""
+        self.jira.reset_cache()
+        self.glean.reset_cache()
+        self._prefetched = {}
+    
+    def _source_loaders(self) -> Dict[str, Callable[[], Any]]:
+        """Map each source the sections read to the call that fetches it."""
+        loaders = {
+            "jira": self.jira.get_issue_set,
+            "glean_insights": self.glean.get_project_insights,
+        }
+        if self.granola is not None:
+            loaders["granola_customer_calls"] = self.granola.get_customer_calls
+        else:
+            loaders["glean_customer_calls"] = self.glean.get_customer_calls
+        return loaders
+    
+    def _fallback_loaders(self) -> Dict[str, Tuple[str, Callable[[], Any]]]:
+        """Map each fallback source to (the source it stands in for, the call that fetches it)."""
+        return {"glean_customer_calls": ("granola_customer_calls", self.glean.get_customer_calls)}
+    
+    @staticmethod
+    def _if_failed(primary: Future, loader: Callable[[], Any]) -> Any:
+        """Run a fallback loader once its primary source has failed; otherwise skip it."""
+        return loader() if primary.exception() is not None else _NOT_FETCHED
+    
+    def fetch_sources(self) -> Dict[str, Optional[BaseException]]:
+        """Fetch every source concurrently before any section is rendered.
+        
+        Each source's result or exception is kept separately, so one failing
+        service only affects the sections that read it. Fallback sources
+        (Glean customer calls) are fetched only if their primary source
+        (Granola) fails. Returns the errors by source name (None for sources
+        that succeeded).
+        """
+        loaders = self._source_loaders()
+        fallbacks = {
+            name: (primary, loader)
+            for name, (primary, loader) in self._fallback_loaders().items()
+            if primary in loaders
+        }
+        with ThreadPoolExecutor(max_workers=len(loaders) + len(fallbacks)) as pool:
+            futures = {name: pool.submit(loader) for name, loader in loaders.items()}
+            # A fallback is only fetched after its primary source fails
+            futures.update({
+                name: pool.submit(self._if_failed, futures[primary], loader)
+                for name, (primary, loader) in fallbacks.items()
+            })
+        
+        prefetched = {}
+        for name, future in futures.items():
+            error = future.exception()
+            result = None if error else future.result()
+            if result is not _NOT_FETCHED:
+                prefetched[name] = (result, error)
+        self._prefetched = prefetched
+        return {name: error for name, (_, error) in prefetched.items()}
+    
+    def _source(self, name: str, loader: Callable[[], Any]) -> Any:
+        """Return a prefetched source result (re-raising its error), or load it now."""
+        if name in self._prefetched:
+            result, error = self._prefetched[name]
+            if error is not None:
+                raise error
+            return result
+        return loader()
+    
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """Return request cache counters for the current run."""
+        return {"jira": self.jira.cache.stats(), "glean": self.glean.cache.stats()}
     
     def generate_highlights(self, existing_content: str = "") -> str:
         """Generate Highlights section."""
         highlights = []
         
-        # Get SVP-relevant items from Jira
-        jira_issues = self.jira.get_issues_updated_this_week()
-        svp_relevant = self.svp_filter.filter_for_highlights(jira_issues, "jira")
+        # Jira issues are fetched and classified once per run
+        issue_set = self._source("jira", self.jira.get_issue_set)
         
         # Get completed items (accomplishments)
-        completed = self.jira.get_completed_items()
-        for item in completed[:3]:  # Top 3 accomplishments
-            summary = self.jira.format_issue_summary(item)
-            highlights.append(f"* {summary}")
+        for record in issue_set.completed[:3]:  # Top 3 accomplishments
+            highlights.append(f"* {record.summary_line}")
         
         # Get blockers
-        blockers = self.jira.get_blockers()
-        for blocker in blockers[:2]:  # Top 2 blockers
-            summary = self.jira.format_issue_summary(blocker)
-            highlights.append(f"* Blocker: {summary}")
+        for record in issue_set.blockers[:2]:  # Top 2 blockers
+            highlights.append(f"* Blocker: {record.summary_line}")
         
         # Get key project milestones from Glean
-        project_insights = self.glean.get_project_insights()
+        project_insights = self._source("glean_insights", self.glean.get_project_insights)
         for insight in project_insights[:2]:  # Top 2 insights
             title = insight.get("title", "")
             if title:
@@ -63,19 +142,16 @@ class ContentGenerator:
         """Generate This Week section."""
         sections = []
         
+        issue_set = self._source("jira", self.jira.get_issue_set)
+        
         # Get initiatives from Jira
-        initiatives = self.jira.get_initiatives()
-        if initiatives:
+        if issue_set.initiatives:
             sections.append("* Team roadmap")
-            for initiative in initiatives[:5]:  # Top 5 initiatives
-                key = initiative.get("key", "")
-                summary = initiative.get("fields", {}).get("summary", "")
-                status = initiative.get("fields", {}).get("status", {}).get("name", "")
-                
-                sections.append(f"    * **{summary}** ({key}) - {status}")
+            for record in issue_set.initiatives[:5]:  # Top 5 initiatives
+                sections.append(f"    * **{record.summary}** ({record.key}) - {record.status}")
         
         # Get project updates from Glean
-        project_insights = self.glean.get_project_insights()
+        project_insights = self._source("glean_insights", self.glean.get_project_insights)
         if project_insights:
             sections.append("* Project Updates")
             for insight in project_insights[:5]:
@@ -87,12 +163,10 @@ class ContentGenerator:
                         sections.append(f"        * {snippet[:200]}...")
         
         # Get in-progress items
-        in_progress = self.jira.get_in_progress_items()
-        if in_progress:
+        if issue_set.in_progress:
             sections.append("* Active Work")
-            for item in in_progress[:5]:
-                summary = self.jira.format_issue_summary(item)
-                sections.append(f"    * {summary}")
+            for record in issue_set.in_progress[:5]:
+                sections.append(f"    * {record.summary_line}")
         
         content = "\n".join(sections)
         content = self.tone_analyzer.apply_tone(content, "this_week")
@@ -103,21 +177,18 @@ class ContentGenerator:
         """Generate Next Week section."""
         items = []
         
+        issue_set = self._source("jira", self.jira.get_issue_set)
+        
         # Get in-progress items that need follow-up
-        in_progress = self.jira.get_in_progress_items()
-        for item in in_progress[:5]:
-            summary = self.jira.format_issue_summary(item)
-            items.append(f"* Continue work on {summary}")
+        for record in issue_set.in_progress[:5]:
+            items.append(f"* Continue work on {record.summary_line}")
         
         # Get high-priority items assigned
-        jira_issues = self.jira.get_issues_updated_this_week()
-        high_priority = [i for i in jira_issues if self.svp_filter.is_svp_relevant(i, "jira")]
-        for item in high_priority[:3]:
-            summary = self.jira.format_issue_summary(item)
-            items.append(f"* {summary}")
+        for record in issue_set.svp_relevant[:3]:
+            items.append(f"* {record.summary_line}")
         
         # Get planned next steps from project documents
-        project_insights = self.glean.get_project_insights()
+        project_insights = self._source("glean_insights", self.glean.get_project_insights)
         for insight in project_insights[:3]:
             title = insight.get("title", "")
             if "next" in title.lower() or "plan" in title.lower():
@@ -136,7 +207,7 @@ class ContentGenerator:
         try:
             if self.granola is None:
                 raise ModuleNotFoundError("Granola not available")
-            customer_calls = self.granola.get_customer_calls()
+            customer_calls = self._source("granola_customer_calls", self.granola.get_customer_calls)
             for call in customer_calls:
                 formatted = self.granola.format_customer_call(call)
                 customer_name = formatted.get("customer_name", "Customer")
@@ -151,7 +222,7 @@ class ContentGenerator:
         except Exception as e:
             # Fallback to Glean if Granola fails
             try:
-                customer_calls = self.glean.get_customer_calls()
+                customer_calls = self._source("glean_customer_calls", self.glean.get_customer_calls)
                 for call in customer_calls:
                     formatted = self.glean.format_customer_call(call)
                     customer_name = formatted.get("customer_name", "Customer")
@@ -165,100 +236,50 @@ class ContentGenerator:
                 pass
         
         if not items:
-            return "No customer calls this week."
+            return NO_CUSTOMER_CALLS
         
         return "\n\n".join(items)
     
-    def generate_full_content(self, existing_content: str = "") -> str:
-        """Generate full weekly update content."""
-        sections = []
-        
-        # Highlights
-        highlights = self.generate_highlights(existing_content)
-        if highlights:
-            sections.append("## Highlights\n\n" + highlights)
-        
-        # This Week
-        this_week = self.generate_this_week(existing_content)
-        if this_week:
-            sections.append("\n## This Week\n\n" + this_week)
-        
-        # Next Week
-        next_week = self.generate_next_week(existing_content)
-        if next_week:
-            sections.append("\n## Next Week\n\n" + next_week)
-        
-        # Customer Corner
-        customer_corner = self.generate_customer_corner(existing_content)
-        if customer_corner:
-            sections.append("\n## Customer Corner\n\n" + customer_corner)
-        
-        return "\n".join(sections)
+    def generate_sections(self, existing_content: str = "") -> Dict[str, str]:
+        """Fetch all sources, then generate every section body keyed by section name."""
+        self.fetch_sources()
+        return {
+            "Highlights": self.generate_highlights(existing_content),
+            "This Week": self.generate_this_week(existing_content),
+            "Next Week": self.generate_next_week(existing_content),
+            "Customer Corner": self.generate_customer_corner(existing_content),
+        }
     
-    @staticmethod
-    def compile_and_dedupe_sections(raw_content: str) -> str:
-        """
-        Parse page content that may have repeated sections (from daily appends)
-        and return a single cohesive document with one section each, no duplicates.
-        """
-        section_order = ["Highlights", "This Week", "Next Week", "Customer Corner"]
-        # Split by ## and keep header + body (handle optional leading newline)
-        parts = re.split(r"\n## ", raw_content.strip())
-        sections: Dict[str, List[str]] = {name: [] for name in section_order}
-        seen: Dict[str, Set[str]] = {name: set() for name in section_order}
-
-        for i, part in enumerate(parts):
-            part = part.strip()
-            if not part:
-                continue
-            lines = part.split("\n")
-            header = lines[0].strip()
-            if header.startswith("## "):
-                header = header[3:].strip()
-            # First part might be leading text with no section header
-            if i == 0 and not re.match(r"^Highlights|^This Week|^Next Week|^Customer Corner", header, re.I):
-                continue
-            # Normalize header to match section_order (e.g. "Highlights" or "highlights" -> "Highlights")
-            section_name = None
-            for name in section_order:
-                if header.lower() == name.lower():
-                    section_name = name
-                    break
-            if section_name is None:
-                continue
-            body_lines = lines[1:]
-            for line in body_lines:
-                line = line.strip()
-                if not line:
-                    continue
-                # Normalize for dedupe: lowercase, collapse whitespace
-                key = re.sub(r"\s+", " ", line.lower()).strip()
-                if key and key not in seen[section_name]:
-                    seen[section_name].add(key)
-                    sections[section_name].append(line)
-
-        out = []
-        for name in section_order:
-            if sections[name]:
-                out.append("## " + name + "\n\n" + "\n".join(sections[name]))
-        return "\n\n".join(out) if out else raw_content.strip()
-
-    def append_to_section(self, section_content: str, new_items: List[str]) -> str:
-        """Append new items to an existing section without duplicates."""
-        # Simple deduplication by checking if item already exists
-        existing_lines = set(section_content.split("\n"))
-        new_content = section_content
-        
-        for item in new_items:
-            # Check if similar content already exists
-            item_hash = hash(item.lower().strip())
-            if item_hash not in self.added_content_hashes:
-                new_content += "\n" + item
-                self.added_content_hashes.add(item_hash)
+    def parse_sections(self, sections: Dict[str, str]) -> Dict[str, Section]:
+        """Parse generated section bodies once, so a job can merge them more than once."""
+        return {name: Section.from_body(name, body) for name, body in sections.items() if body}
+    
+    def merge_new_content(self, doc: WeeklyDoc, new_sections: Dict[str, Union[str, Section]],
+                          week_friday: Optional[datetime] = None,
+                          changes: Optional[List[Change]] = None) -> int:
+        """Merge generated sections into a week's page in place, skipping lines any run already wrote that week.
         
-        return new_content
+        Section bodies may be given as markdown or already parsed by
+        parse_sections; merging never modifies them. Lines added or removed
+        are appended to changes when it is given. Returns the number of lines
+        added.
+        """
+        week = week_friday or config.Config.get_week_friday()
+        return doc.merge(
+            {
+                name: body if isinstance(body, Section) else Section.from_body(name, body)
+                for name, body in new_sections.items() if body
+            },
+            lambda section, key: self.ledger.contains(week, section, key),
+            changes,
+        )
+    
+    def record_written(self, doc: WeeklyDoc, week_friday: Optional[datetime] = None) -> int:
+        """Record every section line of a page just written for a week; returns how many were new."""
+        week = week_friday or config.Config.get_week_friday()
+        return self.ledger.record(week, ((name, bullet.key) for name, bullet in doc.iter_items()))
     
-    def _hash_content(self, content: str) -> str:
-        """Generate a hash for content deduplication."""
-        import hashlib
-        return hashlib.md5(content.lower().strip().encode()).hexdigest()
+    def learn_style(self, doc: WeeklyDoc, week_friday: Optional[datetime] = None) -> None:
+        """Fold a week's finalized page into the style profile and adopt the updated style."""
+        week = week_friday or config.Config.get_week_friday()
+        self.tone_analyzer.load_style(self.style_profile.fold(week, doc.render()))
@@ -0,0 +1,65 @@
+"""Persistent per-week ledger of content already written to weekly pages."""
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+import config
+from local_state import JsonStateFile, state_path
+from weekly_doc import item_id
+
+
+def week_key(week_friday: datetime) -> str:
+    """Return the ledger key of the week ending on week_friday."""
+    return week_friday.strftime("%Y-%m-%d")
+
+
+class ContentLedger:
+    """Digests of every line written to each week's page, shared by all jobs.
+
+    The daily scheduler, Slack-triggered runs and manual runs are separate
+    processes, so the ledger is kept in a JSON state file and re-read when
+    another process changes it. Membership checks hit an in-memory set per
+    week. Weeks older than Config.CONTENT_LEDGER_WEEKS are dropped whenever
+    the ledger is written.
+    """
+
+    def __init__(self, state: Optional[JsonStateFile] = None):
+        """Bind to the ledger state file."""
+        self.state = state or JsonStateFile(state_path("content_ledger.json"))
+        self._loaded: Optional[Dict[str, Any]] = None
+        self._sets: Dict[str, Set[str]] = {}
+
+    def _week_set(self, week: datetime) -> Set[str]:
+        data = self.state.load()
+        if data is not self._loaded:
+            self._loaded = data
+            self._sets = {}
+        key = week_key(week)
+        digests = self._sets.get(key)
+        if digests is None:
+            digests = set(data.get("weeks", {}).get(key, []))
+            self._sets[key] = digests
+        return digests
+
+    def contains(self, week: datetime, section: Optional[str], key: str) -> bool:
+        """Return True if a normalized line was already written in a section of that week's page."""
+        return item_id(section, key) in self._week_set(week)
+
+    def record(self, week: datetime, items: Iterable[Tuple[Optional[str], str]]) -> int:
+        """Add (section, normalized line) pairs to a week and expire old weeks; returns how many were new."""
+        fresh = {item_id(section, key) for section, key in items if key}
+        fresh -= self._week_set(week)
+        if not fresh:
+            return 0
+        key = week_key(week)
+        cutoff = week_key(week - timedelta(weeks=config.Config.CONTENT_LEDGER_WEEKS))
+
+        def add(data: Dict[str, Any]) -> None:
+            weeks = {
+                name: digests
+                for name, digests in data.get("weeks", {}).items()
+                if name > cutoff
+            }
+            weeks[key] = sorted(set(weeks.get(key, [])) | fresh)
+            data["weeks"] = weeks
+
+        self.state.update(add)
+        return len(fresh)
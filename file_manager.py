@@ -1,15 +1,28 @@
 """File management for weekly update documents."""
-from typing import Optional, Dict, Any
+import hashlib
+from typing import Optional, Dict, Any, Union
 from datetime import datetime, timedelta
-from confluence_client import ConfluenceClient
+from confluence_client import ConfluenceClient, page_version
+from page_index import PageIndex
+from page_mirror import PageMirror
+from weekly_doc import WeeklyDoc
 import config
 
+
+def content_fingerprint(content: str) -> str:
+    """Return a stable digest of a page body."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
 class FileManager:
     """Manages creation and finding of weekly update files."""
     
     def __init__(self):
         """Initialize the file manager."""
         self.confluence = ConfluenceClient()
+        # Resolves quarter folders and weekly pages by title without a Confluence call each time
+        self.page_index = PageIndex(self.confluence.find_page_by_title)
+        # Page id -> last known body and version, so updates need no read first
+        self.mirror = PageMirror()
     
     def get_current_week_friday(self) -> datetime:
         """Get the Friday date of the current week."""
@@ -26,10 +39,7 @@ class FileManager:
     def find_quarter_folder_id(self, date: datetime) -> Optional[str]:
         """Find the ID of the quarterly folder for a given date."""
         quarter_name = self.get_quarter_folder_name(date)
-        
-        # Use confluence client to find folder
-        folder = self.confluence.find_quarter_folder(date)
-        return folder
+        return self.page_index.lookup(quarter_name)
     
     def find_or_create_quarter_folder(self, date: datetime) -> str:
         """Find or create the quarterly folder for a date."""
@@ -45,6 +55,7 @@ class FileManager:
             content="",
             parent_id=config.Config.CONFLUENCE_PARENT_PAGE_ID
         )
+        self.page_index.record(quarter_name, folder.get("id"))
         
         return folder.get("id")
     
@@ -52,40 +63,40 @@ class FileManager:
         """Find an existing weekly page for a given Friday date."""
         title = self.get_page_title_for_date(date)
         
-        # First try to find in quarter folder
-        folder_id = self.find_quarter_folder_id(date)
-        if folder_id:
-            page = self.confluence.find_weekly_page(title, folder_id)
-            if page:
-                return page
-        
-        # Also check parent directly (for pages not in folders)
-        page = self.confluence.find_weekly_page(title, config.Config.CONFLUENCE_PARENT_PAGE_ID)
-        return page
+        # The index covers pages in quarter folders and directly under the parent
+        page_id = self.page_index.lookup(title)
+        if page_id:
+            return {"id": page_id, "title": title}
+        return None
     
-    def create_weekly_page(self, date: datetime) -> Dict[str, Any]:
-        """Create a new weekly update page."""
+    def create_weekly_page(self, date: datetime, content: Optional[Union[str, WeeklyDoc]] = None,
+                           folder_id: Optional[str] = None) -> Dict[str, Any]:
+        """Create a new weekly update page.
+        
+        The page is created with its final body in one write when content is
+        given (empty section headers otherwise). Pass folder_id when the
+        quarter folder was already resolved.
+        """
         title = self.get_page_title_for_date(date)
         
         # Get or create quarterly folder
-        folder_id = self.find_or_create_quarter_folder(date)
+        if not folder_id:
+            folder_id = self.find_or_create_quarter_folder(date)
         
-        # Initialize with empty sections
-        initial_content = """## Highlights
-
-## This Week
-
-## Next Week
-
-## Customer Corner
-"""
+        if isinstance(content, WeeklyDoc):
+            content = content.render()
+        if not content or not content.strip():
+            # Initialize with empty sections
+            content = WeeklyDoc.skeleton().render()
         
         # Create the page
         page = self.confluence.create_page(
             title=title,
-            content=initial_content,
+            content=content,
             parent_id=folder_id
         )
+        self.page_index.record(title, page.get("id"))
+        self.mirror.record(page.get("id"), content, page_version(page) or 1)
         
         return page
     
@@ -119,16 +130,75 @@ class FileManager:
         
         return existing_page is None
     
-    def update_page_content(self, page_id: str, new_content: str, append: bool = True) -> Dict[str, Any]:
-        """Update a page's content, optionally appending."""
-        if append:
-            # Get existing content
-            existing_content = self.confluence.get_page_content(page_id)
+    def _mirrored_page(self, page_id: str, refresh: bool = False) -> Dict[str, Any]:
+        """Return a page's mirrored body and version, reading it from Confluence only when not mirrored.
+        
+        The mirror only holds pages with a known version, so a page whose
+        version Confluence does not report is read again every time.
+        """
+        page = None if refresh else self.mirror.get(page_id)
+        if page is None:
+            page = self.confluence.get_page(page_id)
+            self.mirror.record(page_id, page["body"], page["version"])
+        return page
+    
+    def get_page_content(self, page_id: str) -> str:
+        """Get a page's body, from the local mirror when it is there."""
+        return self._mirrored_page(page_id)["body"]
+    
+    def get_mirrored_content(self, page_id: str) -> Optional[str]:
+        """Return a page's last known body without contacting Confluence (None if not mirrored)."""
+        page = self.mirror.get(page_id)
+        return page["body"] if page else None
+    
+    def update_page_content(self, page_id: str, new_content: Union[str, WeeklyDoc],
+                            append: bool = True) -> Dict[str, Any]:
+        """Update a page's content, optionally appending.
+        
+        A WeeklyDoc is rendered to markdown here, once, right before the write.
+        The write is skipped (and {"id": page_id, "unchanged": True} returned)
+        when there is nothing to append or the page already has that body, so
+        reruns create no new page version. Whenever the page body is known, the
+        result carries its content_fingerprint as "fingerprint", so callers need
+        not render the page again. Writes are conditional on the mirrored
+        version: if the page was edited elsewhere, it is read again and an
+        append is retried once on the fresh body, while a full replacement
+        returns {"id": page_id, "conflict": True} for the caller to rebuild.
+        If the page no longer exists, it is dropped from the index and the
+        mirror and {"id": page_id, "not_found": True} is returned, so the next
+        lookup of its title asks Confluence again.
+        """
+        if isinstance(new_content, WeeklyDoc):
+            new_content = new_content.render()
+        if append and not new_content.strip():
+            return {"id": page_id, "unchanged": True}
+        
+        page = self._mirrored_page(page_id)
+        for _ in range(2):
+            if append:
+                # Append new content (deduplication handled by content generator)
+                updated_content = page["body"] + "\n\n" + new_content
+            else:
+                updated_content = new_content
             
-            # Append new content (deduplication handled by content generator)
-            updated_content = existing_content + "\n\n" + new_content
-        else:
-            updated_content = new_content
-        
-        # Update the page
-        return self.confluence.update_page(page_id, updated_content)
+            fingerprint = content_fingerprint(updated_content)
+            if page["body"] == updated_content:
+                return {"id": page_id, "unchanged": True, "fingerprint": fingerprint}
+            
+            # Update the page unless it moved past the mirrored version. A page
+            # without a known version was just read live, so its body is current.
+            version = page["version"] + 1 if page["version"] is not None else None
+            result = self.confluence.update_page(page_id, updated_content, version=version)
+            if result.get("not_found"):
+                # A deleted page must not stay cached for PAGE_INDEX_MAX_AGE_SECONDS
+                self.page_index.forget(page_id)
+                self.mirror.forget(page_id)
+                return result
+            if not result.get("conflict"):
+                self.mirror.record(page_id, updated_content, page_version(result) or version)
+                return dict(result, fingerprint=fingerprint)
+            
+            page = self._mirrored_page(page_id, refresh=True)
+            if not append:
+                break
+        return result
@@ -3,13 +3,35 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 import config
 from mcp_integration import MCPIntegration
+from request_cache import RequestCache
 
 class GleanAggregator:
     """Aggregates data from Glean for weekly updates."""
     
-    def __init__(self):
+    PROJECT_UPDATES_QUERY = "project updates initiatives SingleOps migration Kiro Cloudinary performance"
+    
+    def __init__(self, cache: Optional[RequestCache] = None):
         """Initialize the Glean aggregator."""
         self.mcp = MCPIntegration()
+        self.cache = cache or RequestCache()
+    
+    def reset_cache(self) -> None:
+        """Start a new run: forget memoized searches and reset counters."""
+        self.cache.reset()
+    
+    def invalidate_project_updates(self, days_back: Optional[int] = None) -> None:
+        """Drop memoized project update searches (all windows, or one days_back window)."""
+        if days_back is None:
+            self.cache.invalidate()
+            return
+        start_str, end_str = self._date_window(days_back)
+        self.cache.invalidate(("glean_search", self.PROJECT_UPDATES_QUERY, start_str, end_str))
+    
+    def _date_window(self, days_back: int):
+        """Return the (after, before) date strings for a lookback window ending today."""
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=days_back)
+        return start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")
     
     def get_week_start(self) -> datetime:
         """Get the start of the current week (Monday)."""
@@ -27,23 +49,26 @@ class GleanAggregator:
         return self.get_week_start() - timedelta(days=1)
     
     def search_project_updates(self, days_back: int = 7) -> List[Dict[str, Any]]:
-        """Search Glean for project-related documents updated recently."""
-        # Query: project updates initiatives SingleOps migration Kiro Cloudinary performance
-        query = "project updates initiatives SingleOps migration Kiro Cloudinary performance"
+        """Search Glean for project-related documents updated recently.
+        
+        Results are memoized per query and date window for the current run, so
+        every section shares one Glean search.
+        """
+        query = self.PROJECT_UPDATES_QUERY
         
         # Calculate date range
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days_back)
-        start_str = start_date.strftime("%Y-%m-%d")
-        end_str = end_date.strftime("%Y-%m-%d")
+        start_str, end_str = self._date_window(days_back)
         
-        results = self.mcp.glean_search(
-            query=query,
-            after=start_str,
-            before=end_str
+        results = self.cache.get_or_fetch(
+            ("glean_search", query, start_str, end_str),
+            lambda: self.mcp.glean_search(
+                query=query,
+                after=start_str,
+                before=end_str
+            )
         )
         
-        return results
+        return list(results)
     
     def get_customer_calls(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> List[Dict[str, Any]]:
         """Get customer call meetings from Glean."""
@@ -0,0 +1,101 @@
+"""Single-pass classification index over Jira issues."""
+from typing import List, Dict, Any, Iterable, Optional
+from svp_filter import SVPFilter
+
+# Issue fields IssueRecord reads; Jira queries request only these
+FIELDS = ("summary", "status", "priority", "issuetype")
+INITIATIVE_TYPES = ("Initiative", "Epic")
+PRIORITY_RANKS = {"Highest": 0, "High": 1, "Medium": 2, "Low": 3, "Lowest": 4}
+UNRANKED_PRIORITY = len(PRIORITY_RANKS)
+
+
+class IssueRecord:
+    """Fields of one Jira issue extracted once, plus its classification."""
+
+    __slots__ = (
+        "issue", "key", "summary", "status", "status_category", "priority",
+        "priority_rank", "issue_type", "svp_relevant", "svp_score",
+    )
+
+    def __init__(self, issue: Dict[str, Any], svp_filter: SVPFilter):
+        fields = issue.get("fields") or {}
+        status = fields.get("status") or {}
+        status_category = status.get("statusCategory") or {}
+        priority = fields.get("priority") or {}
+        issue_type = fields.get("issuetype") or {}
+
+        self.issue = issue
+        self.key = issue.get("key", "")
+        self.summary = fields.get("summary") or ""
+        self.status = status.get("name", "")
+        self.status_category = status_category.get("key", "")
+        self.priority = priority.get("name", "")
+        self.priority_rank = PRIORITY_RANKS.get(self.priority, UNRANKED_PRIORITY)
+        self.issue_type = issue_type.get("name", "")
+        self.svp_score, self.svp_relevant = svp_filter.evaluate_jira(
+            self.priority, self.status, self.issue_type, self.summary
+        )
+
+    @property
+    def summary_line(self) -> str:
+        """Format the issue the same way as JiraAggregator.format_issue_summary."""
+        return f"{self.key}: {self.summary} ({self.status})"
+
+
+class IssueSet:
+    """Jira issues indexed into the buckets the weekly update reads.
+
+    Each issue is parsed and classified exactly once when it is added; the
+    bucket lists then serve every section without rescanning.
+    """
+
+    def __init__(self, svp_filter: Optional[SVPFilter] = None):
+        """Initialize an empty issue set."""
+        self.svp_filter = svp_filter or SVPFilter()
+        self.records: List[IssueRecord] = []
+        self.by_key: Dict[str, IssueRecord] = {}
+        self.initiatives: List[IssueRecord] = []
+        self.blockers: List[IssueRecord] = []
+        self.completed: List[IssueRecord] = []
+        self.in_progress: List[IssueRecord] = []
+        self.svp_relevant: List[IssueRecord] = []
+
+    @classmethod
+    def from_issues(cls, issues: Iterable[Dict[str, Any]], svp_filter: Optional[SVPFilter] = None) -> "IssueSet":
+        """Build an issue set from raw Jira issue dicts in one pass."""
+        issue_set = cls(svp_filter)
+        for issue in issues:
+            issue_set.add(issue)
+        return issue_set
+
+    def add(self, issue: Dict[str, Any]) -> IssueRecord:
+        """Classify one issue into every bucket it belongs to."""
+        record = IssueRecord(issue, self.svp_filter)
+        self.records.append(record)
+        if record.key:
+            self.by_key[record.key] = record
+
+        status_lower = record.status.lower()
+        if record.issue_type in INITIATIVE_TYPES:
+            self.initiatives.append(record)
+        if "blocked" in status_lower or record.priority in ("Highest", "High"):
+            self.blockers.append(record)
+        if record.status_category == "done" or status_lower == "done":
+            self.completed.append(record)
+        if record.status_category == "indeterminate" or "progress" in status_lower:
+            self.in_progress.append(record)
+        if record.svp_relevant:
+            self.svp_relevant.append(record)
+        return record
+
+    @property
+    def issues(self) -> List[Dict[str, Any]]:
+        """Return the raw issue dicts in fetch order."""
+        return [record.issue for record in self.records]
+
+    def prioritized(self) -> List[IssueRecord]:
+        """Return records ordered by SVP relevance score (most relevant first)."""
+        return sorted(self.records, key=lambda record: record.svp_score, reverse=True)
+
+    def __len__(self) -> int:
+        return len(self.records)
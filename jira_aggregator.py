@@ -1,16 +1,50 @@
 """Jira data aggregation for weekly updates."""
-from typing import List, Dict, Any
+import math
+import time
+from typing import List, Dict, Any, Iterable, Optional, Set
 from datetime import datetime, timedelta
 import config
 from mcp_integration import MCPIntegration
+from request_cache import RequestCache
+from issue_set import IssueSet, FIELDS as ISSUE_SET_FIELDS
+from jira_store import JiraIssueStore
+from svp_filter import SVPFilter
 
 class JiraAggregator:
     """Aggregates data from Jira for weekly updates."""
     
-    def __init__(self, cloud_id: str = None):
-        """Initialize the Jira aggregator."""
+    # Base query; the update-time bound is added per run
+    ISSUES_JQL = "assignee = currentUser()"
+    
+    def __init__(self, cloud_id: str = None, cache: Optional[RequestCache] = None,
+                 svp_filter: Optional[SVPFilter] = None, fields: Optional[Iterable[str]] = None,
+                 store: Optional[JiraIssueStore] = None):
+        """Initialize the Jira aggregator.
+        
+        fields lists the issue fields to request; by default only the fields
+        IssueSet and SVPFilter read are fetched. With a store, each run only
+        fetches issues updated since the last sync and answers from the store.
+        """
         self.cloud_id = cloud_id or config.Config.JIRA_CLOUD_ID
         self.mcp = MCPIntegration()
+        self.cache = cache or RequestCache()
+        self.svp_filter = svp_filter or SVPFilter()
+        self.store = store
+        self.fields: List[str] = []
+        self.require_fields(*(fields or ISSUE_SET_FIELDS + self.svp_filter.JIRA_FIELDS))
+        if self.store is not None:
+            # The store's watermark is the newest "updated" value it has seen
+            self.require_fields("updated")
+    
+    def require_fields(self, *fields: str) -> None:
+        """Add issue fields a consumer needs to every subsequent query."""
+        for field in fields:
+            if field not in self.fields:
+                self.fields.append(field)
+    
+    def reset_cache(self) -> None:
+        """Start a new run: forget cached issue fetches and reset counters."""
+        self.cache.reset()
     
     def get_week_start(self) -> datetime:
         """Get the start of the current week (Monday)."""
@@ -19,80 +53,118 @@ class JiraAggregator:
         monday = today.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=days_since_monday)
         return monday
     
-    def get_issues_updated_this_week(self) -> List[Dict[str, Any]]:
-        """Get Jira issues assigned to current user and updated this week."""
+    def _issues_jql(self) -> str:
+        """Build the JQL for issues assigned to the current user this week."""
         week_start = self.get_week_start()
         week_start_str = week_start.strftime("%Y-%m-%d")
         
         # JQL query: assignee = currentUser() AND updated >= startOfWeek()
-        jql = f"assignee = currentUser() AND updated >= {week_start_str} ORDER BY updated DESC"
+        return f"{self.ISSUES_JQL} AND updated >= {week_start_str} ORDER BY updated DESC"
+    
+    def _sync_store(self) -> IssueSet:
+        """Fetch only issues changed since the last sync, merge them, and read the week from the store."""
+        week_start = self.get_week_start()
+        scope = f"{self.cloud_id}|{self.ISSUES_JQL}|{','.join(self.fields)}"
         
-        issues = self.mcp.get_jira_issues(
+        jql = f"{self.ISSUES_JQL} AND updated >= {self._updated_bound(scope, week_start)} ORDER BY updated DESC"
+        fetched = set()
+        
+        def track(issues):
+            for issue in issues:
+                fetched.add(issue.get("key"))
+                yield issue
+        
+        self.store.upsert(scope, track(self.mcp.get_jira_issues(
             cloud_id=self.cloud_id,
             jql=jql,
-            max_results=50
-        )
+            page_size=config.Config.JIRA_PAGE_SIZE,
+            fields=list(self.fields)
+        )))
+        # Earlier weeks are never read again
+        self.store.prune(scope, before=week_start)
+        self._drop_unmatched(scope, week_start, fetched)
         
-        return issues
+        return IssueSet.from_issues(self.store.iter_issues(scope, since=week_start), self.svp_filter)
     
-    def get_initiatives(self) -> List[Dict[str, Any]]:
-        """Get initiatives/epics assigned to current user."""
-        issues = self.get_issues_updated_this_week()
+    def _drop_unmatched(self, scope: str, week_start: datetime, fetched: Set[str]) -> None:
+        """Remove stored issues the base query no longer matches (e.g. reassigned ones).
+        
+        A reassigned issue never shows up in a delta, so the week's live keys
+        are listed with one keys-only query over the base JQL. Listing the
+        query's own matches never names a deleted or hidden issue, which a
+        "key in (...)" lookup would be rejected for. The bound starts a day
+        early so that Jira reading the date in another timezone cannot drop
+        an issue updated near the week boundary.
+        """
+        stored = [key for key in self.store.keys(scope, since=week_start) if key not in fetched]
+        if not stored:
+            return
+        since = (week_start - timedelta(days=1)).strftime("%Y-%m-%d")
+        live = {issue.get("key") for issue in self.mcp.get_jira_issues(
+            cloud_id=self.cloud_id,
+            jql=f"{self.ISSUES_JQL} AND updated >= {since}",
+            page_size=config.Config.JIRA_PAGE_SIZE,
+            fields=["key"]
+        )}
+        self.store.remove(scope, [key for key in stored if key not in live])
+    
+    def _updated_bound(self, scope: str, week_start: datetime) -> str:
+        """Return the JQL lower bound on "updated" for the next sync of a scope.
         
-        # Filter for initiatives/epics
-        initiatives = []
-        for issue in issues:
-            issue_type = issue.get("fields", {}).get("issuetype", {}).get("name", "")
-            if issue_type in ["Initiative", "Epic"]:
-                initiatives.append(issue)
+        Jira reads absolute times in the Jira user's profile timezone, not the
+        server's, so once a watermark exists the bound is a relative offset
+        ("-15m") counted back from now, which means the same instant in any
+        timezone.
+        """
+        overlap = config.Config.JIRA_SYNC_OVERLAP_MINUTES
+        watermark = self.store.get_watermark(scope)
+        if watermark is None or watermark - timedelta(minutes=overlap) <= week_start:
+            return week_start.strftime("%Y-%m-%d")
+        minutes = math.ceil((time.time() - watermark.timestamp()) / 60) + overlap
+        return f"-{max(minutes, overlap)}m"
+    
+    def get_issue_set(self) -> IssueSet:
+        """Get this week's issues classified into buckets in a single pass."""
+        jql = self._issues_jql()
+        if self.store is not None:
+            return self.cache.get_or_fetch(("jira_store_sync", self.cloud_id, jql), self._sync_store)
         
-        return initiatives
+        # Every bucket and section asks for the same JQL; fetch and classify it once per run.
+        # Issues are classified page by page as the paginated fetch yields them.
+        page_size = config.Config.JIRA_PAGE_SIZE
+        fields = tuple(self.fields)
+        return self.cache.get_or_fetch(
+            ("jira_issues", self.cloud_id, jql, page_size, fields),
+            lambda: IssueSet.from_issues(
+                self.mcp.get_jira_issues(
+                    cloud_id=self.cloud_id,
+                    jql=jql,
+                    page_size=page_size,
+                    fields=list(fields)
+                ),
+                self.svp_filter
+            )
+        )
+    
+    def get_issues_updated_this_week(self) -> List[Dict[str, Any]]:
+        """Get Jira issues assigned to current user and updated this week."""
+        return self.get_issue_set().issues
+    
+    def get_initiatives(self) -> List[Dict[str, Any]]:
+        """Get initiatives/epics assigned to current user."""
+        return [record.issue for record in self.get_issue_set().initiatives]
     
     def get_blockers(self) -> List[Dict[str, Any]]:
         """Get blocked issues or high-priority issues."""
-        issues = self.get_issues_updated_this_week()
-        
-        blockers = []
-        for issue in issues:
-            status = issue.get("fields", {}).get("status", {}).get("name", "")
-            priority = issue.get("fields", {}).get("priority", {})
-            priority_name = priority.get("name", "") if priority else ""
-            
-            # Check if blocked or highest/high priority
-            if "blocked" in status.lower() or priority_name in ["Highest", "High"]:
-                blockers.append(issue)
-        
-        return blockers
+        return [record.issue for record in self.get_issue_set().blockers]
     
     def get_completed_items(self) -> List[Dict[str, Any]]:
         """Get issues completed this week."""
-        issues = self.get_issues_updated_this_week()
-        
-        completed = []
-        for issue in issues:
-            status = issue.get("fields", {}).get("status", {}).get("name", "")
-            status_category = issue.get("fields", {}).get("status", {}).get("statusCategory", {})
-            category_key = status_category.get("key", "") if status_category else ""
-            
-            if category_key == "done" or status.lower() == "done":
-                completed.append(issue)
-        
-        return completed
+        return [record.issue for record in self.get_issue_set().completed]
     
     def get_in_progress_items(self) -> List[Dict[str, Any]]:
         """Get issues currently in progress."""
-        issues = self.get_issues_updated_this_week()
-        
-        in_progress = []
-        for issue in issues:
-            status = issue.get("fields", {}).get("status", {}).get("name", "")
-            status_category = issue.get("fields", {}).get("status", {}).get("statusCategory", {})
-            category_key = status_category.get("key", "") if status_category else ""
-            
-            if category_key == "indeterminate" or "progress" in status.lower():
-                in_progress.append(issue)
-        
-        return in_progress
+        return [record.issue for record in self.get_issue_set().in_progress]
     
     def format_issue_summary(self, issue: Dict[str, Any]) -> str:
         """Format an issue for display."""
@@ -0,0 +1,156 @@
+"""Local SQLite store of Jira issues for incremental syncs."""
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+import config
+
+JIRA_DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%f%z"
+
+
+def parse_jira_datetime(value: str) -> Optional[datetime]:
+    """Parse a Jira timestamp such as 2026-02-10T14:23:11.000-0500 into local time."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.strptime(value, JIRA_DATETIME_FORMAT)
+    except ValueError:
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+class JiraIssueStore:
+    """Jira issues keyed by issue key, with a high-water mark per query scope.
+
+    A scope names one query (base JQL plus requested fields). Each sync only
+    needs issues updated since the scope's watermark; everything older is
+    served from the store. Issues that stop matching the query (for example
+    after reassignment) never show up in a delta, so callers check the stored
+    keys against the live query and remove() the ones it no longer returns.
+    """
+
+    def __init__(self, path: str):
+        """Open (creating if needed) the store at path."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS issues (
+                scope TEXT NOT NULL,
+                key TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (scope, key)
+            );
+            CREATE INDEX IF NOT EXISTS issues_scope_updated ON issues (scope, updated_at);
+            CREATE TABLE IF NOT EXISTS sync_state (
+                scope TEXT PRIMARY KEY,
+                watermark REAL NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+
+    @classmethod
+    def from_config(cls) -> Optional["JiraIssueStore"]:
+        """Open the configured store, or return None when incremental sync is disabled."""
+        path = config.Config.JIRA_STORE_PATH
+        return cls(path) if path else None
+
+    def get_watermark(self, scope: str) -> Optional[datetime]:
+        """Return the newest issue update time seen for a scope."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT watermark FROM sync_state WHERE scope = ?", (scope,)
+            ).fetchone()
+        return datetime.fromtimestamp(row[0]) if row else None
+
+    def upsert(self, scope: str, issues: Iterable[Dict[str, Any]]) -> int:
+        """Merge fetched issues into the store and advance the watermark.
+
+        Issues are written as they are consumed from the iterable, so a
+        paginated fetch is never held in memory as a whole. Returns the number
+        of issues merged.
+        """
+        count = 0
+        newest = None
+        with self._lock:
+            for issue in issues:
+                key = issue.get("key")
+                if not key:
+                    continue
+                updated = parse_jira_datetime((issue.get("fields") or {}).get("updated", ""))
+                updated_at = (updated or datetime.now()).timestamp()
+                # A stale or replayed page never overwrites a newer copy of an issue
+                self._conn.execute(
+                    "INSERT INTO issues (scope, key, updated_at, data) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(scope, key) DO UPDATE SET updated_at = excluded.updated_at, data = excluded.data "
+                    "WHERE excluded.updated_at >= issues.updated_at",
+                    (scope, key, updated_at, json.dumps(issue)),
+                )
+                if updated is not None and (newest is None or updated_at > newest):
+                    newest = updated_at
+                count += 1
+            if newest is not None:
+                self._conn.execute(
+                    "INSERT INTO sync_state (scope, watermark) VALUES (?, ?) "
+                    "ON CONFLICT(scope) DO UPDATE SET watermark = MAX(watermark, excluded.watermark)",
+                    (scope, newest),
+                )
+            self._conn.commit()
+        return count
+
+    def iter_issues(self, scope: str, since: datetime) -> Iterator[Dict[str, Any]]:
+        """Yield stored issues updated at or after since, most recently updated first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM issues WHERE scope = ? AND updated_at >= ? ORDER BY updated_at DESC",
+                (scope, since.timestamp()),
+            ).fetchall()
+        for (data,) in rows:
+            yield json.loads(data)
+
+    def keys(self, scope: str, since: datetime) -> List[str]:
+        """Return the keys of stored issues updated at or after since."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key FROM issues WHERE scope = ? AND updated_at >= ? ORDER BY key",
+                (scope, since.timestamp()),
+            ).fetchall()
+        return [key for (key,) in rows]
+
+    def remove(self, scope: str, keys: Iterable[str]) -> int:
+        """Delete issues by key; returns the number removed."""
+        with self._lock:
+            cursor = self._conn.executemany(
+                "DELETE FROM issues WHERE scope = ? AND key = ?", [(scope, key) for key in keys]
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+    def prune(self, scope: str, before: datetime) -> int:
+        """Delete issues last updated before a cutoff; returns the number removed."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM issues WHERE scope = ? AND updated_at < ?",
+                (scope, before.timestamp()),
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,85 @@
+"""Compiled multi-keyword matcher (Aho-Corasick) shared by the content filters."""
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class KeywordMatcher:
+    """Finds every occurrence of a fixed set of keywords in one pass over a text.
+
+    The keywords are compiled once into an Aho-Corasick automaton with a full
+    transition table, so matching costs one dict lookup per character however
+    many keywords there are. Matching is case-sensitive; lower-case both the
+    keywords and the text for case-insensitive matching. By default a keyword
+    matches anywhere, like `keyword in text`; with word_boundaries=True it
+    only matches when not preceded or followed by a letter, digit or "_".
+    """
+
+    def __init__(self, keywords: Iterable[str], word_boundaries: bool = False):
+        """Compile the automaton for a keyword vocabulary (empty keywords are ignored)."""
+        self.keywords: List[str] = sorted({keyword for keyword in keywords if keyword})
+        self.word_boundaries = word_boundaries
+        # State -> {char: next state}; state 0 is the root
+        self._delta: List[Dict[str, int]] = [{}]
+        # State -> keywords ending at that state (own and via suffix links)
+        self._output: List[Tuple[str, ...]] = [()]
+        self._build()
+
+    def _build(self) -> None:
+        goto: List[Dict[str, int]] = [{}]
+        output: List[List[str]] = [[]]
+        for keyword in self.keywords:
+            state = 0
+            for char in keyword:
+                nxt = goto[state].get(char)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][char] = nxt
+                    goto.append({})
+                    output.append([])
+                state = nxt
+            output[state].append(keyword)
+
+        # Breadth-first: each state's transitions are its goto edges plus
+        # those of its failure state, which is always completed first
+        delta: List[Dict[str, int]] = [dict() for _ in goto]
+        fail = [0] * len(goto)
+        delta[0] = dict(goto[0])
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            output[state].extend(output[fail[state]])
+            delta[state] = dict(delta[fail[state]])
+            for char, nxt in goto[state].items():
+                fail[nxt] = delta[fail[state]].get(char, 0)
+                delta[state][char] = nxt
+                queue.append(nxt)
+        self._delta = delta
+        self._output = [tuple(keywords) for keywords in output]
+
+    def _bounded(self, text: str, start: int, end: int) -> bool:
+        return (start == 0 or not _is_word_char(text[start - 1])) and \
+            (end == len(text) or not _is_word_char(text[end]))
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, str]]:
+        """Yield (start index, keyword) for every occurrence, ordered by where it ends."""
+        delta, output = self._delta, self._output
+        state = 0
+        for index, char in enumerate(text):
+            state = delta[state].get(char, 0)
+            if output[state]:
+                for keyword in output[state]:
+                    start = index + 1 - len(keyword)
+                    if not self.word_boundaries or self._bounded(text, start, index + 1):
+                        yield start, keyword
+
+    def find_all(self, text: str) -> Set[str]:
+        """Return the distinct keywords that occur in the text."""
+        return {keyword for _, keyword in self.iter_matches(text)}
+
+    def search(self, text: str) -> bool:
+        """Return True if any keyword occurs in the text, stopping at the first hit."""
+        return next(self.iter_matches(text), None) is not None
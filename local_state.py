@@ -0,0 +1,109 @@
+"""Small JSON state files kept under the local cache directory."""
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator
+import config
+
+try:
+    import fcntl
+except ImportError:  # Not on POSIX: updates are only serialized within a process
+    fcntl = None
+
+
+def state_path(filename: str) -> str:
+    """Return the path of a state file inside Config.CACHE_DIR."""
+    return os.path.join(config.Config.CACHE_DIR, filename)
+
+
+def lock_path(path: str) -> str:
+    """Return the sidecar lock file used to serialize writers of a state file."""
+    directory, name = os.path.split(path)
+    return os.path.join(directory, f".{name}.lock")
+
+
+@contextmanager
+def _exclusive(path: str) -> Iterator[None]:
+    """Hold an exclusive lock on path's sidecar lock file, across processes."""
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(lock_path(path), "a") as handle:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+class JsonStateFile:
+    """A JSON object persisted to disk with atomic replace-on-write.
+
+    Reads are cached in memory and re-read only when the file changes on disk,
+    so a long-running scheduler sees writes made by Slack-triggered runs.
+    Writes hold a lock on a sidecar file, so read-modify-write updates from
+    other instances and processes are never lost.
+    """
+
+    def __init__(self, path: str):
+        """Bind to a state file; it is created on first save."""
+        self.path = path
+        self._lock = threading.Lock()
+        self._data: Dict[str, Any] = {}
+        self._mtime = None
+
+    def _mtime_on_disk(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def load(self) -> Dict[str, Any]:
+        """Return the current state (an empty dict if the file is missing or unreadable)."""
+        with self._lock:
+            return self._load_locked()
+
+    def _load_locked(self) -> Dict[str, Any]:
+        mtime = self._mtime_on_disk()
+        if mtime != self._mtime:
+            try:
+                with open(self.path) as f:
+                    data = json.load(f)
+                self._data = data if isinstance(data, dict) else {}
+            except (OSError, ValueError):
+                self._data = {}
+            self._mtime = mtime
+        return self._data
+
+    def save(self, data: Dict[str, Any]) -> None:
+        """Atomically replace the state on disk."""
+        with self._lock, _exclusive(self.path):
+            self._save_locked(data)
+
+    def _save_locked(self, data: Dict[str, Any]) -> None:
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._data = data
+        self._mtime = self._mtime_on_disk()
+
+    def update(self, mutate: Callable[[Dict[str, Any]], None]) -> Dict[str, Any]:
+        """Load the latest state, apply mutate() to it in place, and save it."""
+        with self._lock, _exclusive(self.path):
+            # Another process may have written within the cached mtime's resolution
+            self._mtime = None
+            data = dict(self._load_locked())
+            mutate(data)
+            self._save_locked(data)
+            return data
@@ -15,9 +15,9 @@ def main():
     parser = argparse.ArgumentParser(description="Weekly Update Automation Agent")
     parser.add_argument(
         "--job",
-        choices=["monday", "daily", "friday", "run"],
+        choices=["monday", "daily", "friday", "preview", "run"],
         default="run",
-        help="Type of job to run (monday, daily, friday) or run scheduler (run)"
+        help="Type of job to run (monday, daily, friday), print the mirrored page (preview) or run scheduler (run)"
     )
     
     args = parser.parse_args()
@@ -33,6 +33,13 @@ def main():
     elif args.job == "friday":
         logger.info("Running Friday job manually")
         scheduler.friday_job()
+    elif args.job == "preview":
+        page = scheduler.file_manager.get_current_weekly_page()
+        content = scheduler.file_manager.get_mirrored_content(page["id"]) if page else None
+        if content is None:
+            logger.info("No local copy of this week's page yet")
+        else:
+            print(content)
     else:
         logger.info("Starting scheduler")
         scheduler.run()
@@ -1,7 +1,9 @@
 """MCP integration helpers for accessing MCP servers."""
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Iterator, Optional
 from datetime import datetime
+from urllib.parse import parse_qs, urlparse
 import config
+from response_cache import get_response_cache, MISS
 
 # MCP tools are available as global functions in Cursor environment
 # We'll use them directly by calling the functions that are available
@@ -10,13 +12,58 @@ class MCPIntegration:
     """Helper class for MCP server integration."""
     
     @staticmethod
-    def get_jira_issues(cloud_id: str, jql: str, max_results: int = 50) -> List[Dict[str, Any]]:
-        """Get Jira issues using MCP."""
-        # MCP tools are available as functions we can call directly
-        # In Cursor, these are injected into the execution context
-        # We'll use a wrapper that can be replaced with actual MCP calls
-        # For now, this will be called from test script which has MCP access
-        return []
+    def _cached_call(tool: str, params: Dict[str, Any], call: Callable[[], Any]) -> Any:
+        """Serve a read-only tool call from the persistent response cache when fresh."""
+        cache = get_response_cache()
+        ttl = config.Config.RESPONSE_CACHE_TTLS.get(tool, 0)
+        if cache is None or ttl <= 0:
+            return call()
+        
+        cached = cache.get(tool, params)
+        if cached is not MISS:
+            return cached
+        result = call()
+        cache.put(tool, params, result, ttl)
+        return result
+    
+    @staticmethod
+    def _invalidate_cached(tool: str) -> None:
+        """Drop cached responses made stale by a write."""
+        cache = get_response_cache()
+        if cache is not None:
+            cache.invalidate(tool)
+    
+    @staticmethod
+    def get_jira_issues(cloud_id: str, jql: str, page_size: int = 100,
+                        fields: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Yield Jira issues matching a JQL query, following page tokens until the last page.
+        
+        When fields is given, only those issue fields are requested.
+        """
+        try:
+            from mcp_atlassian import searchJiraIssuesUsingJql
+        except (ImportError, NameError):
+            return
+        
+        next_page_token = None
+        while True:
+            params = {
+                "cloudId": cloud_id,
+                "jql": jql,
+                "maxResults": page_size
+            }
+            if fields:
+                params["fields"] = list(fields)
+            if next_page_token:
+                params["nextPageToken"] = next_page_token
+            result = MCPIntegration._cached_call(
+                "jira.search", params, lambda: searchJiraIssuesUsingJql(**params)
+            )
+            yield from result.get("issues", [])
+            
+            next_page_token = result.get("nextPageToken")
+            if not next_page_token or result.get("isLast"):
+                return
     
     @staticmethod
     def get_confluence_page(cloud_id: str, page_id: str, format: str = "markdown") -> Dict[str, Any]:
@@ -42,14 +89,23 @@ class MCPIntegration:
             }
             if parent_id:
                 params["parentId"] = parent_id
-            return createConfluencePage(**params)
+            result = createConfluencePage(**params)
+            # A new page changes the descendant listings and title searches of its ancestors
+            MCPIntegration._invalidate_cached("confluence.descendants")
+            MCPIntegration._invalidate_cached("confluence.cql")
+            return result
         except (ImportError, NameError):
             return {"id": None, "title": title}
     
     @staticmethod
     def update_confluence_page(cloud_id: str, page_id: str, body: str, 
-                               title: Optional[str] = None, format: str = "markdown") -> Dict[str, Any]:
-        """Update a Confluence page using MCP."""
+                               title: Optional[str] = None, format: str = "markdown",
+                               version: Optional[int] = None) -> Dict[str, Any]:
+        """Update a Confluence page using MCP.
+        
+        version is only sent when given; pass it only to a tool that enforces
+        it (see Config.CONFLUENCE_SEND_PAGE_VERSION).
+        """
         try:
             from mcp_atlassian import updateConfluencePage
             params = {
@@ -60,19 +116,59 @@ class MCPIntegration:
             }
             if title:
                 params["title"] = title
-            return updateConfluencePage(**params)
+            if version is not None:
+                params["version"] = {"number": version}
+            result = updateConfluencePage(**params)
+            if title:
+                MCPIntegration._invalidate_cached("confluence.descendants")
+                MCPIntegration._invalidate_cached("confluence.cql")
+            return result
         except (ImportError, NameError):
             return {"id": page_id}
     
     @staticmethod
-    def get_confluence_page_descendants(cloud_id: str, page_id: str, limit: int = 50) -> List[Dict[str, Any]]:
-        """Get child pages of a Confluence page using MCP."""
+    def iter_confluence_page_descendants(cloud_id: str, page_id: str, page_size: int = 100) -> Iterator[Dict[str, Any]]:
+        """Yield descendants of a Confluence page, following result cursors page by page."""
         try:
             from mcp_atlassian import getConfluencePageDescendants
-            result = getConfluencePageDescendants(cloudId=cloud_id, pageId=page_id, limit=limit)
-            return result.get("results", [])
         except (ImportError, NameError):
-            return []
+            return
+        
+        cursor = None
+        while True:
+            params = {"cloudId": cloud_id, "pageId": page_id, "limit": page_size}
+            if cursor:
+                params["cursor"] = cursor
+            result = MCPIntegration._cached_call(
+                "confluence.descendants", params, lambda: getConfluencePageDescendants(**params)
+            )
+            yield from result.get("results", [])
+            
+            cursor = MCPIntegration._next_cursor(result)
+            if not cursor:
+                return
+    
+    @staticmethod
+    def _next_cursor(result: Dict[str, Any]) -> Optional[str]:
+        """Extract the cursor for the next page from a Confluence v2 list response."""
+        next_link = (result.get("_links") or {}).get("next")
+        if not next_link:
+            return None
+        values = parse_qs(urlparse(next_link).query).get("cursor")
+        return values[0] if values else None
+    
+    @staticmethod
+    def search_confluence_using_cql(cloud_id: str, cql: str, limit: int = 1) -> Optional[List[Dict[str, Any]]]:
+        """Search Confluence content with CQL using MCP. Returns None when the tool is unavailable."""
+        try:
+            from mcp_atlassian import searchConfluenceUsingCql
+            params = {"cloudId": cloud_id, "cql": cql, "limit": limit}
+            result = MCPIntegration._cached_call(
+                "confluence.cql", params, lambda: searchConfluenceUsingCql(**params)
+            )
+            return result.get("results", [])
+        except (ImportError, NameError, AttributeError):
+            return None
     
     @staticmethod
     def glean_search(query: str, updated: Optional[str] = None, 
@@ -87,7 +183,7 @@ class MCPIntegration:
                 params["after"] = after
             if before:
                 params["before"] = before
-            result = search(**params)
+            result = MCPIntegration._cached_call("glean.search", params, lambda: search(**params))
             return result.get("results", [])
         except (ImportError, NameError):
             return []
@@ -97,7 +193,10 @@ class MCPIntegration:
         """Lookup meetings in Glean using MCP."""
         try:
             from mcp_Glean import meeting_lookup
-            result = meeting_lookup(query=query, extract_transcript=str(extract_transcript).lower())
+            params = {"query": query, "extract_transcript": str(extract_transcript).lower()}
+            result = MCPIntegration._cached_call(
+                "glean.meeting_lookup", params, lambda: meeting_lookup(**params)
+            )
             return result if isinstance(result, list) else []
         except (ImportError, NameError):
             return []
@@ -107,7 +206,7 @@ class MCPIntegration:
         """List Pendo applications using MCP."""
         try:
             from mcp_Pendo import list_all_applications
-            return list_all_applications()
+            return MCPIntegration._cached_call("pendo.list_applications", {}, list_all_applications)
         except (ImportError, NameError):
             return []
     
@@ -118,12 +217,15 @@ class MCPIntegration:
         # Note: This tool may not be available - check available Pendo MCP tools
         try:
             from mcp_Pendo import activityQuery
-            return activityQuery(
-                applicationId=application_id,
-                startDate=start_date,
-                endDate=end_date,
-                groupBy=group_by,
-                limit=limit
+            params = {
+                "applicationId": application_id,
+                "startDate": start_date,
+                "endDate": end_date,
+                "groupBy": group_by,
+                "limit": limit
+            }
+            return MCPIntegration._cached_call(
+                "pendo.activity_query", params, lambda: activityQuery(**params)
             )
         except (ImportError, NameError, AttributeError):
             return []
@@ -138,7 +240,10 @@ class MCPIntegration:
                 params["start_date"] = start_date
             if end_date:
                 params["end_date"] = end_date
-            return list_meetings(**params) if params else list_meetings()
+            return MCPIntegration._cached_call(
+                "granola.list_meetings", params,
+                lambda: list_meetings(**params) if params else list_meetings()
+            )
         except (ImportError, NameError, AttributeError):
             return []
     
@@ -152,7 +257,7 @@ class MCPIntegration:
                 params["start_date"] = start_date
             if end_date:
                 params["end_date"] = end_date
-            return get_meetings(**params)
+            return MCPIntegration._cached_call("granola.get_meetings", params, lambda: get_meetings(**params))
         except (ImportError, NameError, AttributeError):
             return []
     
@@ -161,7 +266,10 @@ class MCPIntegration:
         """Get raw transcript for a specific Granola meeting using MCP."""
         try:
             from mcp_Granola import get_meeting_transcript
-            result = get_meeting_transcript(meeting_id=meeting_id)
+            result = MCPIntegration._cached_call(
+                "granola.transcript", {"meeting_id": meeting_id},
+                lambda: get_meeting_transcript(meeting_id=meeting_id)
+            )
             return result.get("transcript", "") if isinstance(result, dict) else str(result)
         except (ImportError, NameError, AttributeError):
             return ""
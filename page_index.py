@@ -0,0 +1,85 @@
+"""Title -> page id index of the weekly updates page tree in Confluence."""
+import time
+from typing import Any, Callable, Dict, Optional
+import config
+from local_state import JsonStateFile, state_path
+
+
+class PageIndex:
+    """Persisted title -> page id map for pages under the weekly updates parent.
+
+    Lookups are answered from the index. A miss (or an entry older than
+    Config.PAGE_INDEX_MAX_AGE_SECONDS) resolves just that title through the
+    supplied finder and records the answer. A title that was not found is
+    remembered for PAGE_INDEX_MISS_SECONDS, so repeated checks for a page that
+    does not exist yet stay cheap. Pages the agent creates are recorded
+    immediately, and a page found missing on write is forgotten, so its title
+    is looked up again.
+    """
+
+    def __init__(self, find_page: Callable[[str], Optional[Dict[str, Any]]],
+                 state: Optional[JsonStateFile] = None):
+        """Initialize the index; find_page looks one title up in Confluence."""
+        self.find_page = find_page
+        self.state = state or JsonStateFile(state_path("page_index.json"))
+        self.remote_lookups = 0
+
+    def _entry(self, title: str) -> Optional[Dict[str, Any]]:
+        entry = self.state.load().get("pages", {}).get(title)
+        if entry is None:
+            return None
+        if time.time() - entry.get("seen_at", 0) > config.Config.PAGE_INDEX_MAX_AGE_SECONDS:
+            return None
+        return entry
+
+    def _recent_miss(self, title: str) -> bool:
+        missed_at = self.state.load().get("misses", {}).get(title)
+        return missed_at is not None and time.time() - missed_at < config.Config.PAGE_INDEX_MISS_SECONDS
+
+    def lookup(self, title: str) -> Optional[str]:
+        """Return the page id for a title, asking Confluence only when the index cannot answer."""
+        entry = self._entry(title)
+        if entry is not None:
+            return entry.get("id")
+        if self._recent_miss(title):
+            return None
+
+        self.remote_lookups += 1
+        page = self.find_page(title)
+        if page and page.get("id"):
+            self.record(title, page.get("id"))
+            return page.get("id")
+
+        def add_miss(data: Dict[str, Any]) -> None:
+            misses = dict(data.get("misses", {}))
+            misses[title] = time.time()
+            data["misses"] = misses
+
+        self.state.update(add_miss)
+        return None
+
+    def record(self, title: str, page_id: Optional[str]) -> None:
+        """Add or update one page, e.g. right after creating it."""
+        if not title or not page_id:
+            return
+
+        def add(data: Dict[str, Any]) -> None:
+            pages = dict(data.get("pages", {}))
+            pages[title] = {"id": page_id, "seen_at": time.time()}
+            data["pages"] = pages
+            misses = dict(data.get("misses", {}))
+            misses.pop(title, None)
+            data["misses"] = misses
+
+        self.state.update(add)
+
+    def forget(self, page_id: Optional[str]) -> None:
+        """Drop every title that points at a page id, e.g. after a write found the page deleted."""
+        if not page_id:
+            return
+
+        def drop(data: Dict[str, Any]) -> None:
+            pages = data.get("pages", {})
+            data["pages"] = {title: entry for title, entry in pages.items() if entry.get("id") != page_id}
+
+        self.state.update(drop)
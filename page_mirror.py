@@ -0,0 +1,53 @@
+"""Write-through local mirror of weekly page bodies and their Confluence versions."""
+import time
+from typing import Any, Dict, Optional
+import config
+from local_state import JsonStateFile, state_path
+
+
+class PageMirror:
+    """Last known body and version number of each page this agent reads or writes.
+
+    Every read and successful write goes through the mirror, so the next run
+    can merge into the mirrored body without downloading the page. Writes
+    carry the next version number, and are rejected if someone edited the
+    page in between; only then is the page read again. Pages whose version
+    is unknown are not mirrored. The Config.PAGE_MIRROR_MAX_PAGES most
+    recently used pages are kept.
+    """
+
+    def __init__(self, state: Optional[JsonStateFile] = None):
+        """Bind to the mirror state file."""
+        self.state = state or JsonStateFile(state_path("page_mirror.json"))
+
+    def get(self, page_id: str) -> Optional[Dict[str, Any]]:
+        """Return {"body", "version", "seen_at"} for a page, or None if it is not mirrored."""
+        page = self.state.load().get("pages", {}).get(page_id)
+        # A body without a version cannot be written conditionally; treat it as unknown
+        return page if page and page.get("version") is not None else None
+
+    def record(self, page_id: Optional[str], body: str, version: Optional[int]) -> None:
+        """Store the body a page has now; with version None, forget the page instead.
+
+        Without a version, a later write could not detect edits made in
+        Confluence since, so the page is read again next time.
+        """
+        if not page_id:
+            return
+
+        def put(data: Dict[str, Any]) -> None:
+            pages = dict(data.get("pages", {}))
+            if version is None:
+                pages.pop(page_id, None)
+            else:
+                pages[page_id] = {"body": body, "version": version, "seen_at": time.time()}
+            if len(pages) > config.Config.PAGE_MIRROR_MAX_PAGES:
+                recent = sorted(pages, key=lambda key: pages[key]["seen_at"], reverse=True)
+                pages = {key: pages[key] for key in recent[:config.Config.PAGE_MIRROR_MAX_PAGES]}
+            data["pages"] = pages
+
+        self.state.update(put)
+
+    def forget(self, page_id: Optional[str]) -> None:
+        """Drop a page, e.g. because it no longer exists."""
+        self.record(page_id, "", None)
@@ -0,0 +1,92 @@
+"""Run-scoped request cache that coalesces identical MCP calls."""
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class _PendingRequest:
+    """A request in flight that concurrent callers with the same key wait on."""
+
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class RequestCache:
+    """Caches request results by key for the duration of one job run.
+
+    A caller asking for a key that is already being fetched waits for that
+    fetch instead of issuing its own, so concurrent identical requests cost a
+    single MCP call. Failed fetches are not cached.
+    """
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self._lock = threading.Lock()
+        self._results: Dict[Hashable, Any] = {}
+        self._pending: Dict[Hashable, _PendingRequest] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_fetch(self, key: Hashable, fetch: Callable[[], Any]) -> Any:
+        """Return the cached result for key, calling fetch() only on a miss."""
+        with self._lock:
+            if key in self._results:
+                self.hits += 1
+                return self._results[key]
+            pending = self._pending.get(key)
+            is_owner = pending is None
+            if is_owner:
+                pending = _PendingRequest()
+                self._pending[key] = pending
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if not is_owner:
+            pending.event.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.value
+
+        try:
+            value = fetch()
+        except BaseException as e:
+            pending.error = e
+            with self._lock:
+                del self._pending[key]
+            pending.event.set()
+            raise
+
+        pending.value = value
+        with self._lock:
+            self._results[key] = value
+            del self._pending[key]
+        pending.event.set()
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one cached result, or every result when no key is given."""
+        with self._lock:
+            if key is None:
+                self._results.clear()
+            else:
+                self._results.pop(key, None)
+
+    def reset(self) -> None:
+        """Clear all results and counters at the start of a new run."""
+        with self._lock:
+            self._results.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the number of cached entries."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._results),
+            }
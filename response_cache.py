@@ -0,0 +1,125 @@
+"""Persistent on-disk cache for MCP tool responses."""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+import config
+
+# Returned by ResponseCache.get on a miss (None is a valid cached response)
+MISS = object()
+
+
+def normalize_params(params: Dict[str, Any]) -> str:
+    """Serialize tool arguments into a stable cache key component."""
+    return json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+
+
+class ResponseCache:
+    """SQLite-backed response cache with per-entry TTL and an LRU size cap.
+
+    The database runs in WAL mode so the scheduler process and Slack app
+    workers can share one file. Each thread gets its own connection.
+    """
+
+    def __init__(self, path: str, max_entries: int = 2000):
+        """Open (creating if needed) the cache database at path."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                tool TEXT NOT NULL,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS responses_tool ON responses (tool);
+            CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+            """
+        )
+        conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _key(tool: str, params: Dict[str, Any]) -> str:
+        return f"{tool}:{normalize_params(params)}"
+
+    def get(self, tool: str, params: Dict[str, Any]) -> Any:
+        """Return the cached response for a tool call, or MISS if absent or expired."""
+        conn = self._connection()
+        key = self._key(tool, params)
+        now = time.time()
+        row = conn.execute(
+            "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return MISS
+        value, expires_at = row
+        if expires_at <= now:
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            conn.commit()
+            return MISS
+        conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+        conn.commit()
+        return json.loads(value)
+
+    def put(self, tool: str, params: Dict[str, Any], value: Any, ttl: float) -> None:
+        """Store a tool response for ttl seconds, evicting least recently used entries past the cap."""
+        conn = self._connection()
+        now = time.time()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, tool, value, expires_at, last_access) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (self._key(tool, params), tool, json.dumps(value, default=str), now + ttl, now),
+        )
+        conn.execute(
+            "DELETE FROM responses WHERE key IN ("
+            "SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+        conn.commit()
+
+    def invalidate(self, tool: str) -> None:
+        """Drop every cached response for a tool."""
+        conn = self._connection()
+        conn.execute("DELETE FROM responses WHERE tool = ?", (tool,))
+        conn.commit()
+
+    def clear(self) -> None:
+        """Drop every cached response."""
+        conn = self._connection()
+        conn.execute("DELETE FROM responses")
+        conn.commit()
+
+
+_caches: Dict[str, ResponseCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Return the process-wide cache for the configured path, or None when disabled."""
+    path = config.Config.RESPONSE_CACHE_PATH
+    if not path:
+        return None
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = ResponseCache(path, max_entries=config.Config.RESPONSE_CACHE_MAX_ENTRIES)
+            _caches[path] = cache
+        return cache
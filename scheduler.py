@@ -1,9 +1,14 @@
 """Scheduler for weekly update automation."""
 import schedule
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from file_manager import FileManager
+from typing import Dict
+from file_manager import FileManager, content_fingerprint
 from content_generator import ContentGenerator
+from compiled_state import CompiledWeekStore
+from section_compiler import SectionCompiler
+from weekly_doc import Section, WeeklyDoc
 import config
 import logging
 
@@ -20,121 +25,230 @@ class WeeklyUpdateScheduler:
         """Initialize the scheduler."""
         self.file_manager = FileManager()
         self.content_generator = ContentGenerator()
+        self.compiled_states = CompiledWeekStore()
+    
+    def _log_cache_stats(self, job_name: str):
+        """Log request cache hit/miss counters for the run that just finished."""
+        for source, stats in self.content_generator.cache_stats().items():
+            logger.info(
+                f"{job_name} {source} request cache: {stats['hits']} hits, {stats['misses']} misses"
+            )
     
     def monday_job(self):
         """Job to run on Mondays - creates new weekly file."""
         logger.info("Running Monday job - creating new weekly file")
+        self.content_generator.begin_run()
         
         try:
             # Check if we should create a new page
             if self.file_manager.should_create_new_page():
-                # Create new weekly page
-                page = self.file_manager.create_weekly_page(
-                    self.file_manager.get_current_week_friday()
-                )
-                
-                logger.info(f"Created new weekly page: {page.get('id')}")
+                week_friday = self.file_manager.get_current_week_friday()
                 
-                # Generate initial content from previous week's data
-                content = self.content_generator.generate_full_content()
+                # Resolve the quarter folder while the content is generated, then
+                # create the page with its final body in a single write
+                with ThreadPoolExecutor(max_workers=1) as pool:
+                    folder = pool.submit(self.file_manager.find_or_create_quarter_folder, week_friday)
+                    doc = WeeklyDoc()
+                    try:
+                        # Initial content from previous week's data, leaving out
+                        # anything an earlier run already wrote for this week
+                        sections = self.content_generator.generate_sections()
+                        self.content_generator.merge_new_content(doc, sections, week_friday)
+                    except Exception as e:
+                        logger.error(f"Could not generate initial content; creating empty page: {e}", exc_info=True)
+                        doc = WeeklyDoc()
+                    folder_id = folder.result()
                 
-                # Update the page with initial content
-                self.file_manager.update_page_content(
-                    page.get("id"),
-                    content,
-                    append=False
-                )
+                page = self.file_manager.create_weekly_page(week_friday, content=doc, folder_id=folder_id)
+                self.content_generator.record_written(doc, week_friday)
                 
-                logger.info("Initial content generated and added to new page")
+                logger.info(f"Created new weekly page {page.get('id')} with initial content")
             else:
                 logger.info("Weekly page already exists or not Monday - skipping creation")
         
         except Exception as e:
             logger.error(f"Error in Monday job: {e}", exc_info=True)
+        finally:
+            self._log_cache_stats("Monday job")
+    
+    def _read_page(self, page_id: str):
+        """Return (parsed page, body fingerprint) for a page, from the local mirror when possible."""
+        # Get existing content, parsed once for the whole job
+        existing_content = self.file_manager.get_page_content(page_id)
+        return WeeklyDoc.parse(existing_content), content_fingerprint(existing_content)
+    
+    def _load_current_page(self):
+        """Return (page id, parsed page, body fingerprint) for the current week's page, creating it if needed."""
+        page = self.file_manager.get_or_create_current_weekly_page()
+        page_id = page.get("id")
+        if not page_id:
+            return None, None, None
+        return (page_id,) + self._read_page(page_id)
+    
+    def _load_compiled_state(self, doc: WeeklyDoc, page_fingerprint: str) -> SectionCompiler:
+        """Return the week's compiled state, rebuilding it from the page when it is missing or stale."""
+        week = self.file_manager.get_current_week_friday()
+        compiler = self.compiled_states.load(week, page_fingerprint)
+        if compiler is None:
+            # First run this week, or the page was edited outside the agent
+            logger.info("Rebuilding compiled state from the current page")
+            compiler = SectionCompiler().feed_doc(doc)
+        return compiler
+    
+    def _save_compiled_state(self, compiler: SectionCompiler, page_fingerprint: str) -> None:
+        """Persist the compiled state for the body now on the page, given that body's fingerprint."""
+        week = self.file_manager.get_current_week_friday()
+        self.compiled_states.save(week, compiler, page_fingerprint)
+    
+    def _merge_daily_delta(self, doc: WeeklyDoc, compiler: SectionCompiler, sections: Dict[str, Section]) -> int:
+        """Merge today's generated sections into the page and the compiled state in place; returns lines added."""
+        # Merge new bullets into their existing sections instead of appending
+        # a second copy of every header; lines already written this week are skipped
+        changes = []
+        added = self.content_generator.merge_new_content(doc, sections, changes=changes)
+        # Only the lines this run added (or removed) touch the compiled state
+        compiler.apply(changes)
+        return added
     
     def daily_job(self):
         """Job to run daily at 8pm - updates current weekly file."""
         logger.info("Running daily job - updating current weekly file")
+        self.content_generator.begin_run()
         
         try:
-            # Get or create current weekly page
-            page = self.file_manager.get_or_create_current_weekly_page()
-            page_id = page.get("id")
+            page_id, doc, page_fingerprint = self._load_current_page()
             
             if not page_id:
                 logger.error("Could not get page ID")
                 return
             
-            # Get existing content
-            existing_content = self.file_manager.confluence.get_page_content(page_id)
-            
-            # Generate new content sections
-            highlights = self.content_generator.generate_highlights(existing_content)
-            this_week = self.content_generator.generate_this_week(existing_content)
-            next_week = self.content_generator.generate_next_week(existing_content)
-            customer_corner = self.content_generator.generate_customer_corner(existing_content)
+            # Fetch all sources concurrently, then generate new content sections,
+            # parsed once even if a conflict means merging them again
+            sections = self.content_generator.parse_sections(self.content_generator.generate_sections())
             
-            # Build update content
-            updates = []
-            if highlights:
-                updates.append("## Highlights\n\n" + highlights)
-            if this_week:
-                updates.append("## This Week\n\n" + this_week)
-            if next_week:
-                updates.append("## Next Week\n\n" + next_week)
-            if customer_corner:
-                updates.append("## Customer Corner\n\n" + customer_corner)
-            
-            if updates:
-                update_content = "\n\n".join(updates)
+            # The page is merged from the local mirror; if it was edited in
+            # Confluence since, the write is refused and the merge redone once.
+            # A page deleted since it was indexed is looked up (or created) again.
+            for _ in range(2):
+                compiler = self._load_compiled_state(doc, page_fingerprint)
+                if not self._merge_daily_delta(doc, compiler, sections):
+                    logger.info("No new content to add")
+                    # The page is as it was read
+                    written_fingerprint = page_fingerprint
+                    break
                 
-                # Append to page
-                self.file_manager.update_page_content(
+                result = self.file_manager.update_page_content(
                     page_id,
-                    update_content,
-                    append=True
+                    doc,
+                    append=False
                 )
                 
-                logger.info(f"Updated weekly page {page_id} with new content")
+                if result.get("not_found"):
+                    logger.warning(f"Weekly page {page_id} no longer exists; looking it up again")
+                    page_id, doc, page_fingerprint = self._load_current_page()
+                    if not page_id:
+                        logger.error("Could not get page ID")
+                        return
+                    continue
+                written_fingerprint = result.get("fingerprint")
+                if result.get("unchanged"):
+                    logger.info(f"Weekly page {page_id} unchanged; skipped write")
+                    break
+                if not result.get("conflict"):
+                    logger.info(f"Updated weekly page {page_id} with new content")
+                    break
+                logger.warning(f"Weekly page {page_id} was edited in Confluence; merging again")
+                doc, page_fingerprint = self._read_page(page_id)
             else:
-                logger.info("No new content to add")
+                logger.error(f"Weekly page {page_id} kept changing; skipped update")
+                return
+            self.content_generator.record_written(doc)
+            self._save_compiled_state(compiler, written_fingerprint)
         
         except Exception as e:
             logger.error(f"Error in daily job: {e}", exc_info=True)
+        finally:
+            self._log_cache_stats("Daily job")
 
     def friday_job(self):
-        """Job to run Fridays at 8:30pm - compiles week's content into one doc without dupes."""
-        logger.info("Running Friday job - compiling weekly content")
+        """Job to run Fridays at 8pm - adds the day's content and compiles the week into one doc without dupes.
+        
+        The daily delta is merged into the page and into the week's compiled
+        state, which already holds every earlier day's lines, so only today's
+        lines are compiled; the result is written once, so readers never see
+        the uncompiled page.
+        """
+        logger.info("Running Friday job - updating and compiling weekly content")
+        self.content_generator.begin_run()
         try:
-            page = self.file_manager.get_or_create_current_weekly_page()
-            page_id = page.get("id")
+            page_id, doc, page_fingerprint = self._load_current_page()
             if not page_id:
                 logger.error("Could not get page ID")
                 return
-            existing_content = self.file_manager.confluence.get_page_content(page_id)
-            compiled = ContentGenerator.compile_and_dedupe_sections(existing_content)
-            if not compiled.strip():
-                logger.warning("Compiled content empty; skipping update")
+            
+            sections = {}
+            try:
+                sections = self.content_generator.parse_sections(self.content_generator.generate_sections())
+            except Exception as e:
+                # Still compile what is already on the page
+                logger.error(f"Could not generate today's content: {e}", exc_info=True)
+            
+            for _ in range(2):
+                compiler = self._load_compiled_state(doc, page_fingerprint)
+                added = self._merge_daily_delta(doc, compiler, sections)
+                logger.info(f"Merged {added} new lines before compiling")
+                
+                compiled = compiler.to_doc()
+                if not any(section.has_content() for section in compiled.sections):
+                    logger.warning("Compiled content empty; skipping update")
+                    return
+                result = self.file_manager.update_page_content(page_id, compiled, append=False)
+                if result.get("not_found"):
+                    logger.warning(f"Weekly page {page_id} no longer exists; looking it up again")
+                    page_id, doc, page_fingerprint = self._load_current_page()
+                    if not page_id:
+                        logger.error("Could not get page ID")
+                        return
+                    continue
+                if not result.get("conflict"):
+                    break
+                logger.warning(f"Weekly page {page_id} was edited in Confluence; compiling again")
+                doc, page_fingerprint = self._read_page(page_id)
+            else:
+                logger.error(f"Weekly page {page_id} kept changing; skipped compile")
                 return
-            self.file_manager.update_page_content(page_id, compiled, append=False)
-            logger.info(f"Friday compile complete: updated page {page_id} with deduplicated content")
+            self.content_generator.record_written(doc)
+            self._save_compiled_state(compiler, result["fingerprint"])
+            if result.get("unchanged"):
+                logger.info(f"Friday compile complete: page {page_id} already compiled; skipped write")
+            else:
+                logger.info(f"Friday compile complete: updated page {page_id} with deduplicated content")
+            
+            try:
+                # The compiled page is this week's final version
+                self.content_generator.learn_style(compiled)
+            except Exception as e:
+                logger.error(f"Could not update style profile: {e}", exc_info=True)
         except Exception as e:
             logger.error(f"Error in Friday job: {e}", exc_info=True)
+        finally:
+            self._log_cache_stats("Friday job")
 
     def setup_schedule(self):
         """Set up the scheduling."""
         # Monday job at midnight
         schedule.every().monday.at("00:00").do(self.monday_job)
         
-        # Daily job at 8pm
-        schedule.every().day.at("20:00").do(self.daily_job)
-        # Friday job at 8:30pm (after daily) - compile week into one doc, no dupes
-        schedule.every().friday.at("20:30").do(self.friday_job)
+        # Daily job at 8pm, except Fridays
+        for day in ("monday", "tuesday", "wednesday", "thursday", "saturday", "sunday"):
+            getattr(schedule.every(), day).at("20:00").do(self.daily_job)
+        # Friday job at 8pm - the daily update and the week's compile in one write
+        schedule.every().friday.at("20:00").do(self.friday_job)
 
         logger.info("Schedule set up:")
         logger.info("  - Monday job: 00:00 (create new weekly file)")
-        logger.info("  - Daily job: 20:00 (update current weekly file)")
-        logger.info("  - Friday job: 20:30 (compile week into cohesive doc, no dupes)")
+        logger.info("  - Daily job: 20:00 except Fridays (update current weekly file)")
+        logger.info("  - Friday job: 20:00 (update and compile week into cohesive doc, no dupes)")
     
     def run(self):
         """Run the scheduler."""
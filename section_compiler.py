@@ -0,0 +1,367 @@
+"""Single-pass compiler that folds repeated weekly update sections into one document."""
+import re
+from functools import lru_cache
+from hashlib import blake2b
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from weekly_doc import SECTION_ORDER, Bullet, Section, WeeklyDoc
+
+# Lower-cased header -> canonical section name
+_SECTION_BY_HEADER = {name.lower(): name for name in SECTION_ORDER}
+
+# An issue line as written by JiraAggregator.format_issue_summary: "PROJ-123: summary (status)"
+_ISSUE_KEY = re.compile(r"\b([A-Z][A-Z0-9_]+-[1-9][0-9]*):")
+# An issue line as written by ContentGenerator.generate_this_week: "**summary** (PROJ-123) - status"
+_ISSUE_KEY_STATUS = re.compile(r"\(([A-Z][A-Z0-9_]+-[1-9][0-9]*)\) - ")
+_TOKEN = re.compile(r"\w+")
+
+# SimHash near-duplicate detection: lines whose 64-bit fingerprints differ in at most
+# SIMHASH_MAX_DISTANCE bits are the same item. Splitting the fingerprint into
+# SIMHASH_MAX_DISTANCE + 1 bands guarantees such a pair shares at least one band
+# exactly, so candidates come from band lookups instead of comparing every pair.
+SIMHASH_MAX_DISTANCE = 3
+SIMHASH_BANDS = SIMHASH_MAX_DISTANCE + 1
+SIMHASH_BAND_BITS = 64 // SIMHASH_BANDS
+# Shorter lines have too few features for a stable fingerprint; they only dedupe exactly
+SIMHASH_MIN_TOKENS = 12
+_BAND_MASK = (1 << SIMHASH_BAND_BITS) - 1
+# Per-bit feature counts are summed in 8-bit lanes, so at most 127 features are used
+_SIMHASH_MAX_FEATURES = 127
+_LANE_LOW_BITS = int.from_bytes(b"\x01" * 64, "little")
+_BIT_CHARS = bytes.maketrans(b"\x00\x01", b"01")
+_BIT_BYTES = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def iter_lines(text: str, chunk_size: int = 1 << 20) -> Iterator[str]:
+    """Yield the lines of text, splitting about chunk_size characters at a time."""
+    start = 0
+    length = len(text)
+    while start < length:
+        end = text.find("\n", start + chunk_size)
+        if end < 0:
+            break
+        yield from text[start:end].split("\n")
+        start = end + 1
+    yield from text[start:].split("\n")
+
+
+def line_key(line: str) -> str:
+    """Normalize a stripped line for dedupe: lowercase with whitespace runs collapsed."""
+    return " ".join(line.lower().split())
+
+
+def line_digest(line: str) -> bytes:
+    """Return the 64-bit dedupe digest of a stripped line."""
+    return blake2b(line_key(line).encode("utf-8"), digest_size=8).digest()
+
+
+def issue_identity(line: str) -> Optional[Tuple[str, str]]:
+    """Return (prefix, issue key) for a Jira issue line, else None.
+
+    For "KEY: summary (status)" lines the prefix is the text before the key;
+    "summary (KEY) - status" lines all share the prefix "(key)", so a status
+    or summary change still folds into the earlier line.
+    """
+    match = _ISSUE_KEY.search(line)
+    if match is not None:
+        return line_key(line[:match.start()]), match.group(1)
+    match = _ISSUE_KEY_STATUS.search(line)
+    if match is not None:
+        return "(key)", match.group(1)
+    return None
+
+
+@lru_cache(maxsize=65536)
+def _spread_feature(feature: str) -> int:
+    """Hash a feature to 64 bits and spread each bit into its own 8-bit lane."""
+    digest = blake2b(feature.encode("utf-8"), digest_size=8).digest()
+    bits = format(int.from_bytes(digest, "little"), "064b")[::-1]
+    return int.from_bytes(bits.encode("ascii").translate(_BIT_BYTES), "little")
+
+
+def simhash(key: str) -> Optional[int]:
+    """Return the 64-bit SimHash of a normalized line, or None if it is too short to compare."""
+    tokens = _TOKEN.findall(key)
+    if len(tokens) < SIMHASH_MIN_TOKENS:
+        return None
+    # Word-bigram features, so the same words in a different order do not collide
+    features = [f"{first} {second}" for first, second in zip(tokens, tokens[1:_SIMHASH_MAX_FEATURES + 1])]
+    # Lane i counts the features with bit i set; adding (127 - half) to every
+    # lane sets a lane's top bit exactly when more than half of the features do
+    lanes = sum(map(_spread_feature, features))
+    lanes += (127 - len(features) // 2) * _LANE_LOW_BITS
+    majority = ((lanes >> 7) & _LANE_LOW_BITS).to_bytes(64, "little")
+    return int(majority.translate(_BIT_CHARS)[::-1], 2)
+
+
+class _Section:
+    """Accepted lines of one section plus the indexes used to dedupe new ones."""
+
+    __slots__ = ("lines", "digests", "by_digest", "by_issue", "fingerprints", "bands")
+
+    def __init__(self):
+        # A discarded line leaves None behind so stored indexes stay valid
+        self.lines: List[Optional[str]] = []
+        self.digests: List[bytes] = []
+        self.by_digest: Dict[bytes, int] = {}
+        self.by_issue: Dict[Tuple[str, str], int] = {}
+        self.fingerprints: Dict[int, int] = {}
+        self.bands: List[Dict[int, List[int]]] = [{} for _ in range(SIMHASH_BANDS)]
+
+    def _replace(self, index: int, line: str, digest: bytes) -> None:
+        """Let a newer version of an item take the older one's place."""
+        old = self.digests[index]
+        if self.by_digest.get(old) == index:
+            del self.by_digest[old]
+        self.lines[index] = line
+        self.digests[index] = digest
+        self.by_digest[digest] = index
+
+    def _near_duplicate(self, fingerprint: int) -> Optional[int]:
+        for band, buckets in enumerate(self.bands):
+            for index in buckets.get((fingerprint >> (band * SIMHASH_BAND_BITS)) & _BAND_MASK, ()):
+                other = self.fingerprints.get(index)
+                if other is not None and bin(other ^ fingerprint).count("1") <= SIMHASH_MAX_DISTANCE:
+                    return index
+        return None
+
+    def _index_fingerprint(self, index: int, fingerprint: int) -> None:
+        self.fingerprints[index] = fingerprint
+        for band, buckets in enumerate(self.bands):
+            buckets.setdefault((fingerprint >> (band * SIMHASH_BAND_BITS)) & _BAND_MASK, []).append(index)
+
+    def add(self, line: str, near_duplicates: bool) -> None:
+        """Accept a stripped line unless it repeats an item; a newer version of an item replaces it."""
+        key = line_key(line)
+        digest = blake2b(key.encode("utf-8"), digest_size=8).digest()
+        if not near_duplicates:
+            if digest not in self.by_digest:
+                self.by_digest[digest] = len(self.lines)
+                self.digests.append(digest)
+                self.lines.append(line)
+            return
+
+        identity = issue_identity(line)
+        if identity is not None:
+            # The same issue under the same prefix: the latest line wins
+            index = self.by_issue.get(identity)
+            if index is not None:
+                self._replace(index, line, digest)
+                return
+            if digest in self.by_digest:
+                return
+            self.by_issue[identity] = len(self.lines)
+        else:
+            if digest in self.by_digest:
+                return
+            fingerprint = simhash(key)
+            if fingerprint is not None:
+                index = self._near_duplicate(fingerprint)
+                if index is not None:
+                    self._replace(index, line, digest)
+                    self._index_fingerprint(index, fingerprint)
+                    return
+                self._index_fingerprint(len(self.lines), fingerprint)
+
+        self.by_digest[digest] = len(self.lines)
+        self.digests.append(digest)
+        self.lines.append(line)
+
+    def discard(self, line: str) -> None:
+        """Remove an accepted line (matched exactly after normalization), e.g. a replaced placeholder."""
+        index = self.by_digest.pop(line_digest(line), None)
+        if index is None:
+            return
+        self.lines[index] = None
+        self.fingerprints.pop(index, None)
+        identity = issue_identity(line)
+        if identity is not None and self.by_issue.get(identity) == index:
+            del self.by_issue[identity]
+
+    def live_lines(self) -> List[str]:
+        """Return the accepted lines in order."""
+        return [line for line in self.lines if line is not None]
+
+    def to_state(self) -> Dict[str, Any]:
+        """Return a JSON-serializable snapshot; derived indexes are rebuilt on load."""
+        return {
+            "lines": self.lines,
+            "digests": [digest.hex() for digest in self.digests],
+            "issues": [[prefix, key, index] for (prefix, key), index in self.by_issue.items()],
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "_Section":
+        """Rebuild a section from to_state() output."""
+        section = cls()
+        section.lines = list(state.get("lines", []))
+        section.digests = [bytes.fromhex(digest) for digest in state.get("digests", [])]
+        section.by_digest = {
+            digest: index
+            for index, digest in enumerate(section.digests)
+            if section.lines[index] is not None
+        }
+        section.by_issue = {(prefix, key): index for prefix, key, index in state.get("issues", [])}
+        # Fingerprints are recomputed, so state saved with other SimHash features still loads
+        for index, line in enumerate(section.lines):
+            if line is not None and issue_identity(line) is None:
+                fingerprint = simhash(line_key(line))
+                if fingerprint is not None:
+                    section._index_fingerprint(index, fingerprint)
+        return section
+
+
+class SectionCompiler:
+    """Streams page lines into one deduplicated body per known section.
+
+    A line starting with "## " opens a new section; the header is the first
+    non-blank text after it. Lines under unknown headers, and any text before
+    the first header, are dropped. Each section keeps its lines in first-seen
+    order and remembers only 64-bit digests of the lines it has accepted, so
+    memory grows with the unique output, not with the input.
+
+    With near_duplicates on (the default), two more rules apply within a
+    section: a Jira issue line replaces the earlier line for the same issue
+    key and prefix (so "PROJ-1: X (Done)" supersedes "PROJ-1: X (In
+    Progress)"), and a line whose SimHash (over word bigrams) is within
+    SIMHASH_MAX_DISTANCE bits of an earlier one replaces it. Replacements keep the earlier position.
+    """
+
+    def __init__(self, near_duplicates: bool = True):
+        """Start with no sections."""
+        self.near_duplicates = near_duplicates
+        self._sections: Dict[str, _Section] = {name: _Section() for name in SECTION_ORDER}
+        self._current: Optional[str] = None
+        self._awaiting_header = True
+        self._started = False
+        # Section that a bare trailing "## " line belongs to if nothing follows it
+        self._dangling: Optional[str] = None
+
+    @property
+    def sections(self) -> Dict[str, List[str]]:
+        """Accepted lines by section name."""
+        return {name: section.live_lines() for name, section in self._sections.items()}
+
+    def feed_line(self, line: str) -> None:
+        """Consume one raw page line."""
+        # The page's first line is its first header even without a "## " prefix
+        if line.startswith("## ") and self._started:
+            self._dangling = None if self._awaiting_header else self._current
+            self._current = None
+            self._awaiting_header = True
+            line = line[3:]
+        stripped = line.strip()
+        if not stripped:
+            return
+        self._started = True
+        if self._awaiting_header:
+            self._awaiting_header = False
+            self._dangling = None
+            if stripped.startswith("## "):
+                stripped = stripped[3:].strip()
+            self._current = _SECTION_BY_HEADER.get(stripped.lower())
+            return
+        if self._current is None:
+            return
+        self._sections[self._current].add(stripped, self.near_duplicates)
+
+    def feed(self, lines: Iterable[str]) -> "SectionCompiler":
+        """Consume an iterable of lines; returns self for chaining."""
+        feed_line = self.feed_line
+        near_duplicates = self.near_duplicates
+        current = self._current
+        section = self._sections.get(current)
+        for line in lines:
+            # Fast path: a body line of a known section
+            if current is not None and not line.startswith("## "):
+                stripped = line.strip()
+                if stripped:
+                    section.add(stripped, near_duplicates)
+                continue
+            feed_line(line)
+            current = self._current
+            section = self._sections.get(current)
+        return self
+
+    def feed_text(self, text: str) -> "SectionCompiler":
+        """Consume a block of page text; returns self for chaining."""
+        return self.feed(iter_lines(text))
+
+    def feed_doc(self, doc: WeeklyDoc) -> "SectionCompiler":
+        """Consume the standard sections of an already parsed page; returns self for chaining."""
+        for section in doc.sections:
+            if section.name is None:
+                continue
+            target = self._sections[section.name]
+            for bullet in section.iter_bullets():
+                target.add(bullet.text.strip(), self.near_duplicates)
+        return self
+
+    def apply(self, changes: Iterable[Tuple[str, str, bool]]) -> "SectionCompiler":
+        """Apply (section name, line, added) changes recorded while merging new content into a page."""
+        for name, line, added in changes:
+            section = self._sections.get(name)
+            if section is None or not line.strip():
+                continue
+            if added:
+                section.add(line.strip(), self.near_duplicates)
+            else:
+                section.discard(line.strip())
+        return self
+
+    def to_state(self) -> Dict[str, Any]:
+        """Return a JSON-serializable snapshot of every section."""
+        return {
+            "near_duplicates": self.near_duplicates,
+            "sections": {name: section.to_state() for name, section in self._sections.items()},
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "SectionCompiler":
+        """Rebuild a compiler from to_state() output."""
+        compiler = cls(state.get("near_duplicates", True))
+        for name, section_state in state.get("sections", {}).items():
+            if name in compiler._sections:
+                compiler._sections[name] = _Section.from_state(section_state)
+        return compiler
+
+    def to_doc(self) -> WeeklyDoc:
+        """Return the compiled sections as a page, laid out the same way render() writes them."""
+        doc = WeeklyDoc()
+        for name in SECTION_ORDER:
+            lines = self._sections[name].live_lines()
+            if not lines:
+                continue
+            if len(doc.sections) > 1:
+                doc.sections[-1].trailing = [""]
+            section = Section(name)
+            section.bullets = [Bullet(line) for line in lines]
+            section.bullets[0].gap = [""]
+            doc.sections.append(section)
+        return doc
+
+    def render(self) -> str:
+        """Return the compiled document, or "" when no known section had content."""
+        tail = None
+        if self._awaiting_header and self._dangling is not None:
+            # A page ending in "## " with no header text keeps "##" as a body line
+            if line_digest("##") not in self._sections[self._dangling].by_digest:
+                tail = self._dangling
+        out = []
+        for name in SECTION_ORDER:
+            lines = self._sections[name].live_lines()
+            if name == tail:
+                lines = lines + ["##"]
+            if lines:
+                out.append("## " + name + "\n\n" + "\n".join(lines))
+        return "\n\n".join(out)
+
+
+def compile_doc(doc: WeeklyDoc, near_duplicates: bool = True) -> WeeklyDoc:
+    """Compile a parsed page with repeated sections into one section each."""
+    return SectionCompiler(near_duplicates).feed_doc(doc).to_doc()
+
+
+def compile_sections(raw_content: str, near_duplicates: bool = True) -> str:
+    """Compile page content with repeated sections into one document, or return it stripped if none compiled."""
+    compiled = SectionCompiler(near_duplicates).feed_text(raw_content).render()
+    return compiled if compiled else raw_content.strip()
@@ -0,0 +1,70 @@
+"""Persisted writing-style profile, folded in one finalized weekly page at a time."""
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+import config
+from content_ledger import week_key
+from local_state import JsonStateFile, state_path
+from tone_analyzer import ToneAnalyzer
+
+
+class StyleProfile:
+    """Style counts of the last Config.PAST_DOCUMENTS_TO_ANALYZE finalized weekly pages.
+
+    Each finalized page is analyzed once, when it is folded in, and its raw
+    counts (phrases, enthusiasm markers, sentence patterns and casual
+    expressions) are stored under its week. Weeks that fall out of the
+    window are dropped, and the combined summary is stored alongside them,
+    so loading the profile at startup reads no past pages and does no
+    analysis. Folding a week again replaces its counts.
+    """
+
+    def __init__(self, state: Optional[JsonStateFile] = None, analyzer: Optional[ToneAnalyzer] = None):
+        """Bind to the profile state file."""
+        self.state = state or JsonStateFile(state_path("style_profile.json"))
+        self.analyzer = analyzer or ToneAnalyzer()
+
+    def weeks(self) -> List[str]:
+        """Return the keys of the weeks currently in the profile, oldest first."""
+        return sorted(self.state.load().get("weeks", {}))
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the combined style in the shape ToneAnalyzer.analyze_documents() returns it."""
+        summary = self.state.load().get("summary")
+        return summary if summary is not None else self._summarize({})
+
+    def fold(self, week: datetime, document: str) -> Dict[str, Any]:
+        """Fold one week's finalized page into the profile and return the new summary."""
+        stats = self.analyzer.document_stats(document)
+        key = week_key(week)
+        cutoff = week_key(week - timedelta(weeks=config.Config.PAST_DOCUMENTS_TO_ANALYZE))
+
+        def add(data: Dict[str, Any]) -> None:
+            weeks = {name: counts for name, counts in data.get("weeks", {}).items() if name > cutoff}
+            weeks[key] = stats
+            data["weeks"] = weeks
+            data["summary"] = self._summarize(weeks)
+
+        return self.state.update(add)["summary"]
+
+    @staticmethod
+    def _summarize(weeks: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        phrases = Counter()
+        patterns = Counter()
+        markers = set()
+        casual = set()
+        # Oldest week first, so ties between phrases go to the one seen first
+        for name in sorted(weeks):
+            counts = weeks[name]
+            for phrase, count in counts.get("phrases", []):
+                phrases[phrase] += count
+            patterns.update(counts.get("sentence_patterns", {}))
+            markers.update(counts.get("enthusiasm_markers", []))
+            casual.update(counts.get("casual_expressions", []))
+        return {
+            "common_phrases": [list(pair) for pair in phrases.most_common(50)],
+            "enthusiasm_markers": sorted(markers),
+            "sentence_patterns": [pattern for pattern, _ in patterns.most_common()],
+            "sentence_pattern_counts": dict(patterns),
+            "casual_expressions": sorted(casual),
+        }
@@ -0,0 +1,159 @@
+"""Declarative SVP relevance rules (svp_rules.json) compiled into per-source evaluators."""
+import json
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+from keyword_matcher import KeywordMatcher
+import config
+
+# (field name, word boundaries) -> keywords found in that field's lower-cased text
+MatcherKey = Tuple[str, bool]
+Values = Dict[str, Any]
+
+
+class _Hits(dict):
+    """Keyword hits per matcher, computed on first use so each field is scanned at most once."""
+
+    __slots__ = ("matchers", "values")
+
+    def __init__(self, matchers: Dict[MatcherKey, KeywordMatcher], values: Values):
+        super().__init__()
+        self.matchers = matchers
+        self.values = values
+
+    def __missing__(self, key: MatcherKey) -> Set[str]:
+        hits = self.matchers[key].find_all(str(self.values[key[0]]).lower())
+        self[key] = hits
+        return hits
+
+
+# One compiled predicate or score term, evaluated on an item's extracted fields
+Rule = Callable[[Values, _Hits], Any]
+
+
+def _getter(spec: Dict[str, Any]) -> Callable[[Dict[str, Any]], Any]:
+    """Compile a {"path": "a.b.c", "default": ...} field spec; missing or null values give the default."""
+    keys = spec["path"].split(".")
+    default = spec.get("default", "")
+
+    def get(item: Dict[str, Any]) -> Any:
+        value = item
+        for key in keys:
+            if not isinstance(value, dict):
+                return default
+            value = value.get(key)
+        return default if value is None else value
+
+    return get
+
+
+class SourceRules:
+    """Compiled relevance and score rules for one source (jira, glean, pendo, ...).
+
+    Fields are extracted once per item; an item is SVP-relevant if any
+    relevance predicate holds, and its score is the sum of the score terms.
+    Keyword predicates on the same field share one Aho-Corasick matcher, so
+    relevance and scoring scan each text field once between them.
+    """
+
+    def __init__(self, name: str, spec: Dict[str, Any], vocabularies: Dict[str, List[str]]):
+        """Compile one source's section of the rules file."""
+        self.name = name
+        self.vocabularies = vocabularies
+        self.fields: List[Tuple[str, Callable[[Dict[str, Any]], Any]]] = []
+        self.joins: List[Tuple[str, List[str]]] = []
+        for field, field_spec in spec.get("fields", {}).items():
+            if "join" in field_spec:
+                self.joins.append((field, list(field_spec["join"])))
+            else:
+                self.fields.append((field, _getter(field_spec)))
+        self._keywords: Dict[MatcherKey, Set[str]] = {}
+        self.relevance = [self._compile(rule, "relevant_if_any") for rule in spec.get("relevant_if_any", [])]
+        self.scores = [self._compile(rule, "score") for rule in spec.get("score", [])]
+        self.matchers = {key: KeywordMatcher(words, key[1]) for key, words in self._keywords.items()}
+
+    def _expand(self, keywords: List[str]) -> Set[str]:
+        words = set()
+        for keyword in keywords:
+            if keyword.startswith("@"):
+                words.update(word.lower() for word in self.vocabularies[keyword[1:]])
+            else:
+                words.add(keyword.lower())
+        return words
+
+    def _compile(self, rule: Dict[str, Any], section: str) -> Rule:
+        field = rule["field"]
+        if "map" in rule:
+            table = dict(rule["map"])
+            return lambda values, hits: table.get(values[field], 0)
+        if "abs_tiers" in rule:
+            # Ordered (threshold, points): the first threshold the absolute value exceeds wins
+            tiers = [(float(threshold), int(points)) for threshold, points in rule["abs_tiers"]]
+
+            def tier_points(values, hits):
+                magnitude = abs(values[field])
+                return next((points for threshold, points in tiers if magnitude > threshold), 0)
+
+            return tier_points
+
+        predicate = self._predicate(rule, field)
+        if section == "relevant_if_any":
+            return predicate
+        weight = int(rule["weight"])
+        return lambda values, hits: weight if predicate(values, hits) else 0
+
+    def _predicate(self, rule: Dict[str, Any], field: str) -> Rule:
+        if "in" in rule:
+            allowed = frozenset(rule["in"])
+            return lambda values, hits: values[field] in allowed
+        if "contains" in rule:
+            needle = rule["contains"].lower()
+            return lambda values, hits: needle in str(values[field]).lower()
+        if "abs_gt" in rule:
+            threshold = float(rule["abs_gt"])
+            return lambda values, hits: abs(values[field]) > threshold
+        if "keywords" in rule:
+            words = frozenset(self._expand(rule["keywords"]))
+            key = (field, bool(rule.get("word_boundaries", False)))
+            self._keywords.setdefault(key, set()).update(words)
+            return lambda values, hits: not words.isdisjoint(hits[key])
+        raise ValueError(f"Unsupported {self.name} rule: {rule}")
+
+    def extract(self, item: Dict[str, Any]) -> Values:
+        """Return the rule fields of one item."""
+        values = {field: get(item) for field, get in self.fields}
+        for field, parts in self.joins:
+            values[field] = " ".join(str(values[part]) for part in parts)
+        return values
+
+    def evaluate(self, values: Values) -> Tuple[int, bool]:
+        """Return (score, relevant) for one item's extracted fields."""
+        hits = _Hits(self.matchers, values)
+        score = sum(rule(values, hits) for rule in self.scores)
+        return score, any(rule(values, hits) for rule in self.relevance)
+
+    def score(self, values: Values) -> int:
+        """Return the score of one item's extracted fields."""
+        hits = _Hits(self.matchers, values)
+        return sum(rule(values, hits) for rule in self.scores)
+
+    def relevant(self, values: Values) -> bool:
+        """Return True if any relevance rule holds, stopping at the first that does."""
+        hits = _Hits(self.matchers, values)
+        return any(rule(values, hits) for rule in self.relevance)
+
+    def evaluate_batch(self, items: Sequence[Dict[str, Any]]) -> Tuple[List[int], List[bool]]:
+        """Return (scores, relevance mask) for a batch of items."""
+        evaluated = [self.evaluate(self.extract(item)) for item in items]
+        return [score for score, _ in evaluated], [relevant for _, relevant in evaluated]
+
+
+def compile_rules(spec: Dict[str, Any]) -> Dict[str, SourceRules]:
+    """Compile a parsed rules document into evaluators by source name."""
+    vocabularies = spec.get("vocabularies", {})
+    return {name: SourceRules(name, source, vocabularies) for name, source in spec.get("sources", {}).items()}
+
+
+def load_rules(path: Optional[str] = None) -> Tuple[Dict[str, Any], Dict[str, SourceRules]]:
+    """Read and compile the rules file (Config.SVP_RULES_PATH by default); returns (spec, rules)."""
+    with open(path or config.Config.SVP_RULES_PATH) as f:
+        spec = json.load(f)
+    return spec, compile_rules(spec)
@@ -0,0 +1,167 @@
+"""Unit tests for ContentGenerator."""
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+import config
+from content_generator import ContentGenerator
+from weekly_doc import WeeklyDoc
+
+
+def make_generator(cache_dir):
+    """Build a generator whose local state lives in cache_dir."""
+    with patch.object(config.Config, "JIRA_STORE_PATH", ""), \
+            patch.object(config.Config, "CACHE_DIR", cache_dir):
+        return ContentGenerator()
+
+
+class TestFetchSources(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.generator = make_generator(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_sources_are_fetched_concurrently(self):
+        def slow(value):
+            def load(*args, **kwargs):
+                time.sleep(0.2)
+                return value
+            return load
+
+        with patch.object(self.generator.jira.mcp, "get_jira_issues", side_effect=slow([])), \
+                patch.object(self.generator.glean, "get_project_insights", side_effect=slow([])), \
+                patch.object(self.generator.glean, "get_customer_calls", side_effect=slow([])), \
+                patch.object(self.generator.granola, "get_customer_calls", side_effect=slow([])):
+            start = time.monotonic()
+            errors = self.generator.fetch_sources()
+            elapsed = time.monotonic() - start
+        self.assertLess(elapsed, 0.6)
+        self.assertTrue(all(error is None for error in errors.values()))
+
+    def test_granola_failure_falls_back_to_glean(self):
+        call = {"title": "Acme - Customer Call", "url": "https://example.com/acme"}
+        with patch.object(self.generator.granola, "get_customer_calls", side_effect=RuntimeError("down")), \
+                patch.object(self.generator.glean, "get_customer_calls", return_value=[call]), \
+                patch.object(self.generator.glean, "get_project_insights", return_value=[]):
+            errors = self.generator.fetch_sources()
+        self.assertIsInstance(errors["granola_customer_calls"], RuntimeError)
+        self.assertEqual(
+            self.generator.generate_customer_corner(),
+            "Acme - Customer Call\n\nhttps://example.com/acme",
+        )
+
+    def test_glean_fallback_is_not_fetched_when_granola_succeeds(self):
+        with patch.object(self.generator.granola, "get_customer_calls", return_value=[]), \
+                patch.object(self.generator.glean, "get_customer_calls") as mock_glean, \
+                patch.object(self.generator.glean, "get_project_insights", return_value=[]):
+            errors = self.generator.fetch_sources()
+            self.generator.generate_customer_corner()
+        mock_glean.assert_not_called()
+        self.assertNotIn("glean_customer_calls", errors)
+
+    def test_prefetched_results_are_reused(self):
+        calls = []
+        lock = threading.Lock()
+
+        def insights():
+            with lock:
+                calls.append(1)
+            return [{"title": "Next steps for migration", "snippet": "", "url": ""}]
+
+        with patch.object(self.generator.glean, "get_project_insights", side_effect=insights):
+            self.generator.fetch_sources()
+            self.generator.generate_highlights()
+            self.generator.generate_this_week()
+            self.generator.generate_next_week()
+        self.assertEqual(len(calls), 1)
+
+
+class TestMergeNewContent(unittest.TestCase):
+    WEEK = datetime(2026, 2, 13)
+    PAGE = (
+        "## Highlights\n\n* Shipped A\n\n"
+        "## This Week\n\n* Project X\n    * did 1\n* Project Y\n\n"
+        "## Customer Corner\n\nNo customer calls this week."
+    )
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.generator = make_generator(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def merge(self, page, sections):
+        doc = WeeklyDoc.parse(page)
+        self.generator.merge_new_content(doc, sections, self.WEEK)
+        return doc.render()
+
+    def test_new_children_go_under_existing_bullet(self):
+        merged = self.merge(self.PAGE, {"This Week": "* project x\n    * did 1\n    * did 2\n* Project Z"})
+        self.assertIn("* Project X\n    * did 1\n    * did 2\n* Project Y\n* Project Z\n\n## Customer Corner", merged)
+        self.assertEqual(merged.count("## This Week"), 1)
+
+    def test_rerun_adds_nothing(self):
+        updates = {"Highlights": "* Shipped A\n\n* Shipped B", "This Week": "* Project Y"}
+        merged = self.merge(self.PAGE, updates)
+        self.assertEqual(self.merge(merged, updates), merged)
+        self.assertEqual(merged.count("Shipped A"), 1)
+
+    def test_placeholder_is_replaced_by_calls(self):
+        merged = self.merge(self.PAGE, {"Customer Corner": "Acme call\n\nhttps://x"})
+        self.assertTrue(merged.endswith("## Customer Corner\n\nAcme call\n\nhttps://x"))
+        self.assertNotIn("No customer calls", merged)
+
+    def test_missing_section_is_inserted_in_order(self):
+        merged = self.merge(self.PAGE, {"Next Week": "* plan"})
+        self.assertIn("* Project Y\n\n## Next Week\n\n* plan\n\n## Customer Corner", merged)
+
+    def test_empty_page_gets_all_sections(self):
+        merged = self.merge("", {"Highlights": "* A", "Customer Corner": "Acme"})
+        self.assertEqual(merged, "## Highlights\n\n* A\n\n## Customer Corner\n\nAcme")
+
+
+class TestContentLedgerDedupe(unittest.TestCase):
+    WEEK = datetime(2026, 2, 13)
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.generator = make_generator(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_lines_written_by_another_run_are_not_added_again(self):
+        page = WeeklyDoc.parse("## This Week\n\n* Project X\n    * did 1")
+        self.generator.record_written(page, self.WEEK)
+        # The user deleted the section; a later run (another process) must not restore it
+        other_run = make_generator(self.tmp.name)
+        doc = WeeklyDoc.parse("## Highlights\n\n* A")
+        added = other_run.merge_new_content(doc, {"This Week": "* Project X\n    * did 1"}, self.WEEK)
+        self.assertEqual(added, 0)
+        self.assertEqual(doc.render(), "## Highlights\n\n* A")
+
+    def test_recorded_parent_is_kept_for_new_children(self):
+        self.generator.record_written(WeeklyDoc.parse("## This Week\n\n* Project X\n    * did 1"), self.WEEK)
+        doc = WeeklyDoc()
+        self.generator.merge_new_content(doc, {"This Week": "* Project X\n    * did 1\n    * did 2"}, self.WEEK)
+        self.assertEqual(doc.render(), "## This Week\n\n* Project X\n    * did 2")
+
+    def test_merge_dedupes_across_runs(self):
+        doc = WeeklyDoc.parse("## This Week\n\n* a")
+        self.generator.merge_new_content(doc, {"This Week": "* b\n* B"}, self.WEEK)
+        self.assertEqual(doc.render(), "## This Week\n\n* a\n* b")
+        self.generator.record_written(doc, self.WEEK)
+        # Another run starting from an older copy of the page does not add b again
+        other = WeeklyDoc.parse("## This Week\n\n* a")
+        make_generator(self.tmp.name).merge_new_content(other, {"This Week": "* b\n* c"}, self.WEEK)
+        self.assertEqual(other.render(), "## This Week\n\n* a\n* c")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+"""Unit tests for the persistent content ledger."""
+import multiprocessing
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import config
+import local_state
+from content_ledger import ContentLedger
+from local_state import JsonStateFile
+from weekly_doc import item_id
+
+
+def record_lines(path, worker, count):
+    """Record count distinct lines from one process, one update per line."""
+    ledger = ContentLedger(JsonStateFile(path))
+    for i in range(count):
+        ledger.record(datetime(2026, 2, 13), [("This Week", f"worker {worker} line {i}")])
+
+
+class TestContentLedger(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "content_ledger.json")
+        self.week = datetime(2026, 2, 13)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_recorded_lines_are_seen_by_other_processes(self):
+        writer = ContentLedger(JsonStateFile(self.path))
+        reader = ContentLedger(JsonStateFile(self.path))
+        self.assertFalse(reader.contains(self.week, "This Week", "shipped a"))
+        self.assertEqual(writer.record(self.week, [("This Week", "shipped a"), ("This Week", "shipped a")]), 1)
+        self.assertTrue(reader.contains(self.week, "This Week", "shipped a"))
+        self.assertFalse(reader.contains(self.week, "Highlights", "shipped a"))
+        self.assertFalse(reader.contains(self.week + timedelta(weeks=1), "This Week", "shipped a"))
+        self.assertEqual(writer.record(self.week, [("This Week", "shipped a")]), 0)
+
+    @unittest.skipIf(local_state.fcntl is None, "No inter-process file locks on this platform")
+    def test_concurrent_processes_keep_every_record(self):
+        context = multiprocessing.get_context("fork")
+        workers = [context.Process(target=record_lines, args=(self.path, worker, 25)) for worker in range(4)]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join()
+        ledger = ContentLedger(JsonStateFile(self.path))
+        for worker in range(4):
+            for i in range(25):
+                self.assertTrue(ledger.contains(self.week, "This Week", f"worker {worker} line {i}"))
+
+    def test_digests_are_stable(self):
+        self.assertEqual(item_id("Highlights", "x"), item_id("Highlights", "x"))
+        self.assertEqual(len(item_id("Highlights", "x")), 16)
+
+    def test_old_weeks_expire(self):
+        state = JsonStateFile(self.path)
+        ledger = ContentLedger(state)
+        with patch.object(config.Config, "CONTENT_LEDGER_WEEKS", 2):
+            ledger.record(self.week, [("Highlights", "a")])
+            ledger.record(self.week + timedelta(weeks=1), [("Highlights", "b")])
+            self.assertEqual(len(state.load()["weeks"]), 2)
+            ledger.record(self.week + timedelta(weeks=2), [("Highlights", "c")])
+        self.assertEqual(sorted(state.load()["weeks"]), ["2026-02-20", "2026-02-27"])
+        self.assertFalse(ledger.contains(self.week, "Highlights", "a"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+"""Unit tests for FileManager page writes."""
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import config
+from confluence_client import ConfluenceClient
+from file_manager import FileManager
+
+
+class TestUpdatePageContent(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        patcher = patch.object(config.Config, "CACHE_DIR", self.tmpdir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.file_manager = FileManager()
+
+    def test_identical_rewrite_is_skipped(self):
+        with patch.object(self.file_manager.confluence, "update_page", return_value={"id": "1", "version": {"number": 2}}) as mock_update:
+            self.file_manager.update_page_content("1", "## Highlights\n\n* A", append=False)
+            result = self.file_manager.update_page_content("1", "## Highlights\n\n* A", append=False)
+        self.assertTrue(result["unchanged"])
+        self.assertEqual(mock_update.call_count, 1)
+
+    def test_changed_content_is_written(self):
+        with patch.object(self.file_manager.confluence, "update_page", return_value={"id": "1", "version": {"number": 2}}) as mock_update:
+            self.file_manager.update_page_content("1", "## Highlights\n\n* A", append=False)
+            self.file_manager.update_page_content("1", "## Highlights\n\n* B", append=False)
+        self.assertEqual(mock_update.call_count, 2)
+
+    def test_fingerprints_survive_restart(self):
+        with patch.object(self.file_manager.confluence, "update_page", return_value={"id": "1", "version": {"number": 2}}):
+            self.file_manager.update_page_content("1", "body", append=False)
+        restarted = FileManager()
+        with patch.object(restarted.confluence, "update_page") as mock_update:
+            self.assertTrue(restarted.update_page_content("1", "body", append=False)["unchanged"])
+        mock_update.assert_not_called()
+
+    def test_empty_append_costs_nothing(self):
+        with patch.object(self.file_manager.confluence, "get_page_content") as mock_get, \
+                patch.object(self.file_manager.confluence, "update_page") as mock_update:
+            self.assertTrue(self.file_manager.update_page_content("1", "  ", append=True)["unchanged"])
+        mock_get.assert_not_called()
+        mock_update.assert_not_called()
+
+
+class TestPageMirror(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        patcher = patch.object(config.Config, "CACHE_DIR", self.tmpdir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.file_manager = FileManager()
+        self.versions = {"1": 3}
+
+    def fake_update(self, page_id, content, title=None, version=None):
+        if version != self.versions[page_id] + 1:
+            return {"id": page_id, "conflict": True}
+        self.versions[page_id] = version
+        return {"id": page_id, "version": {"number": version}}
+
+    def test_appends_read_the_page_only_once(self):
+        with patch.object(self.file_manager.confluence, "get_page",
+                          return_value={"id": "1", "body": "A", "version": 3}) as mock_get, \
+                patch.object(self.file_manager.confluence, "update_page", side_effect=self.fake_update) as mock_update:
+            self.file_manager.update_page_content("1", "B")
+            self.file_manager.update_page_content("1", "C")
+        mock_get.assert_called_once()
+        self.assertEqual(mock_update.call_args.args[1], "A\n\nB\n\nC")
+        self.assertEqual(mock_update.call_args.kwargs["version"], 5)
+        self.assertEqual(FileManager().get_mirrored_content("1"), "A\n\nB\n\nC")
+
+    def test_version_mismatch_rereads_and_retries_append(self):
+        self.file_manager.mirror.record("1", "A", 3)
+        # Someone edited the page in Confluence since it was mirrored
+        self.versions["1"] = 4
+        with patch.object(self.file_manager.confluence, "get_page",
+                          return_value={"id": "1", "body": "A edited", "version": 4}) as mock_get, \
+                patch.object(self.file_manager.confluence, "update_page", side_effect=self.fake_update) as mock_update:
+            result = self.file_manager.update_page_content("1", "B")
+        mock_get.assert_called_once()
+        self.assertFalse(result.get("conflict"))
+        self.assertEqual(mock_update.call_args.args[1], "A edited\n\nB")
+        self.assertEqual(self.file_manager.get_mirrored_content("1"), "A edited\n\nB")
+
+    def test_page_without_version_is_read_before_every_write(self):
+        self.file_manager.mirror.record("1", "stale", None)
+        self.assertIsNone(self.file_manager.get_mirrored_content("1"))
+        with patch.object(self.file_manager.confluence, "get_page",
+                          side_effect=[{"id": "1", "body": "A", "version": None},
+                                       {"id": "1", "body": "A edited", "version": None}]) as mock_get, \
+                patch.object(self.file_manager.confluence, "update_page", return_value={"id": "1"}) as mock_update:
+            self.file_manager.update_page_content("1", "B")
+            self.file_manager.update_page_content("1", "C")
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(mock_update.call_args.args[1], "A edited\n\nC")
+        self.assertIsNone(self.file_manager.get_mirrored_content("1"))
+
+    def test_version_mismatch_on_replace_is_reported(self):
+        self.file_manager.mirror.record("1", "A", 3)
+        self.versions["1"] = 4
+        with patch.object(self.file_manager.confluence, "get_page",
+                          return_value={"id": "1", "body": "A edited", "version": 4}), \
+                patch.object(self.file_manager.confluence, "update_page", side_effect=self.fake_update):
+            self.assertTrue(self.file_manager.update_page_content("1", "B", append=False)["conflict"])
+        self.assertEqual(self.file_manager.get_page_content("1"), "A edited")
+
+    def test_deleted_page_is_forgotten_and_looked_up_again(self):
+        self.file_manager.page_index.record("Weekly", "1")
+        self.file_manager.mirror.record("1", "A", 3)
+        with patch.object(self.file_manager.confluence, "update_page",
+                          return_value={"id": "1", "not_found": True}):
+            self.assertTrue(self.file_manager.update_page_content("1", "B", append=False)["not_found"])
+        self.assertIsNone(self.file_manager.get_mirrored_content("1"))
+        with patch.object(self.file_manager.page_index, "find_page", return_value={"id": "2"}) as mock_find:
+            self.assertEqual(self.file_manager.page_index.lookup("Weekly"), "2")
+        mock_find.assert_called_once_with("Weekly")
+
+
+class HTTPError(Exception):
+    def __init__(self, message, status_code):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class TestConditionalUpdate(unittest.TestCase):
+    def setUp(self):
+        self.client = ConfluenceClient(cloud_id="cloud")
+
+    def test_live_version_is_checked_when_the_tool_takes_none(self):
+        with patch.object(self.client.mcp, "get_confluence_page", return_value={"version": {"number": 4}}), \
+                patch.object(self.client.mcp, "update_confluence_page", return_value={"id": "1"}) as mock_update:
+            self.assertTrue(self.client.update_page("1", "B", version=4)["conflict"])
+            mock_update.assert_not_called()
+            self.assertFalse(self.client.update_page("1", "B", version=5).get("conflict"))
+        self.assertIsNone(mock_update.call_args.kwargs["version"])
+
+    def test_only_a_409_is_a_conflict(self):
+        with patch.object(config.Config, "CONFLUENCE_SEND_PAGE_VERSION", True), \
+                patch.object(self.client.mcp, "get_confluence_page") as mock_get:
+            with patch.object(self.client.mcp, "update_confluence_page",
+                              side_effect=HTTPError("Conflict", 409)):
+                self.assertTrue(self.client.update_page("1", "B", version=5)["conflict"])
+            for error in (HTTPError("Invalid argument: version", 400), RuntimeError("version not supported")):
+                with patch.object(self.client.mcp, "update_confluence_page", side_effect=error):
+                    with self.assertRaises(type(error)):
+                        self.client.update_page("1", "B", version=5)
+        mock_get.assert_not_called()
+
+    def test_missing_page_is_reported(self):
+        for send_version in (False, True):
+            with patch.object(config.Config, "CONFLUENCE_SEND_PAGE_VERSION", send_version), \
+                    patch.object(self.client.mcp, "get_confluence_page", return_value={"version": {"number": 4}}), \
+                    patch.object(self.client.mcp, "update_confluence_page",
+                                 side_effect=HTTPError("Not Found", 404)):
+                self.assertTrue(self.client.update_page("1", "B", version=5)["not_found"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+"""Unit tests for single-pass Jira issue classification."""
+import unittest
+
+from issue_set import IssueSet
+from svp_filter import SVPFilter
+
+
+def _issue(key, summary, status, category="", priority=None, issue_type="Task"):
+    return {
+        "key": key,
+        "fields": {
+            "summary": summary,
+            "status": {"name": status, "statusCategory": {"key": category}},
+            "priority": {"name": priority} if priority else None,
+            "issuetype": {"name": issue_type},
+        },
+    }
+
+
+ISSUES = [
+    _issue("PROJ-1", "Roadmap epic", "In Progress", "indeterminate", "Medium", "Epic"),
+    _issue("PROJ-2", "Fix login", "Blocked", "indeterminate", "Low"),
+    _issue("PROJ-3", "Ship reports", "Done", "done", "High"),
+    _issue("PROJ-4", "Tidy docs", "To Do", "new", "Low"),
+    _issue("PROJ-5", "Customer churn dashboard", "To Do", "new"),
+]
+
+
+class TestIssueSet(unittest.TestCase):
+    def setUp(self):
+        self.issue_set = IssueSet.from_issues(ISSUES)
+
+    def _keys(self, records):
+        return [r.key for r in records]
+
+    def test_buckets(self):
+        self.assertEqual(self._keys(self.issue_set.initiatives), ["PROJ-1"])
+        self.assertEqual(self._keys(self.issue_set.blockers), ["PROJ-2", "PROJ-3"])
+        self.assertEqual(self._keys(self.issue_set.completed), ["PROJ-3"])
+        self.assertEqual(self._keys(self.issue_set.in_progress), ["PROJ-1", "PROJ-2"])
+
+    def test_svp_relevance_matches_filter(self):
+        svp = SVPFilter()
+        expected = [i["key"] for i in ISSUES if svp.is_svp_relevant(i, "jira")]
+        self.assertEqual(self._keys(self.issue_set.svp_relevant), expected)
+        for issue in ISSUES:
+            record = self.issue_set.by_key[issue["key"]]
+            self.assertEqual(record.svp_score, svp._calculate_relevance_score(issue, "jira"))
+
+    def test_prioritized_matches_filter_order(self):
+        expected = [i["key"] for i in SVPFilter().prioritize_items(ISSUES, "jira")]
+        self.assertEqual(self._keys(self.issue_set.prioritized()), expected)
+
+    def test_record_fields(self):
+        record = self.issue_set.by_key["PROJ-3"]
+        self.assertEqual(record.summary_line, "PROJ-3: Ship reports (Done)")
+        self.assertEqual(record.status_category, "done")
+        self.assertEqual(record.priority_rank, 1)
+        self.assertEqual(self.issue_set.by_key["PROJ-5"].priority, "")
+
+
+if __name__ == "__main__":
+    unittest.main()
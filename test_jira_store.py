@@ -0,0 +1,137 @@
+"""Unit tests for the incremental Jira issue store."""
+import os
+import tempfile
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from jira_aggregator import JiraAggregator
+from jira_store import JiraIssueStore, parse_jira_datetime
+
+
+def _issue(key, updated, status="In Progress"):
+    return {
+        "key": key,
+        "fields": {
+            "summary": f"Work on {key}",
+            "status": {"name": status, "statusCategory": {"key": "indeterminate"}},
+            "priority": {"name": "Medium"},
+            "issuetype": {"name": "Task"},
+            "updated": updated.strftime("%Y-%m-%dT%H:%M:%S.000") + "+0000",
+        },
+    }
+
+
+class TestJiraIssueStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = JiraIssueStore(os.path.join(self.tmpdir.name, "issues.db"))
+
+    def tearDown(self):
+        self.store.close()
+        self.tmpdir.cleanup()
+
+    def test_parse_jira_datetime(self):
+        parsed = parse_jira_datetime("2026-02-10T14:23:11.000+0000")
+        self.assertIsNotNone(parsed)
+        self.assertIsNone(parsed.tzinfo)
+        self.assertIsNone(parse_jira_datetime(""))
+
+    def test_upsert_advances_watermark_and_replaces_by_key(self):
+        now = datetime.utcnow()
+        self.store.upsert("s", [_issue("A-1", now - timedelta(hours=2))])
+        first = self.store.get_watermark("s")
+        self.store.upsert("s", [_issue("A-1", now, status="Done")])
+        self.assertGreater(self.store.get_watermark("s"), first)
+        issues = list(self.store.iter_issues("s", since=datetime(2000, 1, 1)))
+        self.assertEqual(len(issues), 1)
+        self.assertEqual(issues[0]["fields"]["status"]["name"], "Done")
+
+    def test_stale_copy_does_not_overwrite_newer_issue(self):
+        now = datetime.utcnow()
+        self.store.upsert("s", [_issue("A-1", now, status="Done")])
+        self.store.upsert("s", [_issue("A-1", now - timedelta(hours=1), status="In Progress")])
+        issues = list(self.store.iter_issues("s", since=datetime(2000, 1, 1)))
+        self.assertEqual([issue["fields"]["status"]["name"] for issue in issues], ["Done"])
+
+    def test_prune_removes_old_issues(self):
+        now = datetime.now()
+        self.store.upsert("s", [_issue("A-1", datetime.utcnow()), _issue("A-2", datetime.utcnow() - timedelta(days=30))])
+        self.assertEqual(self.store.prune("s", before=now - timedelta(days=7)), 1)
+
+
+class TestJiraAggregatorIncrementalSync(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = JiraIssueStore(os.path.join(self.tmpdir.name, "issues.db"))
+
+    def tearDown(self):
+        self.store.close()
+        self.tmpdir.cleanup()
+
+    def test_second_run_fetches_only_the_delta(self):
+        now = datetime.utcnow()
+        jira = JiraAggregator(cloud_id="cloud", store=self.store)
+        with patch.object(jira.mcp, "get_jira_issues", return_value=[_issue("A-1", now), _issue("A-2", now)]) as mock_get:
+            self.assertEqual(len(jira.get_issues_updated_this_week()), 2)
+        first_jql = mock_get.call_args.kwargs["jql"]
+        self.assertIn("updated", mock_get.call_args.kwargs["fields"])
+
+        jira.reset_cache()
+        live = {"A-1": _issue("A-1", now), "A-2": _issue("A-2", now)}
+        with patch.object(jira.mcp, "get_jira_issues", side_effect=self._jira([_issue("A-3", now)], live)) as mock_get:
+            keys = {i["key"] for i in jira.get_issues_updated_this_week()}
+        self.assertEqual(keys, {"A-1", "A-2", "A-3"})
+        self.assertNotEqual(mock_get.call_args_list[0].kwargs["jql"], first_jql)
+
+    @staticmethod
+    def _jira(delta, live):
+        """Fake get_jira_issues: delta for the update query, the live issues for the keys-only listing."""
+        def get_jira_issues(cloud_id, jql, page_size, fields):
+            return list(live.values()) if fields == ["key"] else list(delta)
+        return get_jira_issues
+
+    def test_reassigned_issues_are_dropped(self):
+        now = datetime.utcnow()
+        jira = JiraAggregator(cloud_id="cloud", store=self.store)
+        with patch.object(jira.mcp, "get_jira_issues", side_effect=self._jira([_issue("A-1", now), _issue("A-2", now)], {})):
+            jira.get_issues_updated_this_week()
+
+        # A-2 was reassigned: it is missing from the delta and from the week's live keys
+        jira.reset_cache()
+        live = {"A-1": _issue("A-1", now)}
+        with patch.object(jira.mcp, "get_jira_issues", side_effect=self._jira([], live)) as mock_get:
+            keys = [i["key"] for i in jira.get_issues_updated_this_week()]
+        self.assertEqual(keys, ["A-1"])
+        check = mock_get.call_args_list[1].kwargs
+        self.assertRegex(check["jql"], r"^assignee = currentUser\(\) AND updated >= \d{4}-\d{2}-\d{2}$")
+        self.assertNotIn("key in", check["jql"])
+        self.assertEqual(check["fields"], ["key"])
+
+    def test_delta_bound_is_independent_of_the_server_timezone(self):
+        # The server runs in UTC; Jira reports (and reads JQL in) -0500
+        jira_tz = timezone(timedelta(hours=-5))
+        updated = (datetime.now(timezone.utc) - timedelta(hours=2)).replace(microsecond=0)
+        issue = _issue("A-1", updated.astimezone(jira_tz).replace(tzinfo=None))
+        issue["fields"]["updated"] = updated.astimezone(jira_tz).strftime("%Y-%m-%dT%H:%M:%S.000%z")
+        jira = JiraAggregator(cloud_id="cloud", store=self.store)
+        try:
+            with patch.dict(os.environ, {"TZ": "UTC"}):
+                time.tzset()
+                with patch.object(jira, "get_week_start", return_value=datetime(2000, 1, 3)), \
+                        patch.object(jira.mcp, "get_jira_issues", return_value=[issue]):
+                    jira.get_issues_updated_this_week()
+                jira.reset_cache()
+                with patch.object(jira, "get_week_start", return_value=datetime(2000, 1, 3)), \
+                        patch("jira_aggregator.time.time", return_value=updated.timestamp() + 10 * 60), \
+                        patch.object(jira.mcp, "get_jira_issues", return_value=[]) as mock_get:
+                    jira.get_issues_updated_this_week()
+        finally:
+            time.tzset()
+        # 10 minutes since the issue's update plus the 5 minute overlap, whatever Jira's timezone
+        self.assertIn("updated >= -15m ", mock_get.call_args_list[0].kwargs["jql"])
+
+
+if __name__ == "__main__":
+    unittest.main()
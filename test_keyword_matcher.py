@@ -0,0 +1,47 @@
+"""Unit tests for the Aho-Corasick keyword matcher."""
+import random
+import unittest
+
+from keyword_matcher import KeywordMatcher
+from svp_filter import SVPFilter
+
+
+class TestKeywordMatcher(unittest.TestCase):
+    def test_matches_substring_checks(self):
+        rng = random.Random(7)
+        for _ in range(300):
+            keywords = {"".join(rng.choice("ab c") for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(1, 8))}
+            text = "".join(rng.choice("ab c") for _ in range(rng.randint(0, 40)))
+            with self.subTest(keywords=keywords, text=text):
+                matcher = KeywordMatcher(keywords)
+                self.assertEqual(matcher.find_all(text), {keyword for keyword in keywords if keyword in text})
+                expected = sorted(
+                    (start, keyword) for keyword in keywords
+                    for start in range(len(text)) if text.startswith(keyword, start)
+                )
+                self.assertEqual(sorted(matcher.iter_matches(text)), expected)
+
+    def test_overlapping_and_nested_keywords(self):
+        matcher = KeywordMatcher(["he", "she", "his", "hers"])
+        self.assertEqual(list(matcher.iter_matches("ushers")), [(1, "she"), (2, "he"), (2, "hers")])
+
+    def test_word_boundaries(self):
+        matcher = KeywordMatcher(["churn", "cross-functional", "it's"], word_boundaries=True)
+        self.assertEqual(matcher.find_all("churned users, cross-functional sync"), {"cross-functional"})
+        self.assertEqual(matcher.find_all("churn_rate vs churn. it's fine"), {"churn", "it's"})
+        self.assertFalse(matcher.search("anticross-functionality"))
+        self.assertFalse(KeywordMatcher([]).search("anything"))
+
+
+class TestSVPFilterKeywords(unittest.TestCase):
+    def test_relevance_matches_keyword_loop(self):
+        svp = SVPFilter()
+        for summary in ("Fix checkout performance", "Reduce CHURN in Q3", "Update docs", ""):
+            expected = any(keyword in summary.lower() for keyword in svp.rules_spec["vocabularies"]["high_priority"])
+            self.assertEqual(svp.evaluate_jira("Low", "To Do", "Task", summary), (0, expected))
+        self.assertTrue(svp.is_svp_relevant({"title": "Weekly", "snippet": "customer complaint about X"}, "glean"))
+        self.assertEqual(svp._calculate_relevance_score({"title": "Critical customer issue"}, "glean"), 15)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+"""Unit tests for MCP integration helpers."""
+import os
+import sys
+import tempfile
+import time
+import types
+import unittest
+from unittest.mock import patch
+
+import config
+from mcp_integration import MCPIntegration
+from response_cache import ResponseCache, MISS
+
+
+def _fake_atlassian(pages):
+    """Build a fake mcp_atlassian module whose Jira search serves the given pages."""
+    calls = []
+
+    def searchJiraIssuesUsingJql(**params):
+        calls.append(params)
+        index = int(params.get("nextPageToken") or 0)
+        return pages[index]
+
+    module = types.ModuleType("mcp_atlassian")
+    module.searchJiraIssuesUsingJql = searchJiraIssuesUsingJql
+    return module, calls
+
+
+class TestJiraPagination(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(config.Config, "RESPONSE_CACHE_PATH", "")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_follows_page_tokens(self):
+        pages = [
+            {"issues": [{"key": "A-1"}, {"key": "A-2"}], "nextPageToken": "1"},
+            {"issues": [{"key": "A-3"}], "nextPageToken": "2"},
+            {"issues": [{"key": "A-4"}], "isLast": True},
+        ]
+        module, calls = _fake_atlassian(pages)
+        with patch.dict(sys.modules, {"mcp_atlassian": module}):
+            keys = [i["key"] for i in MCPIntegration.get_jira_issues("cloud", "jql", page_size=2)]
+        self.assertEqual(keys, ["A-1", "A-2", "A-3", "A-4"])
+        self.assertEqual(len(calls), 3)
+        self.assertNotIn("nextPageToken", calls[0])
+        self.assertEqual(calls[1]["nextPageToken"], "1")
+
+    def test_pages_are_fetched_lazily(self):
+        pages = [
+            {"issues": [{"key": "A-1"}], "nextPageToken": "1"},
+            {"issues": [{"key": "A-2"}]},
+        ]
+        module, calls = _fake_atlassian(pages)
+        with patch.dict(sys.modules, {"mcp_atlassian": module}):
+            issues = MCPIntegration.get_jira_issues("cloud", "jql")
+            self.assertEqual(next(issues)["key"], "A-1")
+            self.assertEqual(len(calls), 1)
+            self.assertEqual([i["key"] for i in issues], ["A-2"])
+
+    def test_fields_are_projected(self):
+        module, calls = _fake_atlassian([{"issues": []}])
+        with patch.dict(sys.modules, {"mcp_atlassian": module}):
+            list(MCPIntegration.get_jira_issues("cloud", "jql", fields=["summary", "status"]))
+        self.assertEqual(calls[0]["fields"], ["summary", "status"])
+
+    def test_missing_mcp_yields_nothing(self):
+        with patch.dict(sys.modules, {"mcp_atlassian": None}):
+            self.assertEqual(list(MCPIntegration.get_jira_issues("cloud", "jql")), [])
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, "responses.db")
+
+    def test_hit_ignores_argument_order(self):
+        cache = ResponseCache(self.path)
+        cache.put("glean.search", {"query": "q", "after": "2026-01-01"}, {"results": [1]}, ttl=60)
+        self.assertEqual(cache.get("glean.search", {"after": "2026-01-01", "query": "q"}), {"results": [1]})
+        self.assertIs(cache.get("glean.search", {"query": "other"}), MISS)
+
+    def test_expired_entries_miss(self):
+        cache = ResponseCache(self.path)
+        cache.put("glean.search", {"query": "q"}, [], ttl=0.01)
+        time.sleep(0.02)
+        self.assertIs(cache.get("glean.search", {"query": "q"}), MISS)
+
+    def test_lru_cap_evicts_least_recently_used(self):
+        cache = ResponseCache(self.path, max_entries=2)
+        cache.put("t", {"n": 1}, 1, ttl=60)
+        time.sleep(0.01)
+        cache.put("t", {"n": 2}, 2, ttl=60)
+        time.sleep(0.01)
+        cache.get("t", {"n": 1})
+        time.sleep(0.01)
+        cache.put("t", {"n": 3}, 3, ttl=60)
+        self.assertEqual(cache.get("t", {"n": 1}), 1)
+        self.assertIs(cache.get("t", {"n": 2}), MISS)
+
+    def test_shared_between_connections(self):
+        ResponseCache(self.path).put("t", {}, "v", ttl=60)
+        self.assertEqual(ResponseCache(self.path).get("t", {}), "v")
+
+    def test_mcp_calls_are_served_from_cache(self):
+        calls = []
+
+        def search(**params):
+            calls.append(params)
+            return {"results": [{"title": "Doc"}]}
+
+        module = types.ModuleType("mcp_Glean")
+        module.search = search
+        with patch.object(config.Config, "RESPONSE_CACHE_PATH", self.path), \
+                patch.dict(sys.modules, {"mcp_Glean": module}):
+            MCPIntegration.glean_search("q", after="2026-01-01")
+            results = MCPIntegration.glean_search("q", after="2026-01-01")
+        self.assertEqual(results, [{"title": "Doc"}])
+        self.assertEqual(len(calls), 1)
+
+    def test_jira_searches_are_never_cached(self):
+        module, calls = _fake_atlassian([{"issues": [{"key": "A-1"}], "isLast": True}])
+        with patch.object(config.Config, "RESPONSE_CACHE_PATH", self.path), \
+                patch.dict(sys.modules, {"mcp_atlassian": module}):
+            list(MCPIntegration.get_jira_issues("cloud", "jql"))
+            list(MCPIntegration.get_jira_issues("cloud", "jql"))
+        self.assertEqual(len(calls), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+"""Unit tests for Confluence page lookup and the page-tree index."""
+import os
+import sys
+import tempfile
+import types
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+import config
+from confluence_client import ConfluenceClient
+from file_manager import FileManager
+from local_state import JsonStateFile
+from page_index import PageIndex
+
+
+class TestPageIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.state = JsonStateFile(os.path.join(self.tmpdir.name, "page_index.json"))
+        self.pages = {"Nick Q1 2026": "10", "Nick - Feb 13th 2026": "11"}
+        self.finds = []
+
+    def _find_page(self, title):
+        self.finds.append(title)
+        page_id = self.pages.get(title)
+        return {"id": page_id, "title": title} if page_id else None
+
+    def test_second_lookup_is_free(self):
+        index = PageIndex(self._find_page, self.state)
+        self.assertEqual(index.lookup("Nick Q1 2026"), "10")
+        self.assertEqual(index.lookup("Nick Q1 2026"), "10")
+        self.assertEqual(self.finds, ["Nick Q1 2026"])
+
+    def test_index_is_persisted(self):
+        PageIndex(self._find_page, self.state).lookup("Nick - Feb 13th 2026")
+        reopened = PageIndex(self._find_page, JsonStateFile(self.state.path))
+        self.assertEqual(reopened.lookup("Nick - Feb 13th 2026"), "11")
+        self.assertEqual(len(self.finds), 1)
+
+    def test_repeated_misses_ask_once(self):
+        index = PageIndex(self._find_page, self.state)
+        self.assertIsNone(index.lookup("Nick - Feb 20th 2026"))
+        self.assertIsNone(index.lookup("Nick - Feb 20th 2026"))
+        self.assertEqual(len(self.finds), 1)
+
+    def test_recorded_pages_resolve_without_lookup(self):
+        index = PageIndex(self._find_page, self.state)
+        self.assertIsNone(index.lookup("Nick - Feb 20th 2026"))
+        index.record("Nick - Feb 20th 2026", "12")
+        self.assertEqual(index.lookup("Nick - Feb 20th 2026"), "12")
+        self.assertEqual(len(self.finds), 1)
+
+
+class TestFindPageByTitle(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(config.Config, "RESPONSE_CACHE_PATH", "")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = ConfluenceClient(cloud_id="cloud")
+
+    def test_uses_cql_title_query(self):
+        with patch.object(self.client.mcp, "search_confluence_using_cql",
+                          return_value=[{"content": {"id": "11", "title": "Nick - Feb 13th 2026"}}]) as mock_cql, \
+                patch.object(self.client.mcp, "iter_confluence_page_descendants") as mock_walk:
+            page = self.client.find_page_by_title("Nick - Feb 13th 2026")
+        self.assertEqual(page["id"], "11")
+        self.assertIn('title = "Nick - Feb 13th 2026"', mock_cql.call_args.kwargs["cql"])
+        mock_walk.assert_not_called()
+
+    def test_cursor_walk_stops_once_found(self):
+        calls = []
+        pages = [
+            {"results": [{"id": str(n), "title": f"Page {n}"} for n in range(100)],
+             "_links": {"next": "/wiki/api/v2/pages/1/descendants?limit=100&cursor=abc"}},
+            {"results": [{"id": "target", "title": "Nick - Feb 13th 2026"}],
+             "_links": {"next": "/wiki/api/v2/pages/1/descendants?limit=100&cursor=def"}},
+            {"results": []},
+        ]
+
+        def descendants(**params):
+            calls.append(params)
+            return pages[len(calls) - 1]
+
+        module = types.ModuleType("mcp_atlassian")
+        module.getConfluencePageDescendants = descendants
+        with patch.dict(sys.modules, {"mcp_atlassian": module}):
+            page = self.client.find_page_by_title("Nick - Feb 13th 2026")
+        self.assertEqual(page["id"], "target")
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(calls[1]["cursor"], "abc")
+
+
+class TestFileManagerUsesIndex(unittest.TestCase):
+    def test_get_or_create_looks_up_once(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        with patch.object(config.Config, "CACHE_DIR", tmpdir.name):
+            file_manager = FileManager()
+        friday = datetime(2026, 2, 13)
+        page = {"id": "11", "title": file_manager.get_page_title_for_date(friday)}
+        with patch.object(file_manager, "get_current_week_friday", return_value=friday), \
+                patch.object(file_manager.page_index, "find_page", return_value=page) as mock_find:
+            for _ in range(3):
+                self.assertEqual(file_manager.get_or_create_current_weekly_page()["id"], "11")
+        self.assertEqual(mock_find.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
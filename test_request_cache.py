@@ -0,0 +1,104 @@
+"""Unit tests for the run-scoped request cache."""
+import threading
+import unittest
+from unittest.mock import patch
+
+from glean_aggregator import GleanAggregator
+from jira_aggregator import JiraAggregator
+from request_cache import RequestCache
+
+
+class TestRequestCache(unittest.TestCase):
+    def test_second_call_is_a_hit(self):
+        cache = RequestCache()
+        calls = []
+        fetch = lambda: calls.append(1) or ["a"]
+        self.assertEqual(cache.get_or_fetch("k", fetch), ["a"])
+        self.assertEqual(cache.get_or_fetch("k", fetch), ["a"])
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1, "entries": 1})
+
+    def test_concurrent_requests_coalesce(self):
+        cache = RequestCache()
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            release.wait(timeout=5)
+            return "value"
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_fetch("k", fetch)))
+            for _ in range(5)
+        ]
+        for t in threads:
+            t.start()
+        release.set()
+        for t in threads:
+            t.join(timeout=5)
+        self.assertEqual(results, ["value"] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+        self.assertEqual(cache.stats()["hits"], 4)
+
+    def test_errors_are_not_cached(self):
+        cache = RequestCache()
+
+        def fail():
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            cache.get_or_fetch("k", fail)
+        self.assertEqual(cache.get_or_fetch("k", lambda: 1), 1)
+
+    def test_reset_clears_results_and_counters(self):
+        cache = RequestCache()
+        cache.get_or_fetch("k", lambda: 1)
+        cache.reset()
+        self.assertEqual(cache.stats(), {"hits": 0, "misses": 0, "entries": 0})
+
+
+class TestJiraAggregatorCache(unittest.TestCase):
+    def test_buckets_share_one_mcp_call(self):
+        issue = {
+            "key": "PROJ-1",
+            "fields": {
+                "summary": "Ship it",
+                "status": {"name": "Done", "statusCategory": {"key": "done"}},
+                "priority": {"name": "High"},
+                "issuetype": {"name": "Epic"},
+            },
+        }
+        jira = JiraAggregator(cloud_id="cloud")
+        with patch.object(jira.mcp, "get_jira_issues", return_value=[issue]) as mock_get:
+            jira.get_initiatives()
+            jira.get_blockers()
+            jira.get_completed_items()
+            jira.get_in_progress_items()
+            jira.get_issues_updated_this_week()
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(jira.cache.stats()["hits"], 4)
+        self.assertEqual(
+            mock_get.call_args.kwargs["fields"],
+            ["summary", "status", "priority", "issuetype"],
+        )
+
+
+class TestGleanAggregatorCache(unittest.TestCase):
+    def test_project_insights_share_one_search(self):
+        glean = GleanAggregator()
+        result = [{"title": "Migration plan", "snippet": "", "url": ""}]
+        with patch.object(glean.mcp, "glean_search", return_value=result) as mock_search:
+            for _ in range(3):
+                self.assertEqual(glean.get_project_insights()[0]["title"], "Migration plan")
+            self.assertEqual(mock_search.call_count, 1)
+
+            glean.invalidate_project_updates(days_back=7)
+            glean.get_project_insights()
+            self.assertEqual(mock_search.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+"""Unit tests for the scheduled jobs."""
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import config
+from scheduler import WeeklyUpdateScheduler
+from section_compiler import SectionCompiler
+from weekly_doc import WeeklyDoc
+
+
+class SchedulerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        for name, value in (("CACHE_DIR", self.tmpdir.name), ("JIRA_STORE_PATH", ""), ("RESPONSE_CACHE_PATH", "")):
+            patcher = patch.object(config.Config, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.scheduler = WeeklyUpdateScheduler()
+        self.file_manager = self.scheduler.file_manager
+        self.generator = self.scheduler.content_generator
+
+
+class TestMondayJob(SchedulerTestCase):
+    def run_monday(self, sections):
+        with patch.object(self.file_manager, "should_create_new_page", return_value=True), \
+                patch.object(self.file_manager, "find_or_create_quarter_folder", return_value="folder-1"), \
+                patch.object(self.generator, "generate_sections", side_effect=sections), \
+                patch.object(self.file_manager.confluence, "create_page", return_value={"id": "42"}) as create, \
+                patch.object(self.file_manager.confluence, "update_page") as update:
+            self.scheduler.monday_job()
+        return create, update
+
+    def test_page_is_created_with_final_body_in_one_write(self):
+        create, update = self.run_monday(lambda: {"Highlights": "* Shipped A", "Next Week": "* Plan B"})
+        create.assert_called_once()
+        update.assert_not_called()
+        kwargs = create.call_args.kwargs
+        self.assertEqual(kwargs["parent_id"], "folder-1")
+        self.assertEqual(kwargs["content"], "## Highlights\n\n* Shipped A\n\n## Next Week\n\n* Plan B")
+        # The fingerprint of the created body makes an identical rewrite a no-op
+        self.assertTrue(self.file_manager.update_page_content("42", kwargs["content"], append=False)["unchanged"])
+
+    def test_generation_failure_still_creates_the_page(self):
+        create, update = self.run_monday(RuntimeError("sources down"))
+        create.assert_called_once()
+        update.assert_not_called()
+        self.assertEqual(
+            create.call_args.kwargs["content"],
+            "## Highlights\n\n## This Week\n\n## Next Week\n\n## Customer Corner\n",
+        )
+
+
+class FakePage:
+    """One Confluence page that enforces conditional writes like the real API."""
+
+    def __init__(self, body):
+        self.body, self.version, self.bodies = body, 1, [body]
+        self.deleted = False
+
+    def get_page(self, page_id):
+        return {"id": page_id, "body": self.body, "version": self.version}
+
+    def update_page(self, page_id, body, title=None, version=None):
+        if self.deleted and page_id == "7":
+            return {"id": page_id, "not_found": True}
+        if version is not None and version != self.version + 1:
+            return {"id": page_id, "conflict": True}
+        self.edit(body)
+        return {"id": page_id, "version": {"number": self.version}}
+
+    def edit(self, body):
+        self.body, self.version = body, self.version + 1
+        self.bodies.append(body)
+
+
+class TestFridayJob(SchedulerTestCase):
+    PAGE = "## This Week\n\n* PROJ-1: Search (In Progress)\n\n## This Week\n\n* Did X"
+
+    def setUp(self):
+        super().setUp()
+        self.page = FakePage(self.PAGE)
+        for name, fake in (("get_page", self.page.get_page), ("update_page", self.page.update_page)):
+            patcher = patch.object(self.file_manager.confluence, name, side_effect=fake)
+            setattr(self, name, patcher.start())
+            self.addCleanup(patcher.stop)
+        patcher = patch.object(self.file_manager, "get_or_create_current_weekly_page", return_value={"id": "7"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_job(self, job, sections):
+        with patch.object(self.generator, "generate_sections", return_value=sections):
+            job()
+
+    def test_delta_and_compile_are_written_once(self):
+        self.run_job(self.scheduler.friday_job, {"This Week": "* PROJ-1: Search (Done)\n* Did Y"})
+        self.get_page.assert_called_once()
+        self.update_page.assert_called_once()
+        # The compiled state keeps lines in the order they reached the page
+        self.assertEqual(self.page.body, "## This Week\n\n* PROJ-1: Search (Done)\n* Did X\n* Did Y")
+        # The finalized page is folded into the style profile
+        self.assertEqual(len(self.generator.style_profile.weeks()), 1)
+
+    def test_friday_reuses_state_and_page_kept_by_daily_runs(self):
+        with patch("scheduler.SectionCompiler.feed_doc", autospec=True,
+                   side_effect=SectionCompiler.feed_doc) as rebuild:
+            self.run_job(self.scheduler.daily_job, {"This Week": "* Did Y"})
+            self.run_job(self.scheduler.friday_job, {"This Week": "* Did Z"})
+        self.assertEqual(rebuild.call_count, 1)
+        # Only the first run downloaded the page; later ones merged into the mirror
+        self.get_page.assert_called_once()
+        self.assertEqual(self.page.body, "## This Week\n\n* PROJ-1: Search (In Progress)\n* Did X\n* Did Y\n* Did Z")
+
+    def test_daily_job_renders_the_page_once(self):
+        with patch("scheduler.WeeklyDoc.render", autospec=True, side_effect=WeeklyDoc.render) as render:
+            self.run_job(self.scheduler.daily_job, {"This Week": "* Did Y"})
+        render.assert_called_once()
+        # The state saved under the written body's fingerprint is reused without a rebuild
+        with patch("scheduler.SectionCompiler.feed_doc", autospec=True) as rebuild:
+            self.run_job(self.scheduler.daily_job, {"This Week": "* Did Z"})
+        rebuild.assert_not_called()
+
+    def test_deleted_page_is_looked_up_again(self):
+        self.run_job(self.scheduler.daily_job, {"This Week": "* Did Y"})
+        self.page.deleted = True
+        self.file_manager.get_or_create_current_weekly_page.side_effect = [{"id": "7"}, {"id": "8"}]
+        self.run_job(self.scheduler.daily_job, {"This Week": "* Did Z"})
+        self.assertEqual([call.args[0] for call in self.update_page.call_args_list], ["7", "7", "8"])
+        self.assertIn("* Did Z", self.page.body)
+
+    def test_page_edited_outside_the_agent_is_reread_and_rebuilt(self):
+        self.run_job(self.scheduler.daily_job, {"This Week": "* Did Y"})
+        self.page.edit("## This Week\n\n* Hand-written line")
+        self.run_job(self.scheduler.friday_job, {"This Week": "* Did Z"})
+        self.assertEqual(self.get_page.call_count, 2)
+        self.assertEqual(self.page.body, "## This Week\n\n* Hand-written line\n* Did Z")
+        self.assertEqual(self.update_page.call_count, 3)
+
+    def test_fridays_run_only_the_fused_job(self):
+        import schedule
+        schedule.clear()
+        self.addCleanup(schedule.clear)
+        self.scheduler.setup_schedule()
+        friday_jobs = [job for job in schedule.jobs if job.start_day == "friday"]
+        self.assertEqual([job.job_func.func for job in friday_jobs], [self.scheduler.friday_job])
+        self.assertFalse(any(job.unit == "days" for job in schedule.jobs))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,222 @@
+"""Unit tests for the single-pass section compiler."""
+import json
+import os
+import random
+import re
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from compiled_state import CompiledWeekStore
+from content_ledger import week_key
+from local_state import lock_path
+from section_compiler import SectionCompiler, compile_doc, compile_sections, iter_lines, simhash
+from weekly_doc import WeeklyDoc
+
+
+def reference_compile(raw_content):
+    """The original regex-per-line compile_and_dedupe_sections, kept to check equivalence."""
+    section_order = ["Highlights", "This Week", "Next Week", "Customer Corner"]
+    parts = re.split(r"\n## ", raw_content.strip())
+    sections = {name: [] for name in section_order}
+    seen = {name: set() for name in section_order}
+    for i, part in enumerate(parts):
+        part = part.strip()
+        if not part:
+            continue
+        lines = part.split("\n")
+        header = lines[0].strip()
+        if header.startswith("## "):
+            header = header[3:].strip()
+        if i == 0 and not re.match(r"^Highlights|^This Week|^Next Week|^Customer Corner", header, re.I):
+            continue
+        section_name = None
+        for name in section_order:
+            if header.lower() == name.lower():
+                section_name = name
+                break
+        if section_name is None:
+            continue
+        for line in lines[1:]:
+            line = line.strip()
+            if not line:
+                continue
+            key = re.sub(r"\s+", " ", line.lower()).strip()
+            if key and key not in seen[section_name]:
+                seen[section_name].add(key)
+                sections[section_name].append(line)
+    out = []
+    for name in section_order:
+        if sections[name]:
+            out.append("## " + name + "\n\n" + "\n".join(sections[name]))
+    return "\n\n".join(out) if out else raw_content.strip()
+
+
+class TestCompileSections(unittest.TestCase):
+    def test_repeated_sections_are_folded(self):
+        raw = (
+            "## Highlights\n\n* Shipped A\n\n## This Week\n\n* Did X\n\n"
+            "## Highlights\n\n* shipped  a\n* Shipped B\n\n## This Week\n\n* Did X\n* Did Y"
+        )
+        self.assertEqual(
+            compile_sections(raw),
+            "## Highlights\n\n* Shipped A\n* Shipped B\n\n## This Week\n\n* Did X\n* Did Y",
+        )
+
+    def test_quirks_match_original(self):
+        cases = [
+            "Highlights\n* first line header without marker",
+            "Intro text\n\n## Highlights\n* a",
+            "## Other\n* dropped\n## Next Week\n* kept",
+            "## ## Highlights\n* a",
+            "text\n## ## Highlights\n* a",
+            "## Highlights\n* a\n## ",
+            "## Highlights\n* a\n##   \n\n",
+            "## \n\nThis Week\n* header after blank lines",
+            "  \n  ## customer corner  \n  * Call\t one\n* call one",
+            "no sections at all\n",
+            "",
+        ]
+        for raw in cases:
+            with self.subTest(raw=raw):
+                self.assertEqual(compile_sections(raw, near_duplicates=False), reference_compile(raw))
+
+    def test_random_pages_match_original(self):
+        tokens = [
+            "## ", "##", "## Highlights", "## highlights ", "## This Week", "## Next Week",
+            "## Customer Corner", "## Other", "Highlights", "* a", "* A", "*  a", " * b",
+            "\t", "", "  ", "## ## Highlights", "x y", "X Y",
+        ]
+        rng = random.Random(0)
+        for _ in range(2000):
+            raw = "".join(
+                rng.choice(tokens) + rng.choice(["\n", "\n", " ", ""])
+                for _ in range(rng.randint(0, 20))
+            )
+            self.assertEqual(compile_sections(raw, near_duplicates=False), reference_compile(raw), raw)
+
+    def test_incremental_feeding_matches_whole_page(self):
+        raw = "## Highlights\n* a\n## This Week\n* b\n## Highlights\n* A\n* c"
+        compiler = SectionCompiler()
+        for line in raw.split("\n"):
+            compiler.feed_line(line)
+        self.assertEqual(compiler.render(), compile_sections(raw))
+
+
+class TestNearDuplicates(unittest.TestCase):
+    LONG = "Customer onboarding revamp rolled out to the pilot accounts in the east region with new checklist and reminders"
+    # The same words in the same order, reformatted
+    EDITED = LONG.replace("new checklist", "**new checklist**") + "."
+
+    def test_latest_issue_status_wins_in_place(self):
+        raw = (
+            "## This Week\n* PROJ-1: Search (In Progress)\n* PROJ-2: Billing (To Do)\n"
+            "## This Week\n* PROJ-1: Search (Done)\n* PROJ-3: Export (To Do)\n"
+            "## This Week\n* PROJ-2: Billing (In Progress)"
+        )
+        self.assertEqual(
+            compile_sections(raw),
+            "## This Week\n\n* PROJ-1: Search (Done)\n* PROJ-2: Billing (In Progress)\n* PROJ-3: Export (To Do)",
+        )
+
+    def test_status_flipping_back_keeps_latest(self):
+        raw = "## Highlights\n* PROJ-1: X (In Progress)\n* PROJ-1: X (Done)\n* PROJ-1: X (In Progress)"
+        self.assertEqual(compile_sections(raw), "## Highlights\n\n* PROJ-1: X (In Progress)")
+
+    def test_issue_under_different_prefixes_is_kept_apart(self):
+        raw = "## Highlights\n* Blocked: PROJ-1: X (Blocked)\n* PROJ-1: X (Blocked)\n* PROJ-1: X (Done)"
+        self.assertEqual(
+            compile_sections(raw),
+            "## Highlights\n\n* Blocked: PROJ-1: X (Blocked)\n* PROJ-1: X (Done)",
+        )
+
+    def test_generated_issue_lines_fold_by_key(self):
+        raw = (
+            "## This Week\n* Team roadmap\n* **Search revamp** (PROJ-1) - In Progress\n"
+            "## This Week\n* Team roadmap\n* **Search revamp** (PROJ-1) - Done\n* **Export** (PROJ-2) - To Do"
+        )
+        self.assertEqual(
+            compile_sections(raw),
+            "## This Week\n\n* Team roadmap\n* **Search revamp** (PROJ-1) - Done\n* **Export** (PROJ-2) - To Do",
+        )
+
+    def test_near_duplicate_lines_are_folded(self):
+        self.assertLessEqual(bin(simhash(self.LONG.lower()) ^ simhash(self.EDITED.lower())).count("1"), 3)
+        raw = f"## This Week\n* {self.LONG}\n* Short item\n## This Week\n* {self.EDITED}"
+        self.assertEqual(compile_sections(raw), f"## This Week\n\n* {self.EDITED}\n* Short item")
+
+    def test_reordered_words_are_distinct_lines(self):
+        first = "Blocked on infra team waiting for design review sign off from the platform group"
+        second = "Blocked on design review waiting for infra team sign off from the platform group"
+        raw = f"## This Week\n* {first}\n* {second}"
+        self.assertEqual(compile_sections(raw), f"## This Week\n\n* {first}\n* {second}")
+        self.assertEqual(compile_sections("## This Week\n\n* Blocked on infra team waiting for design review sign off\n"
+                                          "* Blocked on design review waiting for infra team sign off").count("\n* "), 2)
+
+    def test_distinct_lines_survive(self):
+        raw = "## This Week\n" + "\n".join(
+            f"* Item {i} covers topic{i} with owner{i} and milestone{i} for team{i} in region{i}"
+            for i in range(500)
+        )
+        self.assertEqual(compile_sections(raw).count("\n* Item"), 500)
+        self.assertIsNone(simhash("too short to fingerprint"))
+
+
+class TestIncrementalState(unittest.TestCase):
+    LONG = TestNearDuplicates.LONG
+
+    def test_state_round_trips_through_json(self):
+        page = f"## Highlights\n* A\n## This Week\n* PROJ-1: X (To Do)\n* {self.LONG}\n## Highlights\n* a"
+        compiler = SectionCompiler().feed_text(page)
+        restored = SectionCompiler.from_state(json.loads(json.dumps(compiler.to_state())))
+        self.assertEqual(restored.render(), compiler.render())
+        # Indexes are rebuilt, so later lines still fold into the restored state
+        restored.apply([
+            ("This Week", "* PROJ-1: X (Done)", True),
+            ("This Week", "* " + TestNearDuplicates.EDITED, True),
+        ])
+        compiler.feed_text("## This Week\n* PROJ-1: X (Done)\n* " + TestNearDuplicates.EDITED)
+        self.assertEqual(restored.render().count(TestNearDuplicates.EDITED), 1)
+        self.assertNotIn(self.LONG, restored.render())
+        self.assertEqual(restored.render(), compiler.render())
+
+    def test_applied_changes_match_full_compile(self):
+        doc = WeeklyDoc.parse("## Highlights\n\n* A\n\n## Customer Corner\n\nNo customer calls this week.")
+        compiler = SectionCompiler().feed_doc(doc)
+        for day in range(3):
+            changes = []
+            doc.merge({
+                "Highlights": WeeklyDoc.parse(f"## Highlights\n* A\n* B{day}").section("Highlights"),
+                "Customer Corner": WeeklyDoc.parse(f"## Customer Corner\n* Call {day}").section("Customer Corner"),
+            }, changes=changes)
+            compiler.apply(changes)
+        self.assertEqual(compiler.to_doc().render(), compile_doc(doc).render())
+        self.assertNotIn("No customer calls", compiler.render())
+
+
+class TestIterLines(unittest.TestCase):
+    def test_chunked_split_matches_str_split(self):
+        text = "a\n\nbb\nccc\n" * 50 + "tail"
+        for chunk_size in (1, 3, 7, 64, 1 << 20):
+            self.assertEqual(list(iter_lines(text, chunk_size)), text.split("\n"))
+        self.assertEqual(list(iter_lines("")), [""])
+        self.assertEqual(list(iter_lines("x\n", 1)), ["x", ""])
+
+
+class TestCompiledWeekStore(unittest.TestCase):
+    def test_old_weeks_are_pruned_but_lock_sidecars_are_kept(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = CompiledWeekStore(directory)
+            old, now = datetime(2026, 1, 2), datetime(2026, 1, 2) + timedelta(weeks=52)
+            store.save(old, SectionCompiler(), "a")
+            old_path = os.path.join(directory, f"{week_key(old)}.json")
+            self.assertTrue(os.path.exists(old_path))
+            store.save(now, SectionCompiler(), "b")
+            self.assertFalse(os.path.exists(old_path))
+            # Another process may be waiting on the old week's lock file
+            self.assertTrue(os.path.exists(lock_path(old_path)))
+            self.assertIsNotNone(store.load(now, "b"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+"""Unit tests for the persisted style profile."""
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import config
+from style_profile import StyleProfile
+from tone_analyzer import ToneAnalyzer
+
+FRIDAY = datetime(2026, 2, 13)
+
+
+class TestStyleProfile(unittest.TestCase):
+    PAGE = (
+        "## Highlights\n\n* We shipped the billing flow. The team is crushing it\n"
+        "* Billing flow: live for all accounts\n\n## This Week\n\n* tbh the billing flow is huge"
+    )
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        patcher = patch.object(config.Config, "CACHE_DIR", self.tmpdir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_one_week_matches_full_analysis(self):
+        summary = StyleProfile().fold(FRIDAY, self.PAGE)
+        expected = ToneAnalyzer().analyze_documents([self.PAGE])
+        self.assertEqual({tuple(pair) for pair in summary["common_phrases"]}, set(expected["common_phrases"]))
+        self.assertEqual(set(summary["enthusiasm_markers"]), set(expected["enthusiasm_markers"]))
+        self.assertEqual(set(summary["sentence_patterns"]), set(expected["sentence_patterns"]))
+        self.assertEqual(set(summary["casual_expressions"]), set(expected["casual_expressions"]))
+
+    def test_counts_add_up_across_weeks_and_refolding_replaces(self):
+        profile = StyleProfile()
+        profile.fold(FRIDAY, "billing flow")
+        profile.fold(FRIDAY + timedelta(weeks=1), "billing flow again")
+        self.assertIn(["billing flow", 2], profile.fold(FRIDAY + timedelta(weeks=1), "billing flow")["common_phrases"])
+        self.assertEqual(len(profile.weeks()), 2)
+
+    def test_only_the_last_weeks_are_kept(self):
+        profile = StyleProfile()
+        with patch.object(config.Config, "PAST_DOCUMENTS_TO_ANALYZE", 3):
+            for week in range(6):
+                summary = profile.fold(FRIDAY + timedelta(weeks=week), f"* phrase{week} here")
+        self.assertEqual(profile.weeks(), ["2026-03-06", "2026-03-13", "2026-03-20"])
+        self.assertNotIn(["phrase0 here", 1], summary["common_phrases"])
+        self.assertIn(["phrase5 here", 1], summary["common_phrases"])
+
+    def test_loading_does_no_analysis(self):
+        StyleProfile().fold(FRIDAY, self.PAGE)
+        analyzer = ToneAnalyzer()
+        with patch.object(ToneAnalyzer, "document_stats") as analyze:
+            analyzer.load_style(StyleProfile().summary())
+        analyze.assert_not_called()
+        self.assertIn("crushing it", analyzer.enthusiasm_markers)
+        self.assertIn(("the billing", 2), analyzer.common_phrases)
+
+
+if __name__ == "__main__":
+    unittest.main()
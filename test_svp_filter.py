@@ -0,0 +1,153 @@
+"""Unit tests for SVP relevance rules and batch scoring."""
+import json
+import os
+import random
+import tempfile
+import unittest
+
+from svp_filter import SVPFilter
+from svp_rules import compile_rules
+
+
+def random_items(source, count, seed=0):
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        if source == "jira":
+            items.append({"fields": {
+                "summary": rng.choice(["Revenue report", "Fix typo", "Churn dashboard", "Docs"]),
+                "status": {"name": rng.choice(["To Do", "Blocked", "In Progress"])},
+                "priority": rng.choice([None, {"name": "Highest"}, {"name": "High"}, {"name": "Low"}]),
+                "issuetype": {"name": rng.choice(["Task", "Epic", "Initiative", "Bug"])},
+            }})
+        elif source == "glean":
+            items.append({
+                "title": rng.choice(["Critical outage", "Customer escalation", "Team lunch", "Customer call"]),
+                "snippet": rng.choice(["", "customer complaint about billing", "notes"]),
+            })
+        else:
+            items.append({"name": rng.choice(["Feature adoption", "Logins"]),
+                          "change_percent": rng.uniform(-80, 80)})
+    return items
+
+
+HIGH_PRIORITY = {"strategic", "cross-functional", "escalation", "blocker", "critical",
+                 "performance", "revenue", "churn", "retention", "migration", "customer"}
+
+
+def legacy_rules(item, source):
+    """The (score, relevant) rules SVPFilter hard-coded before svp_rules.json."""
+    if source == "jira":
+        fields = item.get("fields", {})
+        priority = (fields.get("priority") or {}).get("name", "")
+        status = fields["status"]["name"].lower()
+        issue_type = fields["issuetype"]["name"]
+        score = {"Highest": 10, "High": 5}.get(priority, 0) + 8 * ("blocked" in status) + \
+            3 * (issue_type in ("Initiative", "Epic"))
+        relevant = priority in ("Highest", "High") or "blocked" in status or issue_type in ("Initiative", "Epic") \
+            or any(word in fields["summary"].lower() for word in HIGH_PRIORITY)
+        return score, relevant
+    if source == "glean":
+        title = item.get("title", "").lower()
+        content = f"{title} {item.get('snippet', '').lower()}"
+        score = 10 * ("escalation" in title or "critical" in title) + 5 * ("customer" in title)
+        return score, any(word in content for word in HIGH_PRIORITY | {"customer complaint"})
+    if source == "pendo":
+        change = abs(item.get("change_percent", 0))
+        score = 10 if change > 50 else 5 if change > 20 else 0
+        return score, change > 20 or "adoption" in item.get("name", "").lower()
+    return 0, False
+
+
+class TestBatchScoring(unittest.TestCase):
+    def assert_matches_per_item_rules(self, svp):
+        for source in ("jira", "glean", "pendo", "other"):
+            items = random_items(source, 300, seed=len(source))
+            with self.subTest(source=source):
+                scores, relevant = svp.score_batch(items, source)
+                self.assertEqual([int(score) for score in scores],
+                                 [svp._calculate_relevance_score(item, source) for item in items])
+                self.assertEqual([bool(keep) for keep in relevant],
+                                 [svp.is_svp_relevant(item, source) for item in items])
+                expected = sorted(range(len(items)), key=lambda i: svp._calculate_relevance_score(items[i], source),
+                                  reverse=True)
+                self.assertEqual(svp.rank_batch(items, source), expected)
+
+    def test_batch_matches_per_item_rules(self):
+        self.assert_matches_per_item_rules(SVPFilter())
+
+    def test_rules_file_preserves_the_hard_coded_rules(self):
+        svp = SVPFilter()
+        for source in ("jira", "glean", "pendo", "other"):
+            items = random_items(source, 300, seed=len(source))
+            with self.subTest(source=source):
+                self.assertEqual([(svp._calculate_relevance_score(item, source), svp.is_svp_relevant(item, source))
+                                  for item in items],
+                                 [legacy_rules(item, source) for item in items])
+
+    def test_prioritize_and_filter_use_the_batch(self):
+        svp = SVPFilter()
+        items = [{"title": "Team lunch"}, {"title": "Critical bug"}, {"title": "Customer call"}, {"title": "Critical"}]
+        self.assertEqual([item["title"] for item in svp.prioritize_items(items, "glean")],
+                         ["Critical bug", "Critical", "Customer call", "Team lunch"])
+        self.assertEqual(svp.filter_for_highlights(items, "glean"), items[1:])
+        self.assertEqual(svp.prioritize_items([], "jira"), [])
+
+
+class TestCompiledRules(unittest.TestCase):
+    SPEC = {
+        "vocabularies": {"urgent": ["outage", "Sev1"]},
+        "sources": {"alerts": {
+            "fields": {
+                "title": {"path": "title"},
+                "team": {"path": "owner.team"},
+                "delta": {"path": "stats.delta", "default": 0},
+            },
+            "relevant_if_any": [
+                {"field": "title", "keywords": ["@urgent", "down"], "word_boundaries": True},
+                {"field": "team", "in": ["core"]},
+            ],
+            "score": [
+                {"field": "delta", "abs_tiers": [[50, 10], [20, 5]]},
+                {"field": "title", "keywords": ["@urgent"], "word_boundaries": True, "weight": 7},
+                {"field": "team", "map": {"core": 2}},
+            ],
+        }},
+    }
+
+    def test_custom_rules(self):
+        rules = compile_rules(self.SPEC)["alerts"]
+        # Both keyword rules on the title share one matcher
+        self.assertEqual(list(rules.matchers), [("title", True)])
+        cases = [
+            ({"title": "SEV1 outage", "stats": {"delta": -60}}, (17, True)),
+            ({"title": "Downtime report", "owner": {"team": "core"}, "stats": {"delta": 50}}, (7, True)),
+            ({"title": "API down", "stats": {"delta": 21}}, (5, True)),
+            ({"title": "Weekly sync", "owner": None, "stats": {"delta": None}}, (0, False)),
+        ]
+        for item, expected in cases:
+            with self.subTest(item=item):
+                self.assertEqual(rules.evaluate(rules.extract(item)), expected)
+        scores, relevant = rules.evaluate_batch([item for item, _ in cases])
+        self.assertEqual([(int(score), bool(keep)) for score, keep in zip(scores, relevant)],
+                         [expected for _, expected in cases])
+
+    def test_rules_path_is_configurable(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "rules.json")
+            with open(path, "w") as f:
+                json.dump(self.SPEC, f)
+            svp = SVPFilter(rules_path=path)
+        self.assertTrue(svp.is_svp_relevant({"title": "outage"}, "alerts"))
+        self.assertFalse(svp.is_svp_relevant({"title": "outage"}, "jira"))
+        self.assertEqual(svp.score_batch([{"title": "outage"}], "jira"), ([0], [False]))
+
+    def test_unsupported_rule_is_rejected(self):
+        spec = {"sources": {"x": {"fields": {"a": {"path": "a"}},
+                                  "relevant_if_any": [{"field": "a", "regex": ".*"}]}}}
+        with self.assertRaises(ValueError):
+            compile_rules(spec)
+
+
+if __name__ == "__main__":
+    unittest.main()
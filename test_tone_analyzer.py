@@ -0,0 +1,81 @@
+"""Unit tests for streaming tone analysis and the Space-Saving counter."""
+import random
+import unittest
+from collections import Counter
+from unittest.mock import patch
+
+import config
+from tone_analyzer import ToneAnalyzer
+from top_k import SpaceSaving
+
+
+def reference_phrases(documents):
+    """The original list-of-every-n-gram phrase count over the joined corpus."""
+    words = " ".join(documents).lower().split()
+    phrases = []
+    for i in range(len(words) - 1):
+        phrases.append(f"{words[i]} {words[i+1]}")
+        if i < len(words) - 2:
+            phrases.append(f"{words[i]} {words[i+1]} {words[i+2]}")
+            if i < len(words) - 3:
+                phrases.append(f"{words[i]} {words[i+1]} {words[i+2]} {words[i+3]}")
+    return Counter(phrases)
+
+
+class TestSpaceSaving(unittest.TestCase):
+    def test_exact_below_capacity(self):
+        rng = random.Random(3)
+        items = [rng.choice("abcdefghij") for _ in range(2000)]
+        summary = SpaceSaving(10).update(items)
+        self.assertEqual(summary.most_common(4), Counter(items).most_common(4))
+        self.assertEqual(summary.error("a"), 0)
+
+    def test_memory_is_bounded_and_heavy_hitters_survive(self):
+        rng = random.Random(5)
+        stream = []
+        for i in range(20000):
+            stream.append("hot" if i % 4 == 0 else f"cold{rng.randrange(10**6)}")
+        summary = SpaceSaving(50).update(stream)
+        self.assertEqual(len(summary), 50)
+        item, count = summary.most_common(1)[0]
+        self.assertEqual(item, "hot")
+        # Counts never underestimate and overestimate by at most the recorded error
+        self.assertLessEqual(count - summary.error(item), 5000)
+        self.assertGreaterEqual(count, 5000)
+
+
+class TestAnalyzeDocuments(unittest.TestCase):
+    DOCS = [
+        "We shipped the new billing flow. Super",
+        "psyched about it! The team is crushing it and we're gonna keep going.",
+        "",
+        "* Shipped the new billing flow to all accounts\n* The team is crushing it",
+        "IMO the new billing flow is huge: tbh we nailed it",
+    ]
+
+    def test_matches_joined_corpus_results(self):
+        result = ToneAnalyzer().analyze_documents(self.DOCS)
+        self.assertEqual(set(result["common_phrases"]), set(reference_phrases(self.DOCS).most_common(50)))
+        # "super psyched" only appears across a document boundary
+        self.assertIn("super psyched", result["enthusiasm_markers"])
+        self.assertEqual(set(result["casual_expressions"]), {"imo", "tbh", "we're", "gonna"})
+
+    def test_random_corpora_match_exact_counts(self):
+        rng = random.Random(11)
+        vocabulary = [f"w{i}" for i in range(12)]
+        for _ in range(20):
+            docs = [" ".join(rng.choice(vocabulary) for _ in range(rng.randint(0, 30)))
+                    for _ in range(rng.randint(1, 6))]
+            with self.subTest(docs=docs):
+                phrases = ToneAnalyzer()._extract_phrases(docs)
+                self.assertEqual(set(phrases.most_common(50)), set(reference_phrases(docs).most_common(50)))
+
+    def test_phrase_memory_is_capped(self):
+        docs = [" ".join(f"word{i}" for i in range(start, start + 200)) for start in range(0, 20000, 200)]
+        with patch.object(config.Config, "TONE_PHRASE_CAPACITY", 500):
+            phrases = ToneAnalyzer()._extract_phrases(docs)
+        self.assertEqual(len(phrases), 500)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""Unit tests for the weekly page document model."""
+import unittest
+
+from section_compiler import compile_doc, compile_sections
+from weekly_doc import Section, WeeklyDoc, item_id
+
+
+class TestWeeklyDoc(unittest.TestCase):
+    PAGES = [
+        "",
+        "\n",
+        "Intro line\n\n## Highlights\n\n* A\n\n* B\n",
+        "## This Week\n\n* Project X\n    * did 1\n\n    * did 2\n* Project Y\n  \n\n## Other\ntext",
+        "  indented first line\n## Customer Corner\n\nAcme call\n\nhttps://example.com",
+        "## Highlights\n## Highlights\n\n\n",
+    ]
+
+    def test_parse_render_round_trips(self):
+        for page in self.PAGES:
+            with self.subTest(page=page):
+                self.assertEqual(WeeklyDoc.parse(page).render(), page)
+
+    def test_structure(self):
+        doc = WeeklyDoc.parse(self.PAGES[3])
+        this_week = doc.section("This Week")
+        self.assertEqual([b.text for b in this_week.bullets], ["* Project X", "* Project Y"])
+        self.assertEqual([c.text for c in this_week.bullets[0].children], ["    * did 1", "    * did 2"])
+        self.assertIsNone(doc.sections[-1].name)
+        self.assertEqual(doc.sections[-1].header, "## Other")
+
+    def test_ids_are_stable_and_section_scoped(self):
+        section = Section.from_body("Highlights", "* Shipped  A")
+        bullet = section.bullets[0]
+        self.assertEqual(bullet.key, "shipped a")
+        self.assertEqual(section.id_of(bullet), item_id("Highlights", "shipped a"))
+        self.assertNotEqual(section.id_of(bullet), item_id("This Week", "shipped a"))
+        self.assertEqual(bullet.digest, Section.from_body("Highlights", "- shipped a").bullets[0].digest)
+
+    def test_skeleton_matches_new_page_layout(self):
+        self.assertEqual(
+            WeeklyDoc.skeleton().render(),
+            "## Highlights\n\n## This Week\n\n## Next Week\n\n## Customer Corner\n",
+        )
+
+    def test_merge_reports_added_lines(self):
+        doc = WeeklyDoc.parse("## Highlights\n\n* A\n\n## Next Week\n\n* plan")
+        added = doc.merge({
+            "Highlights": Section.from_body("Highlights", "* A\n* B"),
+            "This Week": Section.from_body("This Week", "* X\n    * x1"),
+        })
+        self.assertEqual(added, 3)
+        self.assertEqual(
+            doc.render(),
+            "## Highlights\n\n* A\n* B\n\n## This Week\n\n* X\n    * x1\n\n## Next Week\n\n* plan",
+        )
+        self.assertEqual(doc.merge({"Highlights": Section.from_body("Highlights", "* b")}), 0)
+
+    def test_merge_records_changes(self):
+        doc = WeeklyDoc.parse("## This Week\n\n* P\n\n## Customer Corner\n\nNo customer calls this week.")
+        changes = []
+        doc.merge({
+            "This Week": Section.from_body("This Week", "* P\n    * p1\n* Q"),
+            "Customer Corner": Section.from_body("Customer Corner", "* Acme call"),
+        }, changes=changes)
+        self.assertEqual(changes, [
+            ("This Week", "    * p1", True),
+            ("This Week", "* Q", True),
+            ("Customer Corner", "No customer calls this week.", False),
+            ("Customer Corner", "* Acme call", True),
+        ])
+
+    def test_compile_doc_matches_text_compiler(self):
+        page = (
+            "## Highlights\n\n* A\n\n## This Week\n* PROJ-1: X (In Progress)\n    * note\n\n"
+            "## Highlights\n* a\n* B\n## This Week\n* PROJ-1: X (Done)"
+        )
+        self.assertEqual(compile_doc(WeeklyDoc.parse(page)).render(), compile_sections(page))
+
+
+if __name__ == "__main__":
+    unittest.main()
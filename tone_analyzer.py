@@ -1,11 +1,26 @@
 """Tone analysis and style learning from past weekly documents."""
-from typing import List, Dict, Any, Set
+from typing import List, Dict, Any, Iterable, Iterator, Set
 import re
 from collections import Counter
+from keyword_matcher import KeywordMatcher
+from top_k import SpaceSaving
+import config
 
 class ToneAnalyzer:
     """Analyzes past documents to learn writing style and tone."""
     
+    # Vocabularies compiled once, each matched in a single pass per text
+    ENTHUSIASM_MARKERS = KeywordMatcher({
+        "super psyched", "crushing it", "lfg", "killing the game",
+        "huge", "awesome", "excited", "pumped", "psyched",
+        "crushed", "killed", "nailed", "rocked"
+    })
+    CASUAL_EXPRESSIONS = KeywordMatcher({
+        "imo", "tbh", "fwiw", "ngl", "tbf",
+        "don't", "won't", "can't", "it's", "we're", "they're",
+        "gonna", "wanna", "gotta"
+    })
+    
     def __init__(self):
         """Initialize the tone analyzer."""
         self.common_phrases: Set[str] = set()
@@ -14,22 +29,29 @@ class ToneAnalyzer:
         self.casual_expressions: Set[str] = set()
     
     def analyze_documents(self, documents: List[str]) -> Dict[str, Any]:
-        """Analyze a collection of past documents to learn tone and style."""
-        all_text = " ".join(documents)
+        """Analyze a collection of past documents to learn tone and style.
         
+        The documents are read one at a time as if joined with spaces, without
+        building the joined text, and phrases are counted in a bounded
+        Space-Saving summary, so memory stays flat however large the archive.
+        """
         # Extract common phrases (2-4 word phrases)
-        phrases = self._extract_phrases(all_text)
+        phrases = self._extract_phrases(documents)
         self.common_phrases = set(phrases.most_common(50))
         
         # Identify enthusiasm markers
-        self.enthusiasm_markers = self._extract_enthusiasm_markers(all_text)
+        self.enthusiasm_markers = self._extract_enthusiasm_markers(documents)
         
         # Extract sentence patterns
         self.sentence_patterns = self._extract_sentence_patterns(documents)
         
         # Identify casual expressions
-        self.casual_expressions = self._extract_casual_expressions(all_text)
+        self.casual_expressions = self._extract_casual_expressions(documents)
         
+        return self.style()
+    
+    def style(self) -> Dict[str, Any]:
+        """Return the learned style in the shape analyze_documents() returns it."""
         return {
             "common_phrases": list(self.common_phrases),
             "enthusiasm_markers": list(self.enthusiasm_markers),
@@ -37,43 +59,79 @@ class ToneAnalyzer:
             "casual_expressions": list(self.casual_expressions)
         }
     
-    def _extract_phrases(self, text: str) -> Counter:
-        """Extract common 2-4 word phrases."""
-        words = text.lower().split()
-        phrases = []
-        
-        for i in range(len(words) - 1):
-            # 2-word phrases
-            phrases.append(f"{words[i]} {words[i+1]}")
-            if i < len(words) - 2:
-                # 3-word phrases
-                phrases.append(f"{words[i]} {words[i+1]} {words[i+2]}")
-                if i < len(words) - 3:
-                    # 4-word phrases
-                    phrases.append(f"{words[i]} {words[i+1]} {words[i+2]} {words[i+3]}")
-        
-        return Counter(phrases)
-    
-    def _extract_enthusiasm_markers(self, text: str) -> Set[str]:
-        """Extract enthusiasm markers from text."""
-        markers = {
-            "super psyched", "crushing it", "lfg", "killing the game",
-            "huge", "awesome", "excited", "pumped", "psyched",
-            "crushed", "killed", "nailed", "rocked"
+    def load_style(self, style: Dict[str, Any]) -> None:
+        """Adopt a style learned earlier (e.g. a StyleProfile summary) without re-reading past documents."""
+        self.common_phrases = {tuple(pair) for pair in style.get("common_phrases", [])}
+        self.enthusiasm_markers = set(style.get("enthusiasm_markers", []))
+        self.sentence_patterns = list(style.get("sentence_patterns", []))
+        self.casual_expressions = set(style.get("casual_expressions", []))
+    
+    def document_stats(self, document: str) -> Dict[str, Any]:
+        """Return one document's raw, JSON-serializable style counts for folding into a StyleProfile."""
+        documents = [document]
+        return {
+            "phrases": [[phrase, count] for phrase, count in self._extract_phrases(documents).items()],
+            "enthusiasm_markers": sorted(self._extract_enthusiasm_markers(documents)),
+            "sentence_patterns": dict(self._count_sentence_patterns(documents)),
+            "casual_expressions": sorted(self._extract_casual_expressions(documents)),
         }
+    
+    def _extract_phrases(self, documents: Iterable[str]) -> SpaceSaving:
+        """Count common 2-4 word phrases, reading one document at a time.
+        
+        Phrases run across document boundaries, and are counted in the same
+        order as before, so the result matches an exact count while the corpus
+        has at most Config.TONE_PHRASE_CAPACITY distinct phrases.
+        """
+        phrases = SpaceSaving(config.Config.TONE_PHRASE_CAPACITY)
+        # The last three words of the text so far start phrases that end in the next document
+        carry: List[str] = []
+        for doc in documents:
+            words = carry + doc.lower().split()
+            phrases.update(self._phrases_starting_in(words, len(words) - 3))
+            carry = words[-3:]
+        phrases.update(self._phrases_starting_in(carry, len(carry)))
         
-        found_markers = set()
-        text_lower = text.lower()
-        
-        for marker in markers:
-            if marker in text_lower:
-                found_markers.add(marker)
-        
-        return found_markers
+        return phrases
+    
+    @staticmethod
+    def _phrases_starting_in(words: List[str], starts: int) -> Iterator[str]:
+        """Yield the 2-, 3- and 4-word phrases starting at each of the first starts words, in order."""
+        for i in range(max(starts, 0)):
+            if i + 1 < len(words):
+                yield f"{words[i]} {words[i+1]}"
+                if i + 2 < len(words):
+                    yield f"{words[i]} {words[i+1]} {words[i+2]}"
+                    if i + 3 < len(words):
+                        yield f"{words[i]} {words[i+1]} {words[i+2]} {words[i+3]}"
+    
+    @staticmethod
+    def _find_expressions(documents: Iterable[str], matcher: KeywordMatcher) -> Set[str]:
+        """Return the expressions found in the lower-cased documents joined with spaces.
+        
+        Each document is scanned once, together with the tail of the text
+        before it, so a match spanning a document boundary is still found.
+        """
+        overlap = max(len(expr) for expr in matcher.keywords) - 1
+        found = set()
+        tail = None
+        for doc in documents:
+            text = doc.lower() if tail is None else tail + " " + doc.lower()
+            found |= matcher.find_all(text)
+            tail = text[-overlap:] if overlap else ""
+        return found
+    
+    def _extract_enthusiasm_markers(self, documents: Iterable[str]) -> Set[str]:
+        """Extract enthusiasm markers from documents."""
+        return self._find_expressions(documents, self.ENTHUSIASM_MARKERS)
     
     def _extract_sentence_patterns(self, documents: List[str]) -> List[str]:
         """Extract common sentence structure patterns."""
-        patterns = []
+        return list(set(self._count_sentence_patterns(documents)))
+    
+    def _count_sentence_patterns(self, documents: Iterable[str]) -> Counter:
+        """Count how many sentences follow each structure pattern."""
+        patterns = Counter()
         
         for doc in documents:
             sentences = re.split(r'[.!?]+', doc)
@@ -82,30 +140,17 @@ class ToneAnalyzer:
                 if len(sentence) > 10 and len(sentence) < 200:
                     # Extract pattern (simplified - look for common structures)
                     if sentence.startswith("*"):
-                        patterns.append("bullet_point")
+                        patterns["bullet_point"] += 1
                     elif ":" in sentence and sentence.count(":") == 1:
-                        patterns.append("colon_separated")
+                        patterns["colon_separated"] += 1
                     elif sentence.startswith(("I", "We", "The", "This")):
-                        patterns.append("subject_start")
+                        patterns["subject_start"] += 1
         
-        return list(set(patterns))
+        return patterns
     
-    def _extract_casual_expressions(self, text: str) -> Set[str]:
+    def _extract_casual_expressions(self, documents: Iterable[str]) -> Set[str]:
         """Extract casual expressions and contractions."""
-        casual = {
-            "imo", "tbh", "fwiw", "imo", "ngl", "tbf",
-            "don't", "won't", "can't", "it's", "we're", "they're",
-            "gonna", "wanna", "gotta"
-        }
-        
-        found = set()
-        text_lower = text.lower()
-        
-        for expr in casual:
-            if expr in text_lower:
-                found.add(expr)
-        
-        return found
+        return self._find_expressions(documents, self.CASUAL_EXPRESSIONS)
     
     def apply_tone(self, content: str, section_type: str) -> str:
         """Apply learned tone to content based on section type."""
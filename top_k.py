@@ -0,0 +1,87 @@
+"""Bounded-memory approximate top-k counting (Space-Saving)."""
+import heapq
+from typing import Dict, Hashable, Iterable, Iterator, List, Tuple
+
+
+class SpaceSaving:
+    """Approximate heavy-hitter counts over a stream, in memory bounded by capacity.
+
+    At most capacity items are tracked. When a new item arrives and the
+    summary is full, an item with the lowest count is evicted and the new
+    one inherits that count plus one, so counts never underestimate and
+    overestimate by at most the evicted count (kept as the item's error).
+    While no more than capacity distinct items have been seen, counts are
+    exact and most_common() matches collections.Counter, ties included.
+    Items are grouped in buckets by count, so counting an item and finding
+    the lowest count are both O(1).
+    """
+
+    def __init__(self, capacity: int):
+        """Track at most capacity distinct items."""
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        # Item -> [count, error, arrival order]
+        self._entries: Dict[Hashable, List[int]] = {}
+        # Count -> items with that count
+        self._buckets: Dict[int, Dict[Hashable, None]] = {}
+        self._min_count = 0
+        self._arrivals = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, item: Hashable) -> None:
+        """Count one occurrence of an item."""
+        buckets = self._buckets
+        entry = self._entries.get(item)
+        if entry is not None:
+            count = entry[0]
+            entry[0] = count + 1
+            bucket = buckets[count]
+            del bucket[item]
+            if not bucket:
+                del buckets[count]
+                if count == self._min_count:
+                    self._min_count = count + 1
+        else:
+            self._arrivals += 1
+            if len(self._entries) < self.capacity:
+                count = 0
+                self._min_count = 1
+            else:
+                # Replace an item with the lowest count
+                count = self._min_count
+                bucket = buckets[count]
+                del self._entries[bucket.popitem()[0]]
+                if not bucket:
+                    del buckets[count]
+                    self._min_count = count + 1
+            self._entries[item] = [count + 1, count, self._arrivals]
+        bucket = buckets.get(count + 1)
+        if bucket is None:
+            buckets[count + 1] = {item: None}
+        else:
+            bucket[item] = None
+
+    def update(self, items: Iterable[Hashable]) -> "SpaceSaving":
+        """Count every item of an iterable; returns self for chaining."""
+        add = self.add
+        for item in items:
+            add(item)
+        return self
+
+    def items(self) -> Iterator[Tuple[Hashable, int]]:
+        """Yield (item, count) for every tracked item in arrival order."""
+        for item, entry in self._entries.items():
+            yield item, entry[0]
+
+    def error(self, item: Hashable) -> int:
+        """Return how much an item's count may overstate its true count (0 if untracked)."""
+        entry = self._entries.get(item)
+        return entry[1] if entry else 0
+
+    def most_common(self, n: int) -> List[Tuple[Hashable, int]]:
+        """Return the n items with the highest counts, earliest arrival first among ties."""
+        top = heapq.nsmallest(n, self._entries.items(), key=lambda pair: (-pair[1][0], pair[1][2]))
+        return [(item, entry[0]) for item, entry in top]
@@ -0,0 +1,292 @@
+"""In-memory model of a weekly update page: WeeklyDoc -> Section -> Bullet."""
+import re
+from hashlib import blake2b
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+SECTION_ORDER = ["Highlights", "This Week", "Next Week", "Customer Corner"]
+NO_CUSTOMER_CALLS = "No customer calls this week."
+
+_BULLET_PREFIX = re.compile(r"^[*+-]\s+")
+_WHITESPACE = re.compile(r"\s+")
+# (section name, line text, added) recorded by merge(); added False means the line was removed
+Change = Tuple[Optional[str], str, bool]
+# Lower-cased header text -> canonical section name
+_SECTION_BY_HEADER = {name.lower(): name for name in SECTION_ORDER}
+
+
+def bullet_key(line: str) -> str:
+    """Normalize a line for duplicate checks (case, whitespace and bullet marker insensitive)."""
+    return _WHITESPACE.sub(" ", _BULLET_PREFIX.sub("", line.strip()).lower()).strip()
+
+
+def item_id(section: Optional[str], key: str) -> str:
+    """Return the stable 64-bit hex id of a normalized line within a section."""
+    return blake2b(f"{section or ''}\0{key}".encode("utf-8"), digest_size=8).hexdigest()
+
+
+class Bullet:
+    """One non-blank page line with the indented lines under it.
+
+    text is the line exactly as it appears on the page and gap holds the
+    blank lines right before it, so parsing and rendering a page round-trips
+    it unchanged. Children are the indented lines that follow a top-level
+    line (deeper nesting stays in their text).
+    """
+
+    __slots__ = ("text", "gap", "children", "_key")
+
+    def __init__(self, text: str, gap: Optional[List[str]] = None, children: Optional[List["Bullet"]] = None):
+        self.text = text
+        self.gap = gap or []
+        self.children = children or []
+        self._key: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        """Normalized text used to spot the same item across runs."""
+        if self._key is None:
+            self._key = bullet_key(self.text)
+        return self._key
+
+    @property
+    def digest(self) -> str:
+        """Stable 64-bit hex digest of the normalized text."""
+        return blake2b(self.key.encode("utf-8"), digest_size=8).hexdigest()
+
+    def lines(self) -> Iterator[str]:
+        """Yield the page lines of this bullet and its children."""
+        yield from self.gap
+        yield self.text
+        for child in self.children:
+            yield from child.gap
+            yield child.text
+
+
+class Section:
+    """A "## " header and the bullets under it (header None for text before the first header)."""
+
+    __slots__ = ("name", "header", "bullets", "trailing")
+
+    def __init__(self, name: Optional[str], header: Optional[str] = None):
+        self.name = name
+        self.header = header if header is not None or name is None else f"## {name}"
+        self.bullets: List[Bullet] = []
+        # Blank lines after the last bullet
+        self.trailing: List[str] = []
+
+    @classmethod
+    def parse(cls, name: Optional[str], lines: List[str], header: Optional[str] = None) -> "Section":
+        """Build a section from its body lines; an indented line belongs to the bullet above it."""
+        section = cls(name, header)
+        gap: List[str] = []
+        for line in lines:
+            if not line.strip():
+                gap.append(line)
+                continue
+            if line[0].isspace() and section.bullets:
+                section.bullets[-1].children.append(Bullet(line, gap))
+            else:
+                section.bullets.append(Bullet(line, gap))
+            gap = []
+        section.trailing = gap
+        return section
+
+    @classmethod
+    def from_body(cls, name: str, body: str) -> "Section":
+        """Build a section from generated markdown body text."""
+        return cls.parse(name, body.split("\n"))
+
+    def id_of(self, bullet: Bullet) -> str:
+        """Return a bullet's id: stable across runs for the same item in this section."""
+        return item_id(self.name, bullet.key)
+
+    def iter_bullets(self) -> Iterator[Bullet]:
+        """Yield every bullet, children right after their parent."""
+        for bullet in self.bullets:
+            yield bullet
+            yield from bullet.children
+
+    def has_content(self) -> bool:
+        """Return True if the section holds any non-blank line."""
+        return bool(self.bullets)
+
+    def uses_blank_separators(self) -> bool:
+        """Return True if top-level bullets here are separated by blank lines."""
+        return any(bullet.gap for bullet in self.bullets[1:])
+
+    def lines(self) -> Iterator[str]:
+        """Yield the page lines of this section, header included."""
+        if self.header is not None:
+            yield self.header
+        for bullet in self.bullets:
+            yield from bullet.lines()
+        yield from self.trailing
+
+    def merge(self, new: "Section", is_recorded: Optional[Callable[[str], bool]] = None,
+              changes: Optional[List[Change]] = None) -> int:
+        """Merge another section's bullets into this one, adding only items not already present.
+
+        New children of a top-level bullet that already exists go under that
+        bullet; new top-level bullets are appended at the end. Existing lines
+        are never changed or reordered. is_recorded(key) reports items an
+        earlier run already wrote; those are not added again, except for a
+        top-level bullet that is needed to hold new children. Lines added or
+        removed are appended to changes, in order, when it is given. Returns
+        the number of lines added.
+        """
+        is_recorded = is_recorded or (lambda key: False)
+        placeholder_key = bullet_key(NO_CUSTOMER_CALLS)
+        existing_keys = {bullet.key for bullet in self.iter_bullets()}
+        has_real_items = bool(existing_keys - {placeholder_key})
+        separated = self.uses_blank_separators() or new.uses_blank_separators()
+
+        # Top-level key -> (bullet that receives new children, keys of its children)
+        top_level: Dict[str, tuple] = {}
+        for bullet in self.bullets:
+            if bullet.key not in top_level:
+                top_level[bullet.key] = (bullet, {child.key for child in bullet.children})
+
+        added_lines = 0
+        appended: List[Bullet] = []
+        for candidate in new.bullets:
+            if candidate.key == placeholder_key and has_real_items:
+                continue
+            if candidate.key in top_level:
+                target, seen = top_level[candidate.key]
+            elif candidate.key in existing_keys:
+                continue
+            else:
+                target, seen = None, set()
+
+            children = []
+            for child in candidate.children:
+                if child.key not in seen and not is_recorded(child.key):
+                    seen.add(child.key)
+                    children.append(Bullet(child.text))
+            if target is not None:
+                target.children.extend(children)
+                added_lines += len(children)
+                if changes is not None:
+                    changes.extend((self.name, child.text, True) for child in children)
+                continue
+            if is_recorded(candidate.key) and not children:
+                continue
+
+            bullet = Bullet(candidate.text, [""] if candidate.gap and appended else [], children)
+            top_level[candidate.key] = (bullet, seen)
+            existing_keys.add(candidate.key)
+            appended.append(bullet)
+            added_lines += 1 + len(children)
+
+        if not appended:
+            return added_lines
+
+        if not has_real_items and any(bullet.key != placeholder_key for bullet in appended):
+            # A real item replaces the empty-week placeholder
+            if changes is not None:
+                changes.extend(
+                    (self.name, bullet.text, False) for bullet in self.bullets if bullet.key == placeholder_key
+                )
+            self.bullets = [bullet for bullet in self.bullets if bullet.key != placeholder_key]
+        if not self.bullets or separated:
+            appended[0].gap = [""]
+        self.bullets.extend(appended)
+        if changes is not None:
+            for bullet in appended:
+                changes.append((self.name, bullet.text, True))
+                changes.extend((self.name, child.text, True) for child in bullet.children)
+        self.trailing = self.trailing[:1]
+        return added_lines
+
+
+class WeeklyDoc:
+    """A weekly update page as an ordered list of sections.
+
+    Pages are parsed once when read and rendered once when written; jobs
+    merge, compile and diff the structure in between.
+    """
+
+    __slots__ = ("sections",)
+
+    def __init__(self, sections: Optional[List[Section]] = None):
+        self.sections = sections if sections is not None else [Section(None)]
+
+    @classmethod
+    def parse(cls, content: str) -> "WeeklyDoc":
+        """Parse page markdown, splitting it into sections at "## " headers."""
+        sections = []
+        header, name, lines = None, None, []
+        for line in content.split("\n"):
+            if line.startswith("## "):
+                sections.append(Section.parse(name, lines, header))
+                header, name, lines = line, _SECTION_BY_HEADER.get(line[3:].strip().lower()), []
+            else:
+                lines.append(line)
+        sections.append(Section.parse(name, lines, header))
+        return cls(sections)
+
+    @classmethod
+    def skeleton(cls) -> "WeeklyDoc":
+        """Return a page with every standard section header and no content."""
+        doc = cls()
+        for name in SECTION_ORDER:
+            section = Section(name)
+            section.trailing = [""]
+            doc.sections.append(section)
+        return doc
+
+    def section(self, name: str) -> Optional[Section]:
+        """Return the first section with a standard name, or None."""
+        return next((section for section in self.sections if section.name == name), None)
+
+    def insert_section(self, section: Section) -> None:
+        """Insert a standard section before the first later standard section on the page."""
+        later = SECTION_ORDER[SECTION_ORDER.index(section.name) + 1:]
+        position = next((i for i, s in enumerate(self.sections) if s.name in later), len(self.sections))
+        previous = self.sections[position - 1]
+        if previous.has_content() and not previous.trailing:
+            previous.trailing = [""]
+        elif previous.header is None and not previous.has_content():
+            previous.trailing = []
+        self.sections.insert(position, section)
+        if position < len(self.sections) - 1:
+            section.trailing = [""]
+
+    def merge(self, new_sections: Dict[str, Section],
+              is_recorded: Optional[Callable[[str, str], bool]] = None,
+              changes: Optional[List[Change]] = None) -> int:
+        """Merge generated sections into the page; sections the page lacks are added in order.
+
+        is_recorded(section name, key) marks items already written by an
+        earlier run. changes collects the lines added or removed, as in
+        Section.merge. Returns the number of lines added.
+        """
+        added = 0
+        for name in SECTION_ORDER:
+            new = new_sections.get(name)
+            if new is None or not new.has_content():
+                continue
+            section_recorded = None
+            if is_recorded is not None:
+                section_recorded = lambda key, name=name: is_recorded(name, key)
+            section = self.section(name)
+            if section is not None:
+                added += section.merge(new, section_recorded, changes)
+                continue
+            section = Section(name)
+            count = section.merge(new, section_recorded, changes)
+            if count:
+                self.insert_section(section)
+                added += count
+        return added
+
+    def iter_items(self) -> Iterator[tuple]:
+        """Yield (section name, bullet) for every bullet in a standard section."""
+        for section in self.sections:
+            if section.name is not None:
+                for bullet in section.iter_bullets():
+                    yield section.name, bullet
+
+    def render(self) -> str:
+        """Serialize the page back to markdown."""
+        return "\n".join(line for section in self.sections for line in section.lines())